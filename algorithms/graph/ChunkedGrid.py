@@ -0,0 +1,203 @@
+""" CHUNKED GRID MODULE
+# Description:
+    This is the chunked 2-D grid for worlds too large to be kept as a single gridMap.
+    The world is split into square chunks holding the cost/sight/vision planes of their grids,
+    a chunk is created on first access from a generator callback or a backing store.
+    Only a bounded number of chunks stay in memory, the least recently used ones are evicted
+    and the modified ones are written back to the store before being dropped.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+"""
+from collections import OrderedDict, deque
+import numpy as np
+from .GridMap import CHANGE_LOG
+
+# Planes of a chunk and their types, as in gridMap
+PLANES = (('cost', np.float64, 1), ('sight', np.float64, 1), ('vision', np.float64, 0))
+
+class ChunkedGrid():
+    # Never flattened into a FlatGrid, the world is loaded lazily
+    lazy = True
+
+    def __init__(self, width, height, mtype='bounded', chunk=64, generator=None, store=None, max_memory=64 * 2**20):
+        """ Chunked GridMap Graph
+            Same interface as gridMap for PathFinding: neighbors, getCost/setCost,
+            getSight/setSight and getVision/setVision.
+        Parameters
+        ----------
+        width: int
+            Width of the world.
+        height: int
+            Height of the world.
+        mtype: string, optional
+            'bounded' or 'boundless', boundless worlds wrap around across the chunk edges.
+        chunk: int, optional
+            Side of the square chunks, the chunks on the far edges may be smaller.
+        generator: function, optional
+            Called as generator(x0, y0, width, height) for a chunk that is not in the store.
+            Returns the cost plane indexed [x, y], or a dict of 'cost', 'sight' and 'vision' planes.
+            Missing planes are filled as in gridMap (cost 1, sight 1, vision 0).
+        store: dict-like, optional
+            Backing store of the modified chunks keyed by 'cx,cy' strings (a dict or a shelve).
+        max_memory: int, optional
+            Bytes of planes kept in memory. Modified chunks are never dropped without a store,
+            so the cap may be exceeded when there is none.
+
+        Attributes
+        ---------
+        version: int
+            Increased whenever a cost is changed through setCost.
+        changes: deque
+            The latest cost edits as (version, rect, cheaper), as in GridMap.
+        """
+        if mtype not in ('bounded', 'boundless'):
+            raise ValueError('- mtype not supported -')
+        if chunk <= 0:
+            raise ValueError('- chunk size must be positive -')
+        self.width = width
+        self.height = height
+        self.mtype = mtype
+        self.chunk = chunk
+        self.generator = generator
+        self.store = store
+        self.max_chunks = max(1, max_memory // (chunk * chunk * sum(np.dtype(t).itemsize for (_, t, _) in PLANES)))
+        self.version = 0
+        self.changes = deque(maxlen=CHANGE_LOG)
+        self.__chunks = OrderedDict()
+        self.__dirty = set()
+        self.__created = 0
+        self.__loaded = 0
+        self.__evictions = 0
+        self.__writebacks = 0
+
+    def neighbors(self, pos):
+        """ Get Neighbors
+        Parameters
+        ----------
+        pos: tuple
+            The position on the grid for neighbor searching.
+        """
+        (x, y) = pos
+        N = [(x-1, y-1), (x, y-1), (x+1, y-1),
+             (x-1, y),             (x+1, y),
+             (x-1, y+1), (x, y+1), (x+1, y+1)]
+        if self.mtype == 'boundless':
+            return [(n[0] % self.width, n[1] % self.height) for n in N]
+        return [n for n in N if 0 <= n[0] < self.width and 0 <= n[1] < self.height]
+
+    def setCost(self, cNode, nNode, value):
+        (planes, x, y) = self.__locate(nNode)
+        cheaper = value < planes['cost'][x, y]
+        planes['cost'][x, y] = value
+        self.__dirty.add(self.__key(nNode))
+        (nx, ny) = self.__wrap(nNode)
+        self.__mark((nx, ny, nx + 1, ny + 1), bool(cheaper))
+
+    def getCost(self, cNode, nNode):
+        (planes, x, y) = self.__locate(nNode)
+        return planes['cost'][x, y].item()
+
+    def setSight(self, node, value):
+        (planes, x, y) = self.__locate(node)
+        planes['sight'][x, y] = value
+        self.__dirty.add(self.__key(node))
+
+    def getSight(self, node):
+        (planes, x, y) = self.__locate(node)
+        return planes['sight'][x, y].item()
+
+    def setVision(self, node, value):
+        (planes, x, y) = self.__locate(node)
+        planes['vision'][x, y] = value
+        self.__dirty.add(self.__key(node))
+
+    def getVision(self, node):
+        (planes, x, y) = self.__locate(node)
+        return planes['vision'][x, y].item()
+
+    def flush(self):
+        """ Write every modified chunk back to the store, they stay in memory. """
+        if self.store is None:
+            return
+        for key in list(self.__dirty):
+            self.__writeBack(key)
+
+    def chunk_info(self):
+        """ Counters of the chunks: resident, dirty, created (generated), loaded (from the store), evictions and writebacks. """
+        return {'resident': len(self.__chunks), 'dirty': len(self.__dirty), 'created': self.__created,
+                'loaded': self.__loaded, 'evictions': self.__evictions, 'writebacks': self.__writebacks}
+
+    def __wrap(self, node):
+        (x, y) = node
+        if self.mtype == 'boundless':
+            return (x % self.width, y % self.height)
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError('- vertice out of the grid -')
+        return (x, y)
+
+    def __key(self, node):
+        (x, y) = self.__wrap(node)
+        return (x // self.chunk, y // self.chunk)
+
+    def __locate(self, node):
+        # Planes of the chunk holding the vertice, and the local indices into them
+        (x, y) = self.__wrap(node)
+        key = (x // self.chunk, y // self.chunk)
+        planes = self.__chunks.get(key)
+        if planes is None:
+            planes = self.__materialize(key)
+        else:
+            self.__chunks.move_to_end(key)
+        return (planes, x - key[0] * self.chunk, y - key[1] * self.chunk)
+
+    def __materialize(self, key):
+        (cx, cy) = key
+        x0 = cx * self.chunk
+        y0 = cy * self.chunk
+        shape = (min(self.chunk, self.width - x0), min(self.chunk, self.height - y0))
+        name = '%d,%d' % key
+        if self.store is not None and name in self.store:
+            source = self.store[name]
+            self.__loaded += 1
+        else:
+            source = self.generator(x0, y0, shape[0], shape[1]) if self.generator is not None else {}
+            if not isinstance(source, dict):
+                source = {'cost': source}
+            self.__created += 1
+        planes = {}
+        for (plane, dtype, fill) in PLANES:
+            if plane in source:
+                values = np.array(source[plane], dtype=dtype)
+                if values.shape != shape:
+                    raise ValueError('- %s plane does not match the chunk shape -' % plane)
+                planes[plane] = values
+            else:
+                planes[plane] = np.full(shape, fill, dtype=dtype)
+        self.__chunks[key] = planes
+        self.__evict()
+        return planes
+
+    def __evict(self):
+        # Drop the least recently used chunks, the newest one is always kept
+        if len(self.__chunks) <= self.max_chunks:
+            return
+        for key in list(self.__chunks)[:-1]:
+            if key in self.__dirty:
+                if self.store is None:
+                    # Nowhere to write it back, the edits would be lost
+                    continue
+                self.__writeBack(key)
+            del self.__chunks[key]
+            self.__evictions += 1
+            if len(self.__chunks) <= self.max_chunks:
+                return
+
+    def __writeBack(self, key):
+        self.store['%d,%d' % key] = {plane: values.copy() for (plane, values) in self.__chunks[key].items()}
+        self.__dirty.discard(key)
+        self.__writebacks += 1
+
+    def __mark(self, rect, cheaper):
+        self.version += 1
+        self.changes.append((self.version, rect, cheaper))
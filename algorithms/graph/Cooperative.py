@@ -0,0 +1,393 @@
+""" COOPERATIVE PATHFINDING MODULE
+# Description:
+    This is the windowed cooperative A* (WHCA*) planner for many agents moving on the same grid map.
+    Every agent plans a few steps ahead in space-time around the cells and moves the other agents
+    have reserved, then follows the true distance to its goal. The distances are found by a reverse
+    A* from the goal towards the agent (RRA*), resumed only as far as the plans need and within a
+    budget per tick, past which a lower bound stands in until the search catches up on later ticks.
+    Plans are made again on a rolling window, a few agents each tick. Smaller ids go first: an agent
+    plans through the cells of larger ids, which plan again around it in the same tick.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+# Reference:
+    * Silver, D. Cooperative Pathfinding. AIIDE 2005.
+"""
+import heapq
+from itertools import count
+from .FlatGrid import FlatGrid, INF
+
+# Grids the reverse searches may settle per tick by default, a few hundredths of a second
+BUDGET = 2500
+
+class CooperativePlanner():
+    def __init__(self, graph, window=16, limit=None, budget=BUDGET):
+        """ Cooperative Planner
+            Agents move to a neighbor or wait in place once per tick, no two agents share a grid
+            or swap their grids in the same tick. Moving into a grid costs its cost, as in
+            PathFinding, and waiting costs the cost of the grid waited on (nothing on the goal).
+        Parameters
+        ----------
+        graph: GridMap or gridMap
+            The grid map with movement costs.
+        window: int, optional
+            Number of ticks planned ahead, each agent plans again every window // 2 ticks on its own
+            phase (new agents wait for it), so about 1 / (window // 2) of the agents plan each tick.
+        limit: int, optional
+            Most states a plan may expand (64 per tick of the window by default). Crowded agents
+            then take the deepest plan found so far and wait at its end while their grid is free.
+        budget: int, optional
+            Most grids the reverse searches may settle per tick, None for no limit. Past it the
+            plans take the Chebyshev distance scaled by the cheapest cost, which never overestimates.
+
+        Attributes
+        ---------
+        time: int
+            Number of ticks run so far.
+        expanded: int
+            Number of space-time states expanded by the plans of the last tick.
+        """
+        if window < 2:
+            raise ValueError('- window must be at least 2 -')
+        self.graph = graph
+        self.window = window
+        self.limit = limit if limit is not None else 64 * window
+        self.budget = budget
+        self.time = 0
+        self.expanded = 0
+        self.__grid = None
+        self.__distance = {}
+        self.__agents = {}
+        self.__ids = count()
+        # Owner of each reserved (time, grid), keyed by time * size + id
+        self.__reserved = {}
+        # Grids the reverse searches may still settle this tick
+        self.__allowance = [INF]
+        # Ranks taken this tick by the agents bumped out of their plans (their id otherwise)
+        self.__ranks = {}
+        self.__sync()
+
+    def add_agent(self, start, goal):
+        """ Add an agent standing on start, returns its id. """
+        self.__sync()
+        agent = next(self.__ids)
+        s = self.__grid.index(tuple(start))
+        # New agents wait for their phase, so agents added together do not all plan on the same tick
+        wait = [s] * ((agent - self.time) % (self.window // 2) + 1)
+        # [grid, goal id, planned grids from the current tick on, reservation keys, next replanning tick]
+        self.__agents[agent] = [s, self.__grid.index(tuple(goal)), wait, [], self.time + len(wait) - 1]
+        self.__reserve(agent, wait)
+        return agent
+
+    def remove_agent(self, agent):
+        """ Remove the agent and free its reservations. """
+        self.__release(agent)
+        del self.__agents[agent]
+        self.__forget()
+
+    def set_goal(self, agent, goal):
+        """ Send the agent somewhere else, it plans again on the next tick. """
+        state = self.__agents[agent]
+        state[1] = self.__grid.index(tuple(goal))
+        state[4] = self.time
+        self.__forget()
+
+    def position(self, agent):
+        """ Vertice the agent stands on. """
+        return self.__grid.node(self.__agents[agent][0])
+
+    def plan(self, agent):
+        """ Vertices the agent plans to stand on from the current tick on. """
+        return [self.__grid.node(i) for i in self.__agents[agent][2]]
+
+    def arrived(self, agent):
+        """ Check whether the agent stands on its goal. """
+        state = self.__agents[agent]
+        return state[0] == state[1]
+
+    def tick(self):
+        """ Plan the agents due for it and move every agent one step.
+        Returns
+        -------
+        positions: dict
+            The vertice of every agent after the move.
+        """
+        self.__sync()
+        self.expanded = 0
+        self.__allowance[0] = INF if self.budget is None else self.budget
+        half = self.window // 2
+        agents = self.__agents
+        # Smaller ranks plan first and take the grids of larger ranks. The agents bumped plan again
+        # with the rank of the bumping one, so they push the agents in their own way in turn
+        ranks = self.__ranks = {}
+        due = [(agent, agent) for (agent, state) in agents.items() if state[4] <= self.time or len(state[2]) < 2]
+        heapq.heapify(due)
+        while due:
+            (rank, agent) = heapq.heappop(due)
+            if rank != ranks.get(agent, agent):
+                continue
+            state = agents[agent]
+            for other in self.__replan(agent, state, rank):
+                if rank < ranks.get(other, other):
+                    ranks[other] = rank
+                    heapq.heappush(due, (rank, other))
+            # Each agent plans on the ticks of its own phase, so about 1 / half of them plan each tick
+            state[4] = self.time + half - (self.time - agent) % half
+        self.__hold()
+        self.time += 1
+        for state in self.__agents.values():
+            if len(state[2]) > 1:
+                state[2].pop(0)
+            state[0] = state[2][0]
+        return {agent: self.__grid.node(state[0]) for (agent, state) in self.__agents.items()}
+
+    def distance(self, node, goal):
+        """ Cost from the vertice to the goal, inf when it cannot be reached. """
+        self.__sync()
+        i = self.__grid.index(tuple(node))
+        return self.__search_of(self.__grid.index(tuple(goal)), i).distance(i)
+
+    def __sync(self):
+        # Costs changed: the distances to the goals are found again
+        version = getattr(self.graph, 'version', None)
+        if self.__grid is None or version is None or version != self.__grid.version:
+            if self.__grid is None or version is None or not self.__grid.update(self.graph):
+                self.__grid = FlatGrid(self.graph)
+            if not self.__grid.exact:
+                raise ValueError('- graph is not a grid map -')
+            self.__distance = {}
+
+    def __forget(self):
+        # Drop the reverse searches of goals no agent heads to anymore
+        goals = {state[1] for state in self.__agents.values()}
+        for goal in list(self.__distance):
+            if goal not in goals:
+                del self.__distance[goal]
+
+    def __search_of(self, goal, origin):
+        # The reverse search of a goal heads to the first agent asking for it
+        search = self.__distance.get(goal)
+        if search is None:
+            search = self.__distance[goal] = _ReverseSearch(self.__grid, goal, origin)
+        return search
+
+    def __heuristic(self, goal, origin):
+        search = self.__search_of(goal, origin)
+        allowance = self.__allowance
+        return lambda i: search.distance(i, allowance)
+
+    def __reserve(self, agent, plan, rank=None):
+        # Returns the agents whose grids were taken, those of larger ranks when a rank is given
+        size = self.__grid.size
+        reserved = self.__reserved
+        ranks = self.__ranks
+        keys = self.__agents[agent][3]
+        bumped = set()
+        for (t, i) in enumerate(plan, self.time):
+            key = t * size + i
+            if rank is not None and t > self.time and plan[t - self.time - 1] != i:
+                # The owner of a swap with this step gives way as well
+                other = reserved.get(key - size, agent)
+                if other != agent and reserved.get(key - i + plan[t - self.time - 1]) == other and ranks.get(other, other) > rank:
+                    bumped.add(other)
+            owner = reserved.get(key, agent)
+            if owner != agent:
+                if rank is None or ranks.get(owner, owner) <= rank:
+                    continue
+                bumped.add(owner)
+            reserved[key] = agent
+            keys.append(key)
+        return bumped
+
+    def __release(self, agent):
+        reserved = self.__reserved
+        for key in self.__agents[agent][3]:
+            if reserved.get(key) == agent:
+                del reserved[key]
+        self.__agents[agent][3] = []
+
+    def __hold(self):
+        # An agent whose plan ran out stays on a grid it may not have reserved (the others plan past
+        # its plan). Whoever planned to step onto a staying agent waits and plans again instead
+        entering = {}
+        staying = []
+        for (agent, state) in self.__agents.items():
+            if len(state[2]) > 1 and state[2][1] != state[0]:
+                entering[state[2][1]] = agent
+            else:
+                staying.append(state[0])
+        while staying:
+            agent = entering.pop(staying.pop(), None)
+            if agent is not None:
+                state = self.__agents[agent]
+                self.__release(agent)
+                state[2] = [state[0]]
+                state[4] = self.time + 1
+                staying.append(state[0])
+
+    def __replan(self, agent, state, rank):
+        # Returns the agents bumped by the new plan, they have to plan again
+        self.__release(agent)
+        plan = self.__search(agent, state[0], state[1], rank)
+        state[2] = plan
+        return self.__reserve(agent, plan, rank)
+
+    def __search(self, agent, s, goal, rank):
+        # Space-time A* over the window, states are depth * size + id, the grids reserved by
+        # larger ranks are free
+        grid = self.__grid
+        size = grid.size
+        cost = grid.cost
+        reserved = self.__reserved
+        ranks = self.__ranks
+        distance = self.__heuristic(goal, s)
+        (now, window) = (self.time, self.window)
+        base = now * size
+
+        tie = count()
+        g = {s: 0}
+        parent = {s: None}
+        h = distance(s)
+        if h == INF:
+            # The goal cannot be reached, stand still
+            return [s] * (window + 1)
+        frontier = [(h, 0, 0, s)]
+        closed = set()
+        deepest = (0, h, s)
+        while frontier and len(closed) < self.limit:
+            (f, _, _, state) = heapq.heappop(frontier)
+            if state in closed:
+                continue
+            closed.add(state)
+            self.expanded += 1
+            (depth, u) = divmod(state, size)
+            if depth == window:
+                return self.__unwind(parent, state)
+            if (-depth, f) < (-deepest[0], deepest[1]):
+                deepest = (depth, f, state)
+            gu = g[state]
+            t = base + depth * size
+            nxt = t + size
+            for v in grid.neighbors(u) + [u]:
+                c = cost[v] if v != u else (0 if u == goal else cost[u])
+                if c == INF:
+                    continue
+                # Grids taken at the next tick, and swaps with their owner
+                owner = reserved.get(nxt + v, agent)
+                if owner != agent and ranks.get(owner, owner) <= rank:
+                    continue
+                if v != u:
+                    other = reserved.get(t + v, agent)
+                    if other != agent and reserved.get(nxt + u) == other and ranks.get(other, other) <= rank:
+                        continue
+                h = distance(v)
+                if h == INF:
+                    continue
+                key = state + size - u + v
+                new_cost = gu + c
+                if key not in g or new_cost < g[key]:
+                    g[key] = new_cost
+                    parent[key] = state
+                    # Ties go to the deeper states, they are closer to the end of the window
+                    heapq.heappush(frontier, (new_cost + h, -depth - 1, next(tie), key))
+        # Boxed in by the others: go as deep as found, then wait as long as the grid is free
+        plan = self.__unwind(parent, deepest[2])
+        while len(plan) <= window:
+            owner = reserved.get(base + len(plan) * size + plan[-1], agent)
+            if owner != agent and ranks.get(owner, owner) <= rank:
+                break
+            plan.append(plan[-1])
+        return plan
+
+    def __unwind(self, parent, state):
+        size = self.__grid.size
+        plan = []
+        while state is not None:
+            plan.append(state % size)
+            state = parent[state]
+        plan.reverse()
+        return plan
+
+class _ReverseSearch():
+    # A* from the goal over the reversed moves towards an origin, resumed until the asked grid
+    # is settled. The Chebyshev distance scaled by the cheapest cost keeps the settled costs exact
+
+    def __init__(self, grid, goal, origin):
+        self.grid = grid
+        self.goal = goal
+        self.dist = {goal: 0}
+        self.settled = {}
+        self.unit = grid.min_cost
+        self.origin = grid.node(origin)
+        self.frontier = [(self.__estimate(goal), 0, goal)] if grid.cost[goal] != INF else []
+
+    def __estimate(self, i):
+        grid = self.grid
+        (y, x) = divmod(i, grid.width)
+        dx = abs(x - self.origin[0])
+        dy = abs(y - self.origin[1])
+        if grid.mtype == 'boundless':
+            dx = min(dx, grid.width - dx)
+            dy = min(dy, grid.height - dy)
+        return max(dx, dy) * self.unit
+
+    def __bound(self, i):
+        # Chebyshev distance to the goal scaled by the cheapest cost, never above the true one
+        grid = self.grid
+        ((x, y), (gx, gy)) = (grid.node(i), grid.node(self.goal))
+        (dx, dy) = (abs(x - gx), abs(y - gy))
+        if grid.mtype == 'boundless':
+            (dx, dy) = (min(dx, grid.width - dx), min(dy, grid.height - dy))
+        return max(dx, dy) * self.unit
+
+    def distance(self, i, allowance=None):
+        # Settles at most allowance[0] more grids (and counts them down), then returns the lower bound
+        found = self.settled.get(i)
+        if found is not None:
+            return found
+        if allowance is not None and allowance[0] <= 0:
+            return self.__bound(i) if self.frontier else INF
+        grid = self.grid
+        cost = grid.cost
+        dist = self.dist
+        settled = self.settled
+        frontier = self.frontier
+        (w, h, unit) = (grid.width, grid.height, self.unit)
+        (wm1, lim, offsets) = (w - 1, grid.size - w, grid.offsets)
+        (ox, oy) = self.origin
+        wrap = grid.mtype == 'boundless'
+        left = INF if allowance is None else allowance[0]
+        while frontier:
+            if left <= 0:
+                allowance[0] = 0
+                return self.__bound(i)
+            (_, d, x) = heapq.heappop(frontier)
+            if x in settled:
+                continue
+            settled[x] = d
+            left -= 1
+            # Entering x costs cost[x], paid when stepping back from x to its neighbors
+            step = d + cost[x]
+            if step == INF:
+                continue
+            if 0 < x % w < wm1 and w <= x < lim:
+                neighbor = [x + o for o in offsets]
+            else:
+                neighbor = grid.neighbors(x)
+            for u in neighbor:
+                if cost[u] != INF and step < dist.get(u, INF):
+                    dist[u] = step
+                    (y, z) = divmod(u, w)
+                    dx = abs(z - ox)
+                    dy = abs(y - oy)
+                    if wrap:
+                        dx = min(dx, w - dx)
+                        dy = min(dy, h - dy)
+                    heapq.heappush(frontier, (step + max(dx, dy) * unit, step, u))
+            if x == i:
+                if allowance is not None:
+                    allowance[0] = left
+                return d
+        if allowance is not None:
+            allowance[0] = left
+        return settled.get(i, INF)
@@ -0,0 +1,279 @@
+""" FIELD OF VIEW MODULE
+# Description:
+    This is the shadowcasting field of view for GridMap/gridMap.
+    A grid whose sight value is 0 (or any value up to a threshold) is opaque, other grids let sight through.
+    The view is cast one depth row at a time in the 4 quadrants around the observer, each opaque grid
+    casting the shadow of its center line onto the deeper rows (as in symmetric shadowcasting).
+    The shadows are kept as bitmasks over the slopes a row can see, so thousands of observers
+    are cast together with Numpy.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+# Reference:
+    * https://www.albertford.com/shadowcasting/
+"""
+from bisect import bisect_left
+from fractions import Fraction
+from functools import lru_cache
+import numpy as np
+
+# Number of observers cast together
+CHUNK = 1024
+
+# Quadrant (depth, column) to grid offset as (dx per depth, dx per column, dy per depth, dy per column):
+# east, west, south, north
+QUADRANTS = ((1, 0, 0, 1), (-1, 0, 0, 1), (0, 1, 1, 0), (0, 1, -1, 0))
+
+class FieldOfView():
+    def __init__(self, graph, radius, threshold=0):
+        """ Field of View
+            A floor (transparent) grid is visible when the segment between its center and the
+            observer's center passes no opaque grid, which makes floor visibility symmetric.
+            An opaque grid is visible when any part of it is lit.
+        Parameters
+        ----------
+        graph: GridMap or gridMap
+            The grid map with sight and vision values.
+        radius: int
+            The view distance, grids farther than it (euclidean) are never visible.
+        threshold: float, optional
+            Grids with sight <= threshold block the view, removed GridMap vertices always do.
+        """
+        if radius < 0:
+            raise ValueError('- radius must not be negative -')
+        self.graph = graph
+        self.radius = int(radius)
+        self.threshold = threshold
+        self.width = graph.width
+        self.height = graph.height
+        self.boundless = graph.mtype == 'boundless'
+        self.__tables = _tables(self.radius)
+
+    def get_fov(self, observer):
+        """ Get Visible Vertices
+        Parameters
+        ----------
+        observer: tuple
+            The vertice the observer stands on.
+        """
+        (ox, oy) = observer
+        plane = self.__padded()
+        visible = self.__cast(plane, np.array([ox]), np.array([oy]))[0]
+        (dx, dy) = self.__tables['offsets']
+        (x, y) = (ox + dx[visible], oy + dy[visible])
+        if self.boundless:
+            (x, y) = (x % self.width, y % self.height)
+        else:
+            inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+            (x, y) = (x[inside], y[inside])
+        # Offsets wrapping onto the same grid of a small torus are listed once
+        return list(dict.fromkeys(zip(x.tolist(), y.tolist())))
+
+    def update_vision(self, observers, accumulate=False):
+        """ Batched Vision
+            Count for every grid the observers seeing it and store it into the vision values.
+        Parameters
+        ----------
+        observers: list
+            The vertices the observers stand on, repeated vertices count once per observer.
+        accumulate: bool, optional
+            Add to the current vision values instead of replacing them.
+
+        Returns
+        -------
+        vision: numpy.array
+            The number of observers seeing each grid, indexed as vision[x, y].
+        """
+        observers = np.asarray(observers, dtype=np.intp).reshape(-1, 2)
+        # Observers on the same grid see the same grids
+        (ids, weight) = np.unique(observers[:, 0] * self.height + observers[:, 1], return_counts=True)
+        (ox, oy) = np.divmod(ids, self.height)
+        plane = self.__padded()
+        seen = [np.zeros(0, dtype=np.intp)]
+        for i in range(0, ids.size, CHUNK):
+            chunk = slice(i, i + CHUNK)
+            visible = self.__cast(plane, ox[chunk], oy[chunk])
+            seen.append(self.__seen(ox[chunk], oy[chunk], weight[chunk], visible))
+        vision = np.bincount(np.concatenate(seen), minlength=self.width * self.height)
+        vision = vision.reshape(self.width, self.height)
+        self.__store(vision, accumulate)
+        return vision
+
+    def __opacity(self):
+        # Opaque grids as a (height, width) plane
+        graph = self.graph
+        if hasattr(graph, 'sight') and isinstance(graph.sight, np.ndarray):
+            return (graph.sight <= self.threshold).T
+        opaque = np.ones((self.height, self.width), dtype=bool)
+        for (node, data) in graph.nodes(data=True):
+            (x, y) = node
+            if 0 <= x < self.width and 0 <= y < self.height:
+                opaque[y, x] = data.get('sight', 1) <= self.threshold
+        return opaque
+
+    def __padded(self):
+        # Opacity with a halo as wide as the radius, opaque outside bounded maps and wrapped on boundless ones
+        r = self.radius
+        opaque = self.__opacity()
+        if self.boundless:
+            return np.ascontiguousarray(np.pad(opaque, r, mode='wrap'))
+        return np.ascontiguousarray(np.pad(opaque, r, mode='constant', constant_values=True))
+
+    def __cast(self, plane, ox, oy):
+        # Visibility of every offset of the disk for each observer, shape (observers, offsets)
+        t = self.__tables
+        r = self.radius
+        stride = plane.shape[1]
+        flat = plane.ravel()
+        base = (oy + r) * stride + (ox + r)
+        n = base.size
+        visible = np.zeros((n, len(t['offsets'][0])), dtype=bool)
+        visible[:, t['origin']] = True
+        words = t['words']
+        one = np.uint64(1)
+        (depth, column) = t['tiles']
+        for (q, (xd, xc, yd, yc)) in enumerate(QUADRANTS):
+            opaque = flat[base[:, None] + ((depth * yd + column * yc) * stride + depth * xd + column * xc)[None, :]]
+            inside = t['inside'][q]
+            index = t['index'][q][inside]
+            # Quadrants without an opaque grid are lit all over
+            shaded = opaque.any(axis=1)
+            visible[np.ix_(~shaded, index)] = True
+            opaque = opaque[shaded]
+            if opaque.shape[0] == 0:
+                continue
+            shadow = np.zeros((opaque.shape[0], words), dtype=np.uint64)
+            lit = np.empty(opaque.shape, dtype=bool)
+            for (d, (a, b)) in enumerate(t['rows'], 1):
+                wall = opaque[:, a:b]
+                free = ~shadow
+                # Floor grids are lit when their center is, opaque grids when any part of them is
+                lit[:, a:b] = (free[:, t['center_word'][a:b]] >> t['center_bit'][a:b]) & one != 0
+                (i, j) = np.nonzero(wall)
+                lit[i, a + j] = ((free[i] & t['span'][a + j]) != 0).any(axis=1)
+                if d < r:
+                    # The opaque grids of this row shade the deeper rows, two opaque neighbors also shade their joint
+                    (i, j) = np.nonzero(np.concatenate([wall, wall[:, :-1] & wall[:, 1:]], axis=1))
+                    if i.size > 0:
+                        first = np.flatnonzero(np.concatenate([[True], i[1:] != i[:-1]]))
+                        shadow[i[first]] |= np.bitwise_or.reduceat(t['cover'][d - 1][j], first, axis=0)
+            visible[np.ix_(shaded, index)] |= lit[:, inside]
+        return visible
+
+    def __seen(self, ox, oy, weight, visible):
+        # Ids (x * height + y) of the grids seen, repeated once per observer standing there
+        (dx, dy) = self.__tables['offsets']
+        (w, h, r) = (self.width, self.height, self.radius)
+        ids = (ox * h + oy)[:, None] + (dx * h + dy)[None, :]
+        # Only the disks crossing the map edges need to be wrapped or cut
+        edge = np.nonzero((ox < r) | (ox >= w - r) | (oy < r) | (oy >= h - r))[0]
+        if edge.size > 0:
+            x = ox[edge, None] + dx[None, :]
+            y = oy[edge, None] + dy[None, :]
+            if self.boundless:
+                ids[edge] = (x % w) * h + y % h
+                if 2 * r >= min(w, h):
+                    # Offsets wrapping onto the same grid of a small torus are seen once
+                    for i in edge:
+                        where = np.nonzero(visible[i])[0]
+                        first = np.unique(ids[i, where], return_index=True)[1]
+                        visible[i] = False
+                        visible[i, where[first]] = True
+            else:
+                visible[edge] &= (x >= 0) & (x < w) & (y >= 0) & (y < h)
+        if weight.max() == 1:
+            return ids[visible]
+        return np.repeat(ids[visible], np.broadcast_to(weight[:, None], ids.shape)[visible])
+
+    def __store(self, vision, accumulate):
+        graph = self.graph
+        if hasattr(graph, 'vision') and isinstance(graph.vision, np.ndarray):
+            if accumulate:
+                graph.vision += vision.astype(graph.vision.dtype)
+            else:
+                graph.vision[...] = vision
+            return
+        for node in graph.nodes():
+            (x, y) = node
+            if 0 <= x < self.width and 0 <= y < self.height:
+                value = int(vision[x, y])
+                graph.setVision(node, graph.getVision(node) + value if accumulate else value)
+
+@lru_cache(maxsize=None)
+def _tables(radius):
+    # Shadow tables of one quadrant, shared by every map and observer with the same radius
+    r = radius
+    depth = []
+    column = []
+    rows = []
+    for d in range(1, r + 1):
+        rows.append((len(depth), len(depth) + 2 * d + 1))
+        for c in range(-d, d + 1):
+            depth.append(d)
+            column.append(c)
+
+    # Slopes are split into atoms: the breakpoints (2c - 1) / 2d and the open gaps between them
+    points = {Fraction(-1), Fraction(1)}
+    for (d, c) in zip(depth, column):
+        for edge in (Fraction(2 * c - 1, 2 * d), Fraction(2 * c + 1, 2 * d)):
+            if -1 <= edge <= 1:
+                points.add(edge)
+    points = sorted(points)
+    atoms = 2 * len(points) - 1
+    words = max(1, (atoms + 63) // 64)
+
+    def atom(slope):
+        i = bisect_left(points, slope)
+        return 2 * i if i < len(points) and points[i] == slope else 2 * i - 1
+
+    def mask(first, last):
+        m = [0] * words
+        for a in range(first, last + 1):
+            m[a // 64] |= 1 << (a % 64)
+        return m
+
+    cover = []
+    span = []
+    center = []
+    for (d, c) in zip(depth, column):
+        lo = Fraction(2 * c - 1, 2 * d)
+        hi = Fraction(2 * c + 1, 2 * d)
+        first = 0 if lo < -1 else atom(lo)
+        last = atoms - 1 if hi > 1 else atom(hi)
+        # The shadow leaves out the edges, the lit part includes them
+        cover.append(mask(first + (lo >= -1), last - (hi <= 1)))
+        span.append(mask(first, last))
+        center.append(atom(Fraction(c, d)))
+    # Shadows of each row: its grids, then the joints between two neighbors of it
+    shades = []
+    for (d, (a, b)) in enumerate(rows, 1):
+        joint = [mask(atom(Fraction(2 * c + 1, 2 * d)), atom(Fraction(2 * c + 1, 2 * d))) for c in range(-d, d)]
+        shades.append(np.array(cover[a:b] + joint, dtype=np.uint64).reshape(-1, words))
+
+    # Offsets of the disk, quadrant tiles on the diagonals are shared by two quadrants
+    depth = np.array(depth, dtype=np.intp)
+    column = np.array(column, dtype=np.intp)
+    offsets = [(0, 0)] + [(x, y) for y in range(-r, r + 1) for x in range(-r, r + 1)
+                          if (x, y) != (0, 0) and x * x + y * y <= r * r]
+    lookup = {o: i for (i, o) in enumerate(offsets)}
+    index = []
+    inside = []
+    for (xd, xc, yd, yc) in QUADRANTS:
+        dx = depth * xd + column * xc
+        dy = depth * yd + column * yc
+        inside.append(dx * dx + dy * dy <= r * r)
+        index.append(np.array([lookup.get((x, y), -1) for (x, y) in zip(dx.tolist(), dy.tolist())], dtype=np.intp))
+    center = np.array(center, dtype=np.intp)
+    return {
+        'tiles': (depth, column),
+        'rows': rows,
+        'words': words,
+        'cover': shades,
+        'span': np.array(span, dtype=np.uint64).reshape(-1, words),
+        'center_word': center // 64,
+        'center_bit': (center % 64).astype(np.uint64),
+        'offsets': (np.array([o[0] for o in offsets], dtype=np.intp), np.array([o[1] for o in offsets], dtype=np.intp)),
+        'origin': 0,
+        'index': index,
+        'inside': inside,
+    }
@@ -0,0 +1,256 @@
+""" FLAT GRID MODULE
+# Description:
+    This is the flat integer-id view of GridMap/gridMap used by the search algorithms.
+    Grid (x, y) is addressed as id = y * width + x, and the 8 neighbors of an interior
+    grid are reached with constant id offsets.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+"""
+import numpy as np
+
+INF = float('inf')
+
+# Neighbor steps (dx, dy), in the order of graph.neighbors and FlatGrid.offsets
+DIRECTIONS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+
+class FlatGrid():
+    def __init__(self, graph):
+        """ Flat Grid
+            Snapshot of the movement costs of a GridMap/gridMap.
+            Patch it with update() when the version of the graph changes.
+        Parameters
+        ----------
+        graph: GridMap or gridMap
+            The grid to be flattened.
+
+        Attributes
+        ---------
+        cost: list
+            Cost of entering each id, inf for blocked or removed grids.
+        cost_array: numpy.array
+            The same costs as a flat float64 array.
+        offsets: tuple
+            Id offsets of the 8 neighbors of an interior grid (same order as graph.neighbors).
+        min_cost: float
+            Cheapest finite cost of entering a grid (0 when below 0 or when every grid is blocked),
+            the scale of the distance bounds of the searches.
+        exact: bool
+            True when neighbors() reproduces graph.neighbors() on every grid.
+        version: int
+            The version of the graph when the snapshot was taken.
+        """
+        if not FlatGrid.supports(graph):
+            raise ValueError('- graph is not a grid map -')
+        self.width = graph.width
+        self.height = graph.height
+        self.mtype = graph.mtype
+        self.size = self.width * self.height
+        self.version = getattr(graph, 'version', None)
+        w = self.width
+        self.offsets = (-w-1, -w, -w+1, -1, 1, w-1, w, w+1)
+        self.__initCost(graph)
+        self.cost = self.cost_array.tolist()
+        self.__setCheapest(self.cost_array)
+
+    @classmethod
+    def from_cost(cls, cost, width, height, mtype='bounded', version=None):
+        """ Build a snapshot straight from a flat cost array (id = y * width + x, inf for blocked).
+            The array is used as is, so it may live in shared memory.
+        """
+        grid = cls.__new__(cls)
+        grid.width = width
+        grid.height = height
+        grid.mtype = mtype
+        grid.size = width * height
+        grid.version = version
+        grid.offsets = (-width-1, -width, -width+1, -1, 1, width-1, width, width+1)
+        grid.cost_array = cost
+        grid.cost = cost.tolist()
+        grid.__setCheapest(cost)
+        grid.exact = True
+        return grid
+
+    @staticmethod
+    def cheapest(cost):
+        """ Cheapest finite cost of the array, not below 0, and 0 when there is none. """
+        finite = cost[np.isfinite(cost)]
+        return max(float(finite.min()), 0.0) if finite.size > 0 else 0.0
+
+    def __setCheapest(self, cost):
+        # The cheapest cost and the number of grids at (or below) it, so edits rarely search it again
+        self.min_cost = FlatGrid.cheapest(cost)
+        self.__cheapest = int(np.count_nonzero(cost <= self.min_cost))
+
+    def update(self, graph):
+        """ Update Snapshot
+            Read again only the grids edited since the snapshot was taken, as logged in graph.changes.
+        Parameters
+        ----------
+        graph: GridMap or gridMap
+            The graph the snapshot was taken of.
+
+        Returns
+        -------
+        updated: bool
+            False when the edits cannot be replayed (the log does not reach back far enough, an
+            edit covers unknown vertices or the edges of a GridMap were edited): build a new snapshot.
+        """
+        # GridMap reads the neighbor steps of this module, its change log is imported here
+        from .GridMap import changes_since
+        version = getattr(graph, 'version', None)
+        if version is not None and version == self.version:
+            return True
+        changes = changes_since(graph, self.version)
+        if changes is None or not self.exact or getattr(graph, 'edited_edges', False):
+            return False
+        rects = [rect for (_, rect, _) in changes]
+        if any(rect is None or rect[0] < 0 or rect[1] < 0 or rect[2] > self.width or rect[3] > self.height for rect in rects):
+            return False
+        (w, cost, array) = (self.width, self.cost, self.cost_array)
+        for (x0, y0, x1, y1) in rects:
+            if x0 >= x1 or y0 >= y1:
+                continue
+            new = self.__readRegion(graph, x0, y0, x1, y1)
+            if new is None:
+                return False
+            old = array.reshape(self.height, w)[y0:y1, x0:x1]
+            lowest = self.min_cost
+            self.__cheapest += int(np.count_nonzero(new <= lowest)) - int(np.count_nonzero(old <= lowest))
+            if max(float(new.min()), 0.0) < lowest:
+                # Only the edited grids can be cheaper than every other one
+                self.min_cost = max(float(new.min()), 0.0)
+                self.__cheapest = int(np.count_nonzero(new <= self.min_cost))
+            old[...] = new
+            for (row, y) in zip(new.tolist(), range(y0, y1)):
+                cost[y * w + x0:y * w + x1] = row
+            if self.__cheapest == 0:
+                # The last grid at the cheapest cost got dearer
+                self.__setCheapest(array)
+        self.version = version
+        return True
+
+    @staticmethod
+    def supports(graph):
+        """ Check whether the graph is a rectangular grid map. """
+        # Lazily loaded worlds (ChunkedGrid) are too large to be flattened
+        return hasattr(graph, 'width') and hasattr(graph, 'height') \
+            and getattr(graph, 'mtype', None) in ('bounded', 'boundless') \
+            and not getattr(graph, 'lazy', False)
+
+    def __initCost(self, graph):
+        if hasattr(graph, 'cost') and isinstance(graph.cost, np.ndarray):
+            # gridMap: the cost plane is indexed [x, y], its transpose is row-major in y.
+            # This reads the whole plane, memory-mapped ones (MapFile) included
+            cost = np.array(graph.cost.T, dtype=np.float64).ravel()
+            cost[~np.isfinite(cost)] = INF
+            self.cost_array = cost
+            self.exact = True
+        else:
+            # GridMap: vertices may be removed, missing ones are blocked
+            cost = np.full(self.size, INF)
+            present = np.zeros(self.size, dtype=bool)
+            exact = True
+            for (node, data) in graph.nodes(data=True):
+                (x, y) = node
+                if 0 <= x < self.width and 0 <= y < self.height:
+                    i = y * self.width + x
+                    cost[i] = data.get('cost', 1)
+                    present[i] = True
+                else:
+                    exact = False
+            cost[np.isnan(cost)] = INF
+            self.cost_array = cost
+            # Implicit GridMap edges always form the complete grid over the present vertices. Removing
+            # vertices keeps the others a subset of it, so the count is enough unless edges were edited
+            self.exact = exact and (getattr(graph, 'implicit', False) or (self.__countEdges(present) == graph.number_of_edges()
+                                    and (not getattr(graph, 'edited_edges', True) or self.__gridEdges(graph))))
+
+    def __readRegion(self, graph, x0, y0, x1, y1):
+        # Costs of the region as a (rows, columns) array, None when a GridMap vertice lost its grid edges
+        if hasattr(graph, 'cost') and isinstance(graph.cost, np.ndarray):
+            cost = np.array(graph.cost[x0:x1, y0:y1].T, dtype=np.float64)
+            cost[~np.isfinite(cost)] = INF
+            return cost
+        cost = np.full((y1 - y0, x1 - x0), INF)
+        implicit = getattr(graph, 'implicit', False)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                data = graph.node.get((x, y)) if hasattr(graph, 'node') else None
+                if data is None:
+                    continue
+                # Added vertices come without edges, unless the grid edges are implicit
+                if not implicit and len(graph.adj[(x, y)]) != len(self.__presentNeighbors(graph, x, y)):
+                    return None
+                cost[y - y0, x - x0] = data.get('cost', 1)
+        cost[np.isnan(cost)] = INF
+        return cost
+
+    def __presentNeighbors(self, graph, x, y):
+        found = []
+        for (dx, dy) in DIRECTIONS:
+            (nx, ny) = (x + dx, y + dy)
+            if self.mtype == 'boundless':
+                (nx, ny) = (nx % self.width, ny % self.height)
+            if (nx, ny) in graph.node:
+                found.append((nx, ny))
+        return list(dict.fromkeys(found))
+
+    def __countEdges(self, present):
+        # Number of edges a complete 8-neighbor grid over the present vertices would have
+        p = present.reshape(self.height, self.width)
+        if self.mtype == 'bounded':
+            return int(np.count_nonzero(p[:, :-1] & p[:, 1:]) + np.count_nonzero(p[:-1, :] & p[1:, :]) \
+                     + np.count_nonzero(p[:-1, :-1] & p[1:, 1:]) + np.count_nonzero(p[:-1, 1:] & p[1:, :-1]))
+        if self.width < 3 or self.height < 3:
+            # Wrapped neighbors collapse into duplicated edges and self-loops
+            return -1
+        r = np.roll(p, -1, axis=1)
+        d = np.roll(p, -1, axis=0)
+        return int(np.count_nonzero(p & r) + np.count_nonzero(p & d) \
+                 + np.count_nonzero(p & np.roll(r, -1, axis=0)) + np.count_nonzero(p & np.roll(r, 1, axis=0)))
+
+    def __gridEdges(self, graph):
+        # Whether every edge joins two distinct neighbors of the grid
+        ends = np.array(list(graph.edges()), dtype=np.int64).reshape(-1, 2, 2)
+        (dx, dy) = (ends[:, 1] - ends[:, 0]).T
+        if self.mtype == 'boundless':
+            (dx, dy) = ((dx + 1) % self.width - 1, (dy + 1) % self.height - 1)
+        return bool(np.all((np.abs(dx) <= 1) & (np.abs(dy) <= 1) & ((dx != 0) | (dy != 0))))
+
+    def index(self, node):
+        """ Id of the vertice (x, y). """
+        return node[1] * self.width + node[0]
+
+    def node(self, i):
+        """ Vertice (x, y) of the id. """
+        (y, x) = divmod(i, self.width)
+        return (x, y)
+
+    def neighbors(self, i):
+        """ Get Neighbors
+        Parameters
+        ----------
+        i: int
+            The id on the grid for neighbor searching.
+        """
+        w = self.width
+        x = i % w
+        if 0 < x < w - 1 and w <= i < self.size - w:
+            return [i + o for o in self.offsets]
+
+        y = i // w
+        neighbor = []
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                nx = x + dx
+                ny = y + dy
+                if self.mtype == 'boundless':
+                    nx %= w
+                    ny %= self.height
+                elif not (0 <= nx < w and 0 <= ny < self.height):
+                    continue
+                neighbor.append(ny * w + nx)
+        return neighbor
@@ -0,0 +1,226 @@
+""" FLOW FIELD MODULE
+# Description:
+    This is the flow field generator for crowds heading to the same goal(s).
+    The cost-to-goal distance of every grid is found with vectorized wavefront relaxation
+    (Bellman-Ford on the grid planes), then each grid points to its cheapest neighbor.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+"""
+import numpy as np
+from .FlatGrid import FlatGrid, INF, DIRECTIONS
+
+class FlowField():
+    def __init__(self, graph, goals):
+        """ Flow Field
+            Moving from a grid to its neighbor costs the cost of the neighbor, as in PathFinding.
+        Parameters
+        ----------
+        graph: GridMap or gridMap
+            The grid map with movement costs.
+        goals: list
+            The targeting vertices, every unit flows to the cheapest one.
+
+        Attributes
+        ---------
+        distance: numpy.array
+            Cost to the nearest goal of each grid indexed as distance[x, y],
+            inf on blocked (removed) and unreachable grids.
+        direction: numpy.array
+            Index into DIRECTIONS of the next step of each grid indexed as direction[x, y],
+            -1 on goals, blocked and unreachable grids.
+        """
+        grid = FlatGrid(graph)
+        if not grid.exact:
+            raise ValueError('- graph is not a grid map -')
+        self.graph = graph
+        self.width = grid.width
+        self.height = grid.height
+        self.boundless = grid.mtype == 'boundless'
+        self.goals = [tuple(goal) for goal in goals]
+        self.__cost = grid.cost_array.reshape(self.height, self.width).copy()
+        self.__dist = np.full((self.height, self.width), INF)
+        self.__dir = np.full((self.height, self.width), -1, dtype=np.int8)
+        # distance + cost with a one-grid halo, the value a neighbor sees when stepping in
+        self.__enter = np.full((self.height + 2, self.width + 2), INF)
+        self.distance = self.__dist.T
+        self.direction = self.__dir.T
+        self.__compute()
+
+    def get_distance(self, node):
+        """ Cost from the vertice to the nearest goal. """
+        return self.__dist[node[1], node[0]].item()
+
+    def get_direction(self, node):
+        """ Step (dx, dy) to take from the vertice, None on goals and unreachable vertices. """
+        d = self.__dir[node[1], node[0]]
+        return None if d < 0 else DIRECTIONS[d]
+
+    def get_next(self, node):
+        """ Next vertice on the way to the goal, None on goals and unreachable vertices. """
+        d = self.__dir[node[1], node[0]]
+        if d < 0:
+            return None
+        (dx, dy) = DIRECTIONS[d]
+        (x, y) = (node[0] + dx, node[1] + dy)
+        if self.boundless:
+            return (x % self.width, y % self.height)
+        return (x, y)
+
+    def update(self, rect=None):
+        """ Update Flow Field
+            Reload the costs of a region from the graph and repair the field incrementally.
+            Cost increases invalidate only the grids whose flow passes through the region.
+        Parameters
+        ----------
+        rect: tuple, optional
+            The half-open rectangle (x0, y0, x1, y1) whose costs changed. Whole grid by default.
+        """
+        if rect is None:
+            grid = FlatGrid(self.graph)
+            self.__cost[...] = grid.cost_array.reshape(self.height, self.width)
+            self.__compute()
+            return
+
+        (x0, y0, x1, y1) = rect
+        old = self.__cost[y0:y1, x0:x1].copy()
+        new = self.__readCost(x0, y0, x1, y1)
+        self.__cost[y0:y1, x0:x1] = new
+        (iy, ix) = np.nonzero(new > old)
+
+        # Grids whose flow enters a more expensive grid lose their distance
+        roots = (iy + y0) * self.width + (ix + x0)
+        lost = self.__descendants(roots)
+        # Blocked grids hold no distance of their own
+        lost = np.concatenate([lost, roots[self.__cost.ravel()[roots] == INF]])
+        self.__dist.ravel()[lost] = INF
+        for (gx, gy) in self.goals:
+            self.__dist[gy, gx] = 0
+        if lost.size > 0:
+            (ly, lx) = np.divmod(lost, self.width)
+            y0 = min(y0, ly.min())
+            y1 = max(y1, ly.max() + 1)
+            x0 = min(x0, lx.min())
+            x1 = max(x1, lx.max() + 1)
+        seed = self.__clip(y0 - 1, y1 + 1, x0 - 1, x1 + 1)
+        self.__refreshEnter(seed)
+        touched = self.__relax(seed, np.ones((seed[1] - seed[0], seed[3] - seed[2]), dtype=bool))
+        self.__updateDirection(touched)
+
+    def __readCost(self, x0, y0, x1, y1):
+        if hasattr(self.graph, 'cost') and isinstance(self.graph.cost, np.ndarray):
+            cost = np.array(self.graph.cost[x0:x1, y0:y1].T, dtype=np.float64)
+            cost[~np.isfinite(cost)] = INF
+            return cost
+        cost = np.full((y1 - y0, x1 - x0), INF)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                if self.graph.has_node((x, y)):
+                    cost[y - y0, x - x0] = self.graph.getCost(None, (x, y))
+        return cost
+
+    def __compute(self):
+        self.__dist[...] = INF
+        (gx, gy) = np.array(self.goals, dtype=np.intp).reshape(-1, 2).T
+        self.__dist[gy, gx] = 0
+        changed = np.zeros((self.height, self.width), dtype=bool)
+        changed[gy, gx] = True
+        self.__refreshEnter((0, self.height, 0, self.width))
+        self.__relax((0, self.height, 0, self.width), changed)
+        self.__updateDirection((0, self.height, 0, self.width))
+
+    def __clip(self, r0, r1, c0, c1):
+        # Clip a row/column box to the grid, a box crossing a wrapped edge spans the whole axis
+        if self.boundless:
+            if r0 < 0 or r1 > self.height:
+                (r0, r1) = (0, self.height)
+            if c0 < 0 or c1 > self.width:
+                (c0, c1) = (0, self.width)
+            return (r0, r1, c0, c1)
+        return (max(r0, 0), min(r1, self.height), max(c0, 0), min(c1, self.width))
+
+    def __refreshEnter(self, box):
+        (r0, r1, c0, c1) = box
+        enter = self.__enter
+        enter[r0 + 1:r1 + 1, c0 + 1:c1 + 1] = self.__dist[r0:r1, c0:c1] + self.__cost[r0:r1, c0:c1]
+        if self.boundless:
+            # The halo mirrors the opposite edges, rows first so the corners wrap too
+            enter[0, :] = enter[-2, :]
+            enter[-1, :] = enter[1, :]
+            enter[:, 0] = enter[:, -2]
+            enter[:, -1] = enter[:, 1]
+
+    def __relax(self, box, changed):
+        # Relax the wavefront until no distance improves, returns the box of all touched grids
+        touched = None
+        while True:
+            rows = np.nonzero(changed.any(axis=1))[0]
+            if rows.size == 0:
+                return touched if touched is not None else box
+            cols = np.nonzero(changed.any(axis=0))[0]
+            # Only the neighbors of the grids improved last sweep can improve now
+            box = self.__clip(box[0] + rows[0] - 1, box[0] + rows[-1] + 2, box[2] + cols[0] - 1, box[2] + cols[-1] + 2)
+            (r0, r1, c0, c1) = box
+            best = self.__best(box)[0]
+            region = self.__dist[r0:r1, c0:c1]
+            changed = best < region
+            region[changed] = best[changed]
+            self.__refreshEnter(box)
+            if touched is None:
+                touched = box
+            else:
+                touched = (min(touched[0], r0), max(touched[1], r1), min(touched[2], c0), max(touched[3], c1))
+
+    def __best(self, box, direction=False):
+        # Cheapest neighbor to step into for every grid of the box, and its index into DIRECTIONS
+        (r0, r1, c0, c1) = box
+        best = np.full((r1 - r0, c1 - c0), INF)
+        index = np.full(best.shape, -1, dtype=np.int8) if direction else None
+        for (i, (dx, dy)) in enumerate(DIRECTIONS):
+            candidate = self.__enter[r0 + 1 + dy:r1 + 1 + dy, c0 + 1 + dx:c1 + 1 + dx]
+            if direction:
+                better = candidate < best
+                best[better] = candidate[better]
+                index[better] = i
+            else:
+                np.minimum(best, candidate, out=best)
+        blocked = self.__cost[r0:r1, c0:c1] == INF
+        best[blocked] = INF
+        if direction:
+            index[blocked] = -1
+        return (best, index)
+
+    def __updateDirection(self, box):
+        (r0, r1, c0, c1) = self.__clip(box[0] - 1, box[1] + 1, box[2] - 1, box[3] + 1)
+        direction = self.__best((r0, r1, c0, c1), direction=True)[1]
+        for (gx, gy) in self.goals:
+            if r0 <= gy < r1 and c0 <= gx < c1:
+                direction[gy - r0, gx - c0] = -1
+        self.__dir[r0:r1, c0:c1] = direction
+
+    def __descendants(self, roots):
+        # All grids whose flow enters one of the roots, found by walking the flow tree backwards
+        found = []
+        seen = np.zeros(self.width * self.height, dtype=bool)
+        frontier = np.unique(roots)
+        while frontier.size > 0:
+            (y, x) = np.divmod(frontier, self.width)
+            children = []
+            for (i, (dx, dy)) in enumerate(DIRECTIONS):
+                # A neighbor at (x - dx, y - dy) stepping (dx, dy) lands on the frontier grid
+                nx = x - dx
+                ny = y - dy
+                if self.boundless:
+                    nx %= self.width
+                    ny %= self.height
+                    valid = np.ones(frontier.size, dtype=bool)
+                else:
+                    valid = (nx >= 0) & (nx < self.width) & (ny >= 0) & (ny < self.height)
+                nb = ny[valid] * self.width + nx[valid]
+                children.append(nb[self.__dir.ravel()[nb] == i])
+            frontier = np.unique(np.concatenate(children))
+            # Zero-cost grids may point at each other, never walk a grid twice
+            frontier = frontier[~seen[frontier]]
+            seen[frontier] = True
+            found.append(frontier)
+        return np.concatenate(found) if found else np.zeros(0, dtype=np.intp)
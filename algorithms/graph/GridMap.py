@@ -5,11 +5,40 @@
 # Author: Shin-Fu (Kelvin) Wu
 # Date: 2017/06/09
 """
-from networkx import Graph
+from collections import deque
+import gc
+from networkx import Graph, NetworkXError
 import numpy as np
+from .FlatGrid import DIRECTIONS
+
+# Number of edits kept in the change log of a grid
+CHANGE_LOG = 1024
+
+def _bounds(nodes):
+    # Half-open rectangle (x0, y0, x1, y1) around the vertices, None when any is not a grid
+    xs = []
+    ys = []
+    for node in nodes:
+        if not (isinstance(node, tuple) and len(node) == 2):
+            return None
+        xs.append(node[0])
+        ys.append(node[1])
+    if not xs:
+        return (0, 0, 0, 0)
+    return (min(xs), min(ys), max(xs) + 1, max(ys) + 1)
+
+def changes_since(graph, version):
+    """ Edits logged by the graph after the given version, None when the log does not reach back that far. """
+    current = getattr(graph, 'version', None)
+    if version is None or current is None:
+        return None
+    changes = [c for c in getattr(graph, 'changes', ()) if c[0] > version]
+    if current - version != len(changes) or (changes and changes[0][0] != version + 1):
+        return None
+    return changes
 
 class GridMap(Graph):    
-    def __init__(self, width, height, mtype='bounded'):
+    def __init__(self, width, height, mtype='bounded', implicit=False):
         """ GridMap Graph
             It is implemented with graph object(netwokx.Graph).
             Easy to do the graph manipulation, but the overall cost is slightly higher.            
@@ -20,65 +49,169 @@ class GridMap(Graph):
         height: int
             Height of the grid.
         mtype: string, optional
+        implicit: bool, optional
+            Store only the vertices, neighbors() and has_edge() work out the edges from the
+            coordinates of the vertices still in the graph. Vertices can be removed/added as
+            obstacles, but edges cannot be edited.
         
         Attributes
         ---------
         V: list
             A list of all vertices in the grid.
         E: list
-            A list of all edges in the grid.
+            A list of all edges in the grid, generated on demand.
+        version: int
+            Increased whenever a cost, vertice or edge of the grid is changed.
+        edited_edges: bool
+            True once an edge was added or removed directly, the edges then have to be checked
+            before the grid is searched as a plain 8-neighbor grid (see FlatGrid).
+        changes: deque
+            The latest edits as (version, rect, cheaper) with the half-open rectangle
+            (x0, y0, x1, y1) around the edit (None for the whole grid), cheaper is True
+            when a cost may have dropped or a vertice or edge was added.
         """
         super().__init__()
         self.width = width
         self.height = height
         self.mtype = mtype
+        self.implicit = implicit
+        self.version = 0
+        self.edited_edges = False
+        self.changes = deque(maxlen=CHANGE_LOG)
         self.__initGrid()
     
     def __initGrid(self):
-        self.V = [(x, y) for x in range(self.width) for y in range(self.height)]
-        if self.mtype == 'bounded' or  self.mtype == 'boundless':
-            self.E = self.__genGridEdge()
-            self.add_edges_from(self.E)            
-        else:
+        if self.mtype != 'bounded' and self.mtype != 'boundless':
             raise ValueError('- mtype not supported -')
-        for keys in self.node.keys():
-            self.node[keys]['cost'] = 1            
-            self.node[keys]['sight'] = 1
-            self.node[keys]['vision'] = 0
-    
-    def __genGridEdge(self):
-        Edge = []
-        for i in range(len(self.V)):            
-            # It checks only the neighboring vertices and performs better when number of grids is huge
-            V_ = [(self.V[i][0]-1, self.V[i][1]-1), (self.V[i][0], self.V[i][1]-1), (self.V[i][0]+1, self.V[i][1]-1),\
-                  (self.V[i][0]-1, self.V[i][1]),                                   (self.V[i][0]+1, self.V[i][1]),\
-                  (self.V[i][0]-1, self.V[i][1]+1), (self.V[i][0], self.V[i][1]+1), (self.V[i][0]+1, self.V[i][1]+1)]
-            
-            for j in range(len(V_)):
-                if self.mtype == 'bounded' \
-                and (V_[j][0] >= 0 and V_[j][0] < self.width) \
-                and (V_[j][1] >= 0 and V_[j][1] < self.height):
-                    Edge.append((self.V[i], V_[j]))
-                
-                elif self.mtype == 'boundless':
-                    (x, y) = V_[j]  
-                    
-                    # boundless setting on x-asix
-                    if V_[j][0] < 0 :
-                        x = V_[j][0] + self.width
-                    elif V_[j][0] >= self.width:
-                        x = V_[j][0] - self.width
-                    # boundless setting on y-asix
-                    if V_[j][1] < 0:
-                        y = V_[j][1] + self.height
-                    elif V_[j][1] >= self.height:
-                        y = V_[j][1] - self.height
-                        
-                    Edge.append((self.V[i], (x, y)))
-        return Edge
+        # Millions of new dictionaries would trigger the cyclic garbage collector over and over
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.__fillGrid()
+        finally:
+            if enabled:
+                gc.enable()
+    
+    def __fillGrid(self):
+        self.V = [(x, y) for x in range(self.width) for y in range(self.height)]
+        # Fill the networkx dictionaries directly, going through add_edges_from costs several times more
+        adj = self._adj
+        self._node.update((v, {'cost': 1, 'sight': 1, 'vision': 0}) for v in self.V)
+        adj.update((v, {}) for v in self.V)
+        if self.implicit:
+            return
+        V = self.V
+        new = self.edge_attr_dict_factory
+        table = self.__neighborTable()
+        # Each edge is made when its first end in V is reached, in the order of the edge list,
+        # so neighbors() returns the same order as adding the edge list would give
+        for start in range(0, len(V), 1 << 16):
+            rows = table[start:start + (1 << 16)]
+            (i, k) = np.nonzero(rows >= np.arange(start, start + rows.shape[0])[:, None])
+            for (u, v) in zip((i + start).tolist(), rows[i, k].tolist()):
+                (u, v) = (V[u], V[v])
+                adj[u][v] = adj[v][u] = new()
+    
+    def __neighborTable(self):
+        # Index into V of the 8 neighbors of every vertice, -1 beyond the bounds
+        (w, h) = (self.width, self.height)
+        x = np.repeat(np.arange(w), h)
+        y = np.tile(np.arange(h), w)
+        table = np.empty((w * h, len(DIRECTIONS)), dtype=np.intp)
+        for (k, (dx, dy)) in enumerate(DIRECTIONS):
+            (nx, ny) = (x + dx, y + dy)
+            if self.mtype == 'boundless':
+                table[:, k] = (nx % w) * h + ny % h
+            else:
+                valid = (nx >= 0) & (nx < w) & (ny >= 0) & (ny < h)
+                table[:, k] = np.where(valid, nx * h + ny, -1)
+        return table
+    
+    @property
+    def E(self):
+        V = self.V
+        return [(V[i], V[j]) for (i, row) in enumerate(self.__neighborTable().tolist()) for j in row if j >= 0]
+    
+    def neighbors(self, n):
+        """ Get Neighbors
+        Parameters
+        ----------
+        n: tuple
+            The vertice on the grid for neighbor searching.
+        """
+        if not self.implicit:
+            return super().neighbors(n)
+        if n not in self._node:
+            raise NetworkXError('The node %s is not in the graph.' % (n,))
+        (x, y) = n
+        neighbor = []
+        for (dx, dy) in DIRECTIONS:
+            (nx, ny) = (x + dx, y + dy)
+            if self.mtype == 'boundless':
+                (nx, ny) = (nx % self.width, ny % self.height)
+            if (nx, ny) in self._node:
+                neighbor.append((nx, ny))
+        # Neighbors wrapping onto the same vertice of a small torus are listed once
+        return list(dict.fromkeys(neighbor))
+    
+    def has_edge(self, u, v):
+        if not self.implicit:
+            return super().has_edge(u, v)
+        return u in self._node and v in self._node and v in self.neighbors(u)
+    
+    def add_node(self, node, **attr):
+        super().add_node(node, **attr)
+        self.__mark([node], True)
+    
+    def add_nodes_from(self, nodes, **attr):
+        nodes = list(nodes)
+        super().add_nodes_from(nodes, **attr)
+        self.__mark(nodes, True)
+    
+    def remove_node(self, node):
+        super().remove_node(node)
+        self.__mark([node], False)
+    
+    def remove_nodes_from(self, nodes):
+        nodes = list(nodes)
+        super().remove_nodes_from(nodes)
+        self.__mark(nodes, False)
+    
+    def add_edge(self, u, v, **attr):
+        self.__explicit()
+        super().add_edge(u, v, **attr)
+        self.__mark([u, v], True)
+    
+    def add_edges_from(self, edges, **attr):
+        self.__explicit()
+        edges = list(edges)
+        super().add_edges_from(edges, **attr)
+        self.__mark([e[0] for e in edges] + [e[1] for e in edges], True)
+    
+    def remove_edge(self, u, v):
+        self.__explicit()
+        super().remove_edge(u, v)
+        self.__mark([u, v], False)
+    
+    def remove_edges_from(self, edges):
+        self.__explicit()
+        edges = list(edges)
+        super().remove_edges_from(edges)
+        self.__mark([e[0] for e in edges] + [e[1] for e in edges], False)
     
     def setCost(self, cNode, nNode, value):
+        cheaper = value < self.node[nNode].get('cost', 1)
         self.node[nNode]['cost'] = value
+        self.__mark([nNode], cheaper)
+    
+    def __mark(self, nodes, cheaper):
+        self.version += 1
+        self.changes.append((self.version, _bounds(nodes), cheaper))
+    
+    def __explicit(self):
+        if self.implicit:
+            raise ValueError('- edges of an implicit grid cannot be edited -')
+        self.edited_edges = True
     
     def getCost(self, cNode, nNode):
         """ Cost of Path
@@ -114,6 +247,20 @@ class GridMap(Graph):
     def getVision(self, node):
         return self.node[node]['vision']
     
+class _GridView():
+    """ Read-only per-grid view over the planes of a gridMap. """
+    def __init__(self, graph):
+        self.__graph = graph
+        self.shape = graph.cost.shape
+    
+    def __getitem__(self, pos):
+        (x, y) = pos
+        g = self.__graph
+        return {'cost': g.cost[x, y].item(), 'sight': g.sight[x, y].item(), 'vision': g.vision[x, y].item()}
+    
+    def __setitem__(self, pos, value):
+        raise TypeError('- grid is read-only, use setCost/setSight/setVision/setRegion -')
+    
 class gridMap():
     def __init__(self, width, height, mtype='bounded'):
         """ GridMap Graph
@@ -130,26 +277,59 @@ class gridMap():
         
         Attributes
         ---------
-        grid: numpy.array
-            Stores a dictionary in each grid.
+        cost: numpy.array
+            Movement cost of entering each grid, indexed as cost[x, y].
+        sight: numpy.array
+            Sight value of each grid, indexed as sight[x, y].
+        vision: numpy.array
+            Vision value of each grid, indexed as vision[x, y].
+        version: int
+            Increased whenever the cost plane is changed through setCost/setRegion.
+        changes: deque
+            The latest cost edits as (version, rect, cheaper), as in GridMap.
+        grid: _GridView
+            Read-only view giving the former dictionary of each grid, grid[x, y] -> {'cost', 'sight', 'vision'}.
         """
         self.width = width
         self.height = height
         self.mtype = mtype
+        self.version = 0
+        self.changes = deque(maxlen=CHANGE_LOG)
         self.__initGrid()
         
+    @classmethod
+    def from_planes(cls, cost, sight, vision, mtype='bounded'):
+        """ Build a gridMap around existing planes indexed [x, y] (e.g. memory-mapped ones), without copying them. """
+        if mtype != 'bounded' and mtype != 'boundless':
+            raise ValueError('- mtype not supported -')
+        if not (cost.shape == sight.shape == vision.shape) or cost.ndim != 2:
+            raise ValueError('- planes do not have the same shape -')
+        grid = cls.__new__(cls)
+        (grid.width, grid.height) = cost.shape
+        grid.mtype = mtype
+        grid.version = 0
+        grid.changes = deque(maxlen=CHANGE_LOG)
+        grid.cost = cost
+        grid.sight = sight
+        grid.vision = vision
+        return grid
+    
+    @property
+    def grid(self):
+        """ Compatibility view of the former numpy.array of dictionaries, edit the grids with setCost/setRegion. """
+        return _GridView(self)
+    
     def __initGrid(self):
         
         if self.mtype == 'bounded' or  self.mtype == 'boundless':
-            self.grid = np.empty([self.width, self.height], dtype=dict)
-            
-            for i in range(self.grid.shape[0]):
-                for j in range(self.grid.shape[1]):
-                    self.grid[i, j] = {'cost': 1, 'sight': 1, 'vision': 0}
-            
+            # One typed plane per attribute instead of a dictionary per grid
+            shape = (self.width, self.height)
+            self.cost = np.ones(shape, dtype=np.float64)
+            self.sight = np.ones(shape, dtype=np.float64)
+            self.vision = np.zeros(shape, dtype=np.float64)
         else:
             raise ValueError('- mtype not supported -')
-    
+
     def neighbors(self, pos):
         """ Get Neighbors
         Parameters
@@ -186,19 +366,58 @@ class gridMap():
         return neighbor
     
     def setCost(self, cNode, nNode, value):
-        self.grid[nNode[0], nNode[1]]['cost'] = value
+        cheaper = value < self.cost[nNode[0], nNode[1]]
+        self.cost[nNode[0], nNode[1]] = value
+        self.__mark((nNode[0], nNode[1], nNode[0] + 1, nNode[1] + 1), bool(cheaper))
     
     def getCost(self, cNode, nNode):
-        return self.grid[nNode[0], nNode[1]]['cost']
+        return self.cost[nNode[0], nNode[1]].item()
     
     def setSight(self, node, value):
-        self.grid[node[0], node[1]]['sight'] = value
+        self.sight[node[0], node[1]] = value
     
     def getSight(self, node):
-        return self.grid[node[0], node[1]]['sight']
+        return self.sight[node[0], node[1]].item()
     
     def setVision(self, node, value):
-        self.grid[node[0], node[1]]['vision'] = value
+        self.vision[node[0], node[1]] = value
     
     def getVision(self, node):
-        return self.grid[node[0], node[1]]['vision']
\ No newline at end of file
+        return self.vision[node[0], node[1]].item()
+    
+    def setRegion(self, plane, value, rect=None, mask=None):
+        """ Bulk Edit
+            Set many grids of one plane in a single vectorized call.
+        Parameters
+        ----------
+        plane: string
+            The plane to edit, one of 'cost', 'sight' or 'vision'.
+        value: number or numpy.array
+            The new value, or an array matching the shape of the selected region.
+        rect: tuple, optional
+            The half-open rectangle (x0, y0, x1, y1) to edit. Whole grid by default.
+        mask: numpy.array, optional
+            Boolean array selecting grids inside the region (same shape as the region).
+        """
+        if plane not in ('cost', 'sight', 'vision'):
+            raise ValueError('- plane not supported -')
+        region = getattr(self, plane)
+        if rect is not None:
+            (x0, y0, x1, y1) = rect
+            region = region[x0:x1, y0:y1]
+        before = region.copy() if plane == 'cost' else None
+        if mask is None:
+            region[...] = value
+        else:
+            mask = np.asarray(mask, dtype=bool)
+            if mask.shape != region.shape:
+                raise ValueError('- mask shape does not match the region -')
+            value = np.asarray(value)
+            region[mask] = value[mask] if value.shape == mask.shape else value
+        if plane == 'cost':
+            cheaper = bool(np.any(region < before))
+            self.__mark(tuple(rect) if rect is not None else (0, 0, self.width, self.height), cheaper)
+    
+    def __mark(self, rect, cheaper):
+        self.version += 1
+        self.changes.append((self.version, rect, cheaper))
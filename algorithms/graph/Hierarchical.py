@@ -0,0 +1,373 @@
+""" HIERARCHICAL PATHFINDING MODULE
+# Description:
+    This is python implementation of near-optimal hierarchical path-finding (HPA*) on GridMap/gridMap.
+    The grid is split into square clusters, entrances are placed on the cluster borders and the
+    costs between the entrances of a cluster are found inside the cluster only. Long queries are
+    answered on this abstract graph and only refined into grid moves cluster by cluster.
+    Clusters are built on first use and rebuilt alone when one of their grids changes, the edits
+    logged by the graph are picked up at the start of each query.
+# Author: agent
+# Date: 2026/10/18
+# Reference:
+    * Botea, A., Mueller, M. and Schaeffer, J. Near Optimal Hierarchical Path-Finding. JOGD 2004.
+"""
+import heapq
+from itertools import count
+from .FlatGrid import FlatGrid, INF
+from .GridMap import changes_since
+
+# Borders owned by a cluster: right, down, down-right corner and down-left corner
+BORDERS = ((1, 0), (0, 1), (1, 1), (-1, 1))
+
+class HierarchicalPathFinding():
+    def __init__(self, graph, cluster_size=16):
+        """ Hierarchical Path Finder
+        Parameters
+        ----------
+        graph: GridMap or gridMap
+            The grid map with movement cost and neighbor functions.
+        cluster_size: int, optional
+            Width and height of a cluster in grids.
+
+        Attributes
+        ---------
+        ncx, ncy: int
+            Number of clusters along x and y.
+        """
+        self.graph = graph
+        self.grid = FlatGrid(graph)
+        self.width = self.grid.width
+        self.height = self.grid.height
+        self.boundless = self.grid.mtype == 'boundless'
+        self.cluster_size = cluster_size
+        self.ncx = -(-self.width // cluster_size)
+        self.ncy = -(-self.height // cluster_size)
+        # The costs of the snapshot, patched in place as the graph is edited
+        self.__cost = self.grid.cost
+        self.__borders = {}
+        self.__clusters = {}
+
+    def build(self):
+        """ Build every cluster now instead of on first use. """
+        for cy in range(self.ncy):
+            for cx in range(self.ncx):
+                self.__cluster((cx, cy))
+
+    def update(self, nodes=None):
+        """ Update Grids
+            Edits logged by the graph (setCost, setRegion, remove_node, ...) are picked up by the next
+            query. Graphs without a version are read again, and the clusters (and borders) of the
+            given vertices dropped so they are rebuilt on next use.
+        Parameters
+        ----------
+        nodes: list, optional
+            The changed vertices of a graph without a version.
+        """
+        if getattr(self.graph, 'version', None) is not None:
+            self.__sync()
+            return
+        self.grid = FlatGrid(self.graph)
+        self.__cost = self.grid.cost
+        for node in nodes or ():
+            self.__drop(node[0], node[1], node[0] + 1, node[1] + 1)
+
+    def __sync(self):
+        # Replay the edits made since the last query, only the clusters they touch are rebuilt
+        version = getattr(self.graph, 'version', None)
+        if version is None or version == self.grid.version:
+            return
+        changes = changes_since(self.graph, self.grid.version)
+        if changes is None or any(rect is None for (_, rect, _) in changes) or not self.grid.update(self.graph):
+            self.grid = FlatGrid(self.graph)
+            self.__cost = self.grid.cost
+            self.__borders.clear()
+            self.__clusters.clear()
+            return
+        for (_, rect, _) in changes:
+            self.__drop(*rect)
+
+    def __drop(self, x0, y0, x1, y1):
+        # Drop the clusters with grids in the rectangle, and the borders (with the clusters across
+        # them) when the rectangle reaches the border grids of a cluster
+        size = self.cluster_size
+        (x0, y0, x1, y1) = (max(x0, 0), max(y0, 0), min(x1, self.width), min(y1, self.height))
+        for cy in range(y0 // size, (y1 - 1) // size + 1):
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                K = (cx, cy)
+                self.__clusters.pop(K, None)
+                (bx0, by0, bx1, by1) = self.__box(K)
+                if bx0 < max(x0, bx0) and min(x1, bx1) < bx1 and by0 < max(y0, by0) and min(y1, by1) < by1:
+                    continue
+                # Border grids also shape the entrances of the neighboring clusters
+                for d in BORDERS:
+                    self.__borders.pop((K, d), None)
+                    L = self.__neighborCluster(K, d[0], d[1])
+                    if L is not None:
+                        self.__clusters.pop(L, None)
+                    L = self.__neighborCluster(K, -d[0], -d[1])
+                    if L is not None:
+                        self.__borders.pop((L, d), None)
+                        self.__clusters.pop(L, None)
+
+    def get_path(self, start, goal):
+        """ Get Path List
+        Parameters
+        ----------
+        start: tuple
+            The starting vertice on the grid map.
+        goal: tuple
+            The targeting vertice on the grid map.
+        """
+        path = self.iter_path(start, goal)
+        return None if path is None else list(path)
+
+    def iter_path(self, start, goal):
+        """ Get Path Iterator
+            Search the abstract graph now, and refine each cluster segment into grid moves
+            only when the iterator reaches it.
+        Parameters
+        ----------
+        start: tuple
+            The starting vertice on the grid map.
+        goal: tuple
+            The targeting vertice on the grid map.
+        """
+        abstract = self.get_abstract_path(start, goal)
+        if abstract is None:
+            return None
+        return self.__refine(abstract)
+
+    def get_abstract_path(self, start, goal):
+        """ Get the list of entrance vertices (with start and goal) the path goes through. """
+        self.__sync()
+        s = self.grid.index(start)
+        t = self.grid.index(goal)
+        if self.__cost[t] == INF:
+            return None
+        if s == t:
+            return [tuple(start)]
+
+        Ks = self.__clusterOf(s)
+        Kt = self.__clusterOf(t)
+        targets = self.__cluster(Ks)[0] + ([t] if Ks == Kt else [])
+        start_edges = list(self.__costs(s, Ks, targets).items())
+        goal_edges = self.__costs(t, Kt, self.__cluster(Kt)[0], reverse=True)
+
+        tie = count()
+        frontier = [(0, 0, s)]
+        came_from = {s: None}
+        cost_so_far = {s: 0}
+        closed = set()
+        while frontier:
+            (_, _, current) = heapq.heappop(frontier)
+            if current in closed:
+                continue
+            closed.add(current)
+            if current == t:
+                path = [self.grid.node(t)]
+                while came_from[current] is not None:
+                    current = came_from[current]
+                    path.append(self.grid.node(current))
+                path.reverse()
+                return path
+            edges = self.__cluster(self.__clusterOf(current))[1].get(current, [])
+            if current == s:
+                edges = edges + start_edges
+            if current in goal_edges:
+                edges = edges + [(t, goal_edges[current])]
+            for (next_, cost) in edges:
+                new_cost = cost_so_far[current] + cost
+                if next_ not in cost_so_far or new_cost < cost_so_far[next_]:
+                    cost_so_far[next_] = new_cost
+                    came_from[next_] = current
+                    priority = new_cost + self.__heuristic(next_, t)
+                    heapq.heappush(frontier, (priority, -next(tie), next_))
+        # Return None when there is no path
+        return None
+
+    def __refine(self, abstract):
+        yield abstract[0]
+        for (u, v) in zip(abstract, abstract[1:]):
+            i = self.grid.index(u)
+            j = self.grid.index(v)
+            K = self.__clusterOf(i)
+            if K != self.__clusterOf(j):
+                # Inter-cluster edges join two neighboring grids
+                yield v
+                continue
+            for node in self.__segment(i, j, K):
+                yield node
+
+    def __heuristic(self, a, b):
+        (ax, ay) = self.grid.node(a)
+        (bx, by) = self.grid.node(b)
+        dx = abs(ax - bx)
+        dy = abs(ay - by)
+        if self.boundless:
+            dx = min(dx, self.width - dx)
+            dy = min(dy, self.height - dy)
+        return max(dx, dy) * self.grid.min_cost
+
+    def __clusterOf(self, i):
+        (y, x) = divmod(i, self.width)
+        return (x // self.cluster_size, y // self.cluster_size)
+
+    def __box(self, K):
+        x0 = K[0] * self.cluster_size
+        y0 = K[1] * self.cluster_size
+        return (x0, y0, min(x0 + self.cluster_size, self.width), min(y0 + self.cluster_size, self.height))
+
+    def __neighborCluster(self, K, dx, dy):
+        cx = K[0] + dx
+        cy = K[1] + dy
+        if self.boundless:
+            L = (cx % self.ncx, cy % self.ncy)
+            return None if L == K else L
+        if 0 <= cx < self.ncx and 0 <= cy < self.ncy:
+            return (cx, cy)
+        return None
+
+    def __free(self, x, y):
+        return self.__cost[(y % self.height) * self.width + (x % self.width)] != INF
+
+    def __border(self, K, d):
+        # Crossing pairs (a in K, b in the neighbor) of the border of K in direction d
+        key = (K, d)
+        if key in self.__borders:
+            return self.__borders[key]
+        pairs = []
+        if self.__neighborCluster(K, d[0], d[1]) is not None:
+            (x0, y0, x1, y1) = self.__box(K)
+            free = self.__free
+            if d == (1, 1):
+                if free(x1 - 1, y1 - 1) and free(x1, y1):
+                    pairs.append(((x1 - 1, y1 - 1), (x1, y1)))
+            elif d == (-1, 1):
+                if free(x0, y1 - 1) and free(x0 - 1, y1):
+                    pairs.append(((x0, y1 - 1), (x0 - 1, y1)))
+            else:
+                # Walk along the border, a is on the K side and b across it
+                if d == (1, 0):
+                    cells = [((x1 - 1, y), (x1, y)) for y in range(y0, y1)]
+                else:
+                    cells = [((x, y1 - 1), (x, y1)) for x in range(x0, x1)]
+                straight = [free(a[0], a[1]) and free(b[0], b[1]) for (a, b) in cells]
+                # One entrance per run of open crossings, or one at each end of a long run
+                k = 0
+                while k < len(cells):
+                    if not straight[k]:
+                        k += 1
+                        continue
+                    e = k
+                    while e + 1 < len(cells) and straight[e + 1]:
+                        e += 1
+                    if e - k + 1 >= 6:
+                        pairs.extend([cells[k], cells[e]])
+                    else:
+                        pairs.append(cells[(k + e) // 2])
+                    k = e + 1
+                # Diagonal crossings are only needed where no straight crossing is next to them
+                for k in range(len(cells) - 1):
+                    if straight[k] or straight[k + 1]:
+                        continue
+                    for (a, b) in ((cells[k][0], cells[k + 1][1]), (cells[k + 1][0], cells[k][1])):
+                        if free(a[0], a[1]) and free(b[0], b[1]):
+                            pairs.append((a, b))
+        pairs = [(self.grid.index(self.__wrap(a)), self.grid.index(self.__wrap(b))) for (a, b) in pairs]
+        self.__borders[key] = pairs
+        return pairs
+
+    def __wrap(self, node):
+        return (node[0] % self.width, node[1] % self.height)
+
+    def __cluster(self, K):
+        # (entrances, abstract edges of each entrance) of the cluster, intra-cluster edges first
+        if K in self.__clusters:
+            return self.__clusters[K]
+        links = {}
+        for d in BORDERS:
+            for (a, b) in self.__border(K, d):
+                links.setdefault(a, []).append((b, self.__cost[b]))
+            L = self.__neighborCluster(K, -d[0], -d[1])
+            if L is not None:
+                for (a, b) in self.__border(L, d):
+                    links.setdefault(b, []).append((a, self.__cost[a]))
+        entrances = list(links)
+        edges = {}
+        for e in entrances:
+            edges[e] = [edge for edge in self.__costs(e, K, entrances).items() if edge[0] != e] + links[e]
+        cluster = (entrances, edges)
+        self.__clusters[K] = cluster
+        return cluster
+
+    def __costs(self, source, K, targets, reverse=False):
+        # Cost from source to each reachable target inside cluster K (from each target to source if reverse)
+        (dist, _, local, _) = self.__search(source, K, reverse=reverse)
+        costs = {}
+        for target in targets:
+            d = dist[local(target)]
+            if d != INF:
+                costs[target] = d
+        return costs
+
+    def __segment(self, source, target, K):
+        # Vertices after source on the cheapest way to target inside cluster K
+        (_, parent, local, to_global) = self.__search(source, K, target=target)
+        segment = []
+        current = local(target)
+        stop = local(source)
+        while current != stop:
+            segment.append(self.grid.node(to_global(current)))
+            current = parent[current]
+        segment.reverse()
+        return segment
+
+    def __search(self, source, K, reverse=False, target=None):
+        # Dijkstra restricted to cluster K on a local copy of its costs padded with blocked grids.
+        # A cluster spanning a wrapped axis keeps its wrapped moves and uses the full grid instead.
+        (x0, y0, x1, y1) = self.__box(K)
+        w = self.width
+        if self.boundless and (self.ncx == 1 or self.ncy == 1):
+            cost = self.__cost
+            clusterOf = self.__clusterOf
+            grid_neighbors = self.grid.neighbors
+            neighbors = lambda i: [n for n in grid_neighbors(i) if clusterOf(n) == K]
+            local = to_global = lambda i: i
+            size = self.grid.size
+        else:
+            lw = x1 - x0 + 2
+            cost = [INF] * (lw * (y1 - y0 + 2))
+            for y in range(y0, y1):
+                k = (y - y0 + 1) * lw + 1
+                cost[k:k + x1 - x0] = self.__cost[y * w + x0:y * w + x1]
+            offsets = (-lw-1, -lw, -lw+1, -1, 1, lw-1, lw, lw+1)
+            neighbors = lambda i: [i + o for o in offsets]
+            local = lambda i: (i // w - y0 + 1) * lw + (i % w - x0 + 1)
+            to_global = lambda l: (l // lw - 1 + y0) * w + (l % lw - 1 + x0)
+            size = len(cost)
+
+        source = local(source)
+        target = None if target is None else local(target)
+        dist = [INF] * size
+        parent = [-1] * size
+        dist[source] = 0
+        frontier = [(0, source)]
+        while frontier:
+            (d, current) = heapq.heappop(frontier)
+            if d > dist[current]:
+                continue
+            if current == target:
+                break
+            step = cost[current]
+            if reverse and step == INF:
+                continue
+            for next_ in neighbors(current):
+                c = cost[next_]
+                if c == INF:
+                    continue
+                new_cost = d + (step if reverse else c)
+                if new_cost < dist[next_]:
+                    dist[next_] = new_cost
+                    parent[next_] = current
+                    heapq.heappush(frontier, (new_cost, next_))
+        return (dist, parent, local, to_global)
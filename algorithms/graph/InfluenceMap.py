@@ -0,0 +1,189 @@
+""" INFLUENCE MAP MODULE
+# Description:
+    This is the influence (threat) map of many sources spreading over a GridMap/gridMap.
+    Every source adds strength * decay ** d to the grids it reaches within a cost d <= radius,
+    where d is the cheapest cost of walking there, so walls block and expensive terrain damps.
+    The sources are spread together as one stack of windows relaxed with numpy, and on update
+    only the sources that moved, or whose window saw a map edit, are spread again.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+"""
+import math
+from itertools import count
+import numpy as np
+from .FlatGrid import FlatGrid, INF, DIRECTIONS
+from .GridMap import changes_since
+
+# Most window grids relaxed at once, larger batches of sources are split
+BATCH = 2 ** 22
+
+class InfluenceMap():
+    def __init__(self, graph, decay=0.5, radius=8):
+        """ Influence Map
+            Moving from a grid to its neighbor costs the cost of the neighbor, as in PathFinding.
+            Sources and map edits are applied on update(), typically once per tick.
+        Parameters
+        ----------
+        graph: GridMap or gridMap
+            The grid map with movement costs.
+        decay: float, optional
+            Share of the influence kept per unit of cost walked, in (0, 1].
+        radius: float, optional
+            Largest cost walked from a source, grids farther away get nothing from it.
+
+        Attributes
+        ---------
+        values: numpy.array
+            Summed influence of each grid, indexed as values[x, y].
+        version: int
+            The version of the graph the influence was spread on.
+        """
+        if not 0 < decay <= 1:
+            raise ValueError('- decay must be in (0, 1] -')
+        if not radius >= 0:
+            raise ValueError('- radius must not be negative -')
+        self.graph = graph
+        self.decay = decay
+        self.radius = radius
+        self.width = graph.width
+        self.height = graph.height
+        self.boundless = graph.mtype == 'boundless'
+        self.values = np.zeros((self.width, self.height))
+        self.version = None
+        # id -> [vertice, strength, (columns, rows, weights) or None]
+        self.__sources = {}
+        self.__dirty = set()
+        self.__ids = count()
+        self.__load()
+
+    def add_source(self, node, strength=1.0):
+        """ Add a source standing on the vertice, returns its id. Negative strengths subtract. """
+        source = next(self.__ids)
+        self.__sources[source] = [tuple(node), strength, None]
+        self.__dirty.add(source)
+        return source
+
+    def move_source(self, source, node):
+        """ Move the source to another vertice. """
+        self.__sources[source][0] = tuple(node)
+        self.__dirty.add(source)
+
+    def set_strength(self, source, strength):
+        """ Change the strength of the source, its spread is rescaled without walking again. """
+        state = self.__sources[source]
+        if state[2] is not None:
+            self.__add(state[2], strength - state[1])
+        state[1] = strength
+
+    def remove_source(self, source):
+        """ Remove the source and its influence. """
+        state = self.__sources.pop(source)
+        self.__dirty.discard(source)
+        if state[2] is not None:
+            self.__add(state[2], -state[1])
+        if not self.__sources:
+            # Nothing left, drop the rounding residue of the removals
+            self.values[...] = 0
+
+    def get_influence(self, node):
+        """ Summed influence on the vertice, as of the last update(). """
+        return self.values[node[0], node[1]].item()
+
+    def update(self):
+        """ Spread the sources added or moved since the last update, and those near map edits. """
+        version = getattr(self.graph, 'version', None)
+        if version is None or version != self.version:
+            changes = changes_since(self.graph, self.version)
+            reach = self.__reach
+            self.__load()
+            if changes is None or reach != self.__reach or any(rect is None for (_, rect, _) in changes):
+                self.__dirty.update(self.__sources)
+            else:
+                self.__dirty.update(self.__near([rect for (_, rect, _) in changes]))
+        if not self.__dirty:
+            return
+        sources = sorted(self.__dirty)
+        self.__dirty = set()
+        for source in sources:
+            (_, strength, spread) = self.__sources[source]
+            if spread is not None:
+                self.__add(spread, -strength)
+        (nx, ny) = (2 * self.__reach[0] + 1, 2 * self.__reach[1] + 1)
+        batch = max(1, BATCH // (nx * ny))
+        for i in range(0, len(sources), batch):
+            chunk = sources[i:i + batch]
+            for (source, spread) in zip(chunk, self.__spread([self.__sources[s][0] for s in chunk])):
+                state = self.__sources[source]
+                state[2] = spread
+                self.__add(spread, state[1])
+
+    def __load(self):
+        # Costs as [x, y], and the half sizes of the windows walked within the radius
+        grid = FlatGrid(self.graph)
+        self.version = grid.version
+        self.__cost = grid.cost_array.reshape(self.height, self.width).T
+        finite = grid.cost_array[np.isfinite(grid.cost_array)]
+        unit = float(finite.min()) if finite.size > 0 else INF
+        steps = math.ceil(self.radius / unit) if unit > 0 else max(self.width, self.height)
+        if self.boundless:
+            # A window never overlaps itself, paths wrapping all around the map are not walked
+            self.__reach = (min(steps, (self.width - 1) // 2), min(steps, (self.height - 1) // 2))
+        else:
+            self.__reach = (min(steps, self.width - 1), min(steps, self.height - 1))
+
+    def __near(self, rects):
+        # Sources whose window overlaps one of the edited rectangles
+        if not self.__sources:
+            return []
+        ids = list(self.__sources)
+        (sx, sy) = np.array([self.__sources[s][0] for s in ids]).T
+        (rx, ry) = self.__reach
+        near = np.zeros(len(ids), dtype=bool)
+        shifts = (-1, 0, 1) if self.boundless else (0,)
+        for (x0, y0, x1, y1) in rects:
+            for kx in shifts:
+                for ky in shifts:
+                    (ox, oy) = (kx * self.width, ky * self.height)
+                    near |= (sx + rx >= x0 + ox) & (sx - rx < x1 + ox) & (sy + ry >= y0 + oy) & (sy - ry < y1 + oy)
+        return [s for (s, n) in zip(ids, near) if n]
+
+    def __spread(self, nodes):
+        # Walk the windows of all the sources at once, returns the weights of every source
+        (rx, ry) = self.__reach
+        (sx, sy) = np.array(nodes, dtype=np.intp).reshape(-1, 2).T
+        xs = sx[:, None] + np.arange(-rx, rx + 1)
+        ys = sy[:, None] + np.arange(-ry, ry + 1)
+        if self.boundless:
+            (xs, ys) = (xs % self.width, ys % self.height)
+            (vx, vy) = (np.ones(xs.shape, dtype=bool), np.ones(ys.shape, dtype=bool))
+        else:
+            (vx, vy) = ((xs >= 0) & (xs < self.width), (ys >= 0) & (ys < self.height))
+        cost = self.__cost[np.clip(xs, 0, self.width - 1)[:, :, None], np.clip(ys, 0, self.height - 1)[:, None, :]]
+        cost[~(vx[:, :, None] & vy[:, None, :])] = INF
+
+        # Cost walked from the source with a one-grid halo, the source stands at the center
+        (n, nx, ny) = cost.shape
+        dist = np.full((n, nx + 2, ny + 2), INF)
+        inner = dist[:, 1:-1, 1:-1]
+        inner[:, rx, ry] = np.where(cost[:, rx, ry] != INF, 0, INF)
+        best = np.empty(cost.shape)
+        while True:
+            best[...] = INF
+            for (dx, dy) in DIRECTIONS:
+                np.minimum(best, dist[:, 1 + dx:nx + 1 + dx, 1 + dy:ny + 1 + dy], out=best)
+            best += cost
+            best[best > self.radius] = INF
+            better = best < inner
+            if not better.any():
+                break
+            inner[better] = best[better]
+
+        reached = np.isfinite(inner)
+        weights = np.zeros(inner.shape)
+        weights[reached] = np.power(self.decay, inner[reached])
+        return [(xs[i][vx[i]], ys[i][vy[i]], weights[i][vx[i]][:, vy[i]]) for i in range(n)]
+
+    def __add(self, spread, strength):
+        (xs, ys, weights) = spread
+        self.values[np.ix_(xs, ys)] += strength * weights
@@ -0,0 +1,205 @@
+""" JUMP POINT SEARCH MODULE
+# Description:
+    This is python implementation of Jump Point Search on uniform-cost 8-connected grids.
+    Diagonal moves may cut corners and cost the same as straight moves, as in GridMap/gridMap.
+# Author: agent
+# Date: 2026/10/18
+# Reference:
+    * Harabor, D. and Grastien, A. Online Graph Pruning for Pathfinding on Grid Maps. AAAI 2011.
+"""
+import heapq
+from itertools import count
+import numpy as np
+from .FlatGrid import INF, DIRECTIONS
+
+class JumpPointSearch():
+    def __init__(self, grid):
+        """ Jump Point Search
+        Parameters
+        ----------
+        grid: FlatGrid
+            The flattened grid to search on.
+
+        Attributes
+        ---------
+        uniform: bool
+            True when every open grid of the whole map has the same cost, the only case Jump Point
+            Search is optimal. It is not tracked per region.
+        unit: float
+            The cost of entering any open grid.
+        """
+        self.grid = grid
+        self.width = grid.width
+        self.height = grid.height
+        self.boundless = grid.mtype == 'boundless'
+        self.walk = [c != INF for c in grid.cost]
+
+        finite = grid.cost_array[np.isfinite(grid.cost_array)]
+        self.unit = float(finite[0]) if finite.size > 0 else 1.0
+        self.uniform = bool(np.all(finite == self.unit)) and self.unit > 0
+        if self.boundless and (self.width < 3 or self.height < 3):
+            # Wrapped neighbors overlap each other on such narrow tori
+            self.uniform = False
+
+    def get_path(self, start, goal):
+        """ Get Path List
+        Parameters
+        ----------
+        start: tuple
+            The starting vertice on the grid map.
+        goal: tuple
+            The targeting vertice on the grid map.
+        """
+        start = tuple(start)
+        goal = tuple(goal)
+        if start == goal:
+            return [start]
+        if not self.__free(goal[0], goal[1]):
+            return None
+
+        tie = count()
+        frontier = [(self.__heuristic(start, goal), 0, start)]
+        came_from = {start: None}
+        cost_so_far = {start: 0}
+        closed = set()
+
+        while frontier:
+            (_, _, current) = heapq.heappop(frontier)
+            if current in closed:
+                continue
+            if current == goal:
+                return self.__reconstruct_path(came_from, goal)
+            closed.add(current)
+
+            for (dx, dy) in self.__directions(current, came_from[current]):
+                jump = self.__jump(current[0], current[1], dx, dy, goal)
+                if jump is None:
+                    continue
+                (next_, steps) = jump
+                new_cost = cost_so_far[current] + steps * self.unit
+                if next_ not in cost_so_far or new_cost < cost_so_far[next_]:
+                    cost_so_far[next_] = new_cost
+                    came_from[next_] = (current, dx, dy, steps)
+                    priority = new_cost + self.__heuristic(next_, goal)
+                    heapq.heappush(frontier, (priority, -next(tie), next_))
+        # Return None when there is no path
+        return None
+
+    def __heuristic(self, a, b):
+        # Chebyshev distance, measured around the torus on boundless grids
+        dx = abs(a[0] - b[0])
+        dy = abs(a[1] - b[1])
+        if self.boundless:
+            dx = min(dx, self.width - dx)
+            dy = min(dy, self.height - dy)
+        return max(dx, dy) * self.unit
+
+    def __free(self, x, y):
+        if self.boundless:
+            x %= self.width
+            y %= self.height
+        elif not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        return self.walk[y * self.width + x]
+
+    def __wrap(self, x, y):
+        if self.boundless:
+            return (x % self.width, y % self.height)
+        return (x, y)
+
+    def __directions(self, node, parent):
+        # Natural and forced neighbors after pruning, as travel directions
+        if parent is None:
+            return DIRECTIONS
+        (_, dx, dy, _) = parent
+        (x, y) = node
+        free = self.__free
+        directions = []
+        if dx != 0 and dy != 0:
+            if free(x + dx, y):
+                directions.append((dx, 0))
+            if free(x, y + dy):
+                directions.append((0, dy))
+            if free(x + dx, y + dy):
+                directions.append((dx, dy))
+            if not free(x - dx, y) and free(x - dx, y + dy):
+                directions.append((-dx, dy))
+            if not free(x, y - dy) and free(x + dx, y - dy):
+                directions.append((dx, -dy))
+        elif dx != 0:
+            if free(x + dx, y):
+                directions.append((dx, 0))
+            for d in (-1, 1):
+                if not free(x, y + d) and free(x + dx, y + d):
+                    directions.append((dx, d))
+        else:
+            if free(x, y + dy):
+                directions.append((0, dy))
+            for d in (-1, 1):
+                if not free(x + d, y) and free(x + d, y + dy):
+                    directions.append((d, dy))
+        return directions
+
+    def __jump(self, x, y, dx, dy, goal):
+        # Walk from (x, y) until a jump point is met, returns (vertice, steps)
+        free = self.__free
+        if dx != 0 and dy != 0:
+            # A diagonal walk on a torus may never hit a wall, stop it after a lap
+            limit = max(self.width, self.height) if self.boundless else INF
+            steps = 0
+            while True:
+                x += dx
+                y += dy
+                steps += 1
+                if not free(x, y):
+                    return None
+                node = self.__wrap(x, y)
+                if node == goal or steps >= limit:
+                    return (node, steps)
+                if (not free(x - dx, y) and free(x - dx, y + dy)) \
+                or (not free(x, y - dy) and free(x + dx, y - dy)):
+                    return (node, steps)
+                if self.__scan(x, y, dx, 0, goal) or self.__scan(x, y, 0, dy, goal):
+                    return (node, steps)
+        return self.__scan(x, y, dx, dy, goal)
+
+    def __scan(self, x, y, dx, dy, goal):
+        # Straight walk from (x, y), returns (vertice, steps) or None
+        free = self.__free
+        # Beyond a full lap of a torus only already scanned grids are met
+        limit = (self.width if dx != 0 else self.height) - 1 if self.boundless else INF
+        steps = 0
+        while steps < limit:
+            x += dx
+            y += dy
+            steps += 1
+            if not free(x, y):
+                return None
+            node = self.__wrap(x, y)
+            if node == goal:
+                return (node, steps)
+            if dx != 0:
+                if (not free(x, y + 1) and free(x + dx, y + 1)) \
+                or (not free(x, y - 1) and free(x + dx, y - 1)):
+                    return (node, steps)
+            else:
+                if (not free(x + 1, y) and free(x + 1, y + dy)) \
+                or (not free(x - 1, y) and free(x - 1, y + dy)):
+                    return (node, steps)
+        return None
+
+    def __reconstruct_path(self, came_from, goal):
+        # Fill in the grids skipped over by each jump
+        path = [goal]
+        current = goal
+        while came_from[current] is not None:
+            (previous, dx, dy, steps) = came_from[current]
+            (x, y) = current
+            for i in range(steps - 1):
+                x -= dx
+                y -= dy
+                path.append(self.__wrap(x, y))
+            path.append(previous)
+            current = previous
+        path.reverse()
+        return path
@@ -0,0 +1,156 @@
+""" LANDMARKS MODULE
+# Description:
+    This is the landmark (ALT) heuristic for A* on GridMap/gridMap.
+    The exact cost from every grid to a few landmarks is computed once, then the triangle
+    inequality bounds the cost between any two grids from below, so the heuristic stays admissible
+    while following walls and expensive areas much closer than the Manhattan distance.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+# Reference:
+    * Goldberg, A. V. and Harrelson, C. Computing the Shortest Path: A* Search Meets Graph Theory. SODA 2005.
+"""
+import zlib
+import numpy as np
+from .FlatGrid import FlatGrid
+from .FlowField import FlowField
+from .GridMap import gridMap
+
+# Largest relative rounding error of a float32 distance
+ROUNDING = 2.0 ** -23
+
+class Landmarks():
+    def __init__(self, graph, count=8, seed=None):
+        """ Landmark Distance Tables
+            Moving from a grid to its neighbor costs the cost of the neighbor, so the cost from a
+            landmark L to v is the cost from v to L plus cost(v) - cost(L): one table per landmark
+            bounds both directions.
+        Parameters
+        ----------
+        graph: GridMap, gridMap or FlatGrid
+            The grid map to be indexed.
+        count: int or list, optional
+            Number of landmarks, picked one by one as the open grid farthest from those already picked,
+            or the landmark vertices themselves (e.g. those of tables computed in another process).
+        seed: int, optional
+            Seed of the random open grid the picking starts from.
+
+        Attributes
+        ---------
+        landmarks: list
+            The landmark vertices.
+        table: numpy.array
+            Cost from each grid to each landmark as float32, indexed [landmark, y * width + x],
+            inf where the landmark cannot be reached.
+        version: int
+            The version of the graph the tables were computed on.
+        """
+        picked = None if isinstance(count, int) else [tuple(v) for v in count]
+        if picked is not None and not picked or picked is None and count <= 0:
+            raise ValueError('- number of landmarks must be positive -')
+        grid = graph if isinstance(graph, FlatGrid) else FlatGrid(graph)
+        if not grid.exact:
+            raise ValueError('- graph is not a grid map -')
+        self.width = grid.width
+        self.height = grid.height
+        self.mtype = grid.mtype
+        self.version = grid.version
+        self.fingerprint = _fingerprint(grid.cost_array)
+        # Finders patch their snapshots in place, the tables keep the costs they were computed on
+        self.__cost = grid.cost_array.copy()
+        self.__goal = None
+        self.__bound = None
+
+        # Planes for FlowField, only the cost plane is read
+        cost = grid.cost_array.reshape(self.height, self.width).T
+        dummy = np.broadcast_to(np.zeros(1), cost.shape)
+        plane = gridMap.from_planes(cost, dummy, dummy, self.mtype)
+        opened = np.flatnonzero(np.isfinite(grid.cost_array))
+        self.landmarks = []
+        table = []
+        if picked is not None:
+            for landmark in picked:
+                self.landmarks.append(landmark)
+                table.append(self.__distance(plane, landmark).astype(np.float32))
+        elif opened.size > 0:
+            rng = np.random.RandomState(seed)
+            far = self.__distance(plane, grid.node(int(rng.choice(opened))))
+            nearest = np.full(grid.size, np.inf)
+            for _ in range(min(count, opened.size)):
+                # The farthest open grid still reaching the landmarks picked so far
+                reach = np.where(np.isfinite(far), far, -1)
+                reach[~np.isfinite(grid.cost_array)] = -1
+                landmark = grid.node(int(np.argmax(reach)))
+                if landmark in self.landmarks:
+                    break
+                self.landmarks.append(landmark)
+                distance = self.__distance(plane, landmark)
+                table.append(distance.astype(np.float32))
+                far = nearest = np.minimum(nearest, distance)
+        self.table = np.array(table, dtype=np.float32).reshape(len(table), grid.size)
+
+    def bound(self, goal):
+        """ Lower bound of the cost from every grid to the goal, as a list indexed by y * width + x. """
+        goal = tuple(goal)
+        if goal != self.__goal:
+            self.__goal = goal
+            self.__bound = self.__compute(goal[1] * self.width + goal[0]).tolist()
+        return self.__bound
+
+    def matches(self, grid):
+        """ Check whether the tables were computed on the costs of the FlatGrid. """
+        if (grid.width, grid.height, grid.mtype) != (self.width, self.height, self.mtype):
+            return False
+        if grid.version is not None and grid.version == self.version:
+            return True
+        if _fingerprint(grid.cost_array) != self.fingerprint:
+            return False
+        # Loaded tables have no version, the next queries on this version skip the fingerprint
+        self.version = grid.version
+        return True
+
+    def save(self, path):
+        """ Save the tables into a .npz file, to be kept next to the map. """
+        np.savez(path, table=self.table, landmarks=np.array(self.landmarks, dtype=np.int64).reshape(-1, 2),
+                 cost=self.__cost, shape=np.array([self.width, self.height]), mtype=np.array(self.mtype),
+                 fingerprint=np.array(self.fingerprint))
+
+    @classmethod
+    def load(cls, path):
+        """ Load tables saved with save(), check them against the map with matches(). """
+        with np.load(path) as data:
+            landmarks = cls.__new__(cls)
+            (landmarks.width, landmarks.height) = data['shape'].tolist()
+            landmarks.mtype = str(data['mtype'])
+            landmarks.version = None
+            landmarks.fingerprint = int(data['fingerprint'])
+            landmarks.landmarks = [tuple(node) for node in data['landmarks'].tolist()]
+            landmarks.table = data['table']
+            landmarks.__cost = data['cost']
+            landmarks.__goal = None
+            landmarks.__bound = None
+        return landmarks
+
+    def __distance(self, plane, node):
+        return FlowField(plane, [node]).distance.T.ravel()
+
+    def __compute(self, t):
+        cost = self.__cost
+        bound = np.zeros(cost.size)
+        if self.table.shape[0] == 0 or not np.isfinite(cost[t]):
+            return bound
+        with np.errstate(invalid='ignore'):
+            for row in self.table:
+                d = row.astype(np.float64)
+                dt = d[t]
+                if not np.isfinite(dt):
+                    continue
+                # d(v, t) >= d(v, L) - d(t, L) and d(v, t) >= d(L, t) - d(L, v)
+                b = np.maximum(d - dt, (dt - d) + (cost[t] - cost))
+                b -= ROUNDING * (d + dt)
+                np.fmax(bound, b, out=bound)
+        bound[~np.isfinite(bound)] = 0
+        return bound
+
+def _fingerprint(cost):
+    return zlib.crc32(np.ascontiguousarray(cost, dtype=np.float64).tobytes())
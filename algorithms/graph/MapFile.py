@@ -0,0 +1,105 @@
+""" MAP FILE MODULE
+# Description:
+    This is the binary map format of gridMap, loaded by memory-mapping the file.
+    The file is a fixed header followed by the cost, sight and vision planes, each plane
+    starting on a page boundary and stored as in gridMap (indexed [x, y], row-major in x).
+    A loaded map pages in only the regions touched, and processes mapping the same file
+    share the same physical pages.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+"""
+import mmap
+import struct
+import numpy as np
+from .GridMap import gridMap
+
+MAGIC = b'GMAP'
+FORMAT_VERSION = 1
+# magic, format version, mtype, width, height, then (dtype, offset) of each plane
+HEADER = struct.Struct('<4sHHQQ' + '8sQ' * 3)
+MTYPES = ('bounded', 'boundless')
+# Planes in file order, with the types and default values of gridMap
+PLANES = (('cost', '<f8', 1), ('sight', '<f8', 1), ('vision', '<f8', 0))
+PAGE = mmap.ALLOCATIONGRANULARITY
+
+def save_map(graph, path):
+    """ Save Map File
+    Parameters
+    ----------
+    graph: gridMap or GridMap
+        The grid to be saved, removed GridMap vertices are saved with cost inf and sight 0.
+    path: string
+        The file to be written.
+    """
+    if graph.mtype not in MTYPES:
+        raise ValueError('- mtype not supported -')
+    (w, h) = (graph.width, graph.height)
+    planes = [np.ascontiguousarray(_plane(graph, name, fill), dtype=dtype) for (name, dtype, fill) in PLANES]
+    offsets = []
+    end = HEADER.size
+    for plane in planes:
+        end = -(-end // PAGE) * PAGE
+        offsets.append(end)
+        end += plane.nbytes
+    fields = []
+    for ((_, dtype, _), offset) in zip(PLANES, offsets):
+        fields += [dtype.encode(), offset]
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, MTYPES.index(graph.mtype), w, h, *fields))
+        for (plane, offset) in zip(planes, offsets):
+            f.seek(offset)
+            plane.tofile(f)
+
+def load_map(path, mode='c'):
+    """ Load Map File
+        The planes of the returned gridMap are memory-mapped, nothing is read until it is touched.
+        Path-finding snapshots (FlatGrid) still copy the whole cost plane on their first query,
+        since they store it row-major in y; only the sight and vision planes stay paged.
+    Parameters
+    ----------
+    path: string
+        The file to be loaded.
+    mode: string, optional
+        'c' (default) keeps the edits private to this process (copy-on-write), 'r' maps it read-only
+        and 'r+' writes the edits through to the file itself, shared with every process mapping it (see flush_map).
+
+    Returns
+    -------
+    graph: gridMap
+        The grid with numpy.memmap planes.
+    """
+    if mode not in ('r', 'r+', 'c'):
+        raise ValueError('- mode not supported -')
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size or header[:4] != MAGIC:
+        raise ValueError('- not a map file -')
+    (_, version, mtype, w, h, *fields) = HEADER.unpack(header)
+    if version != FORMAT_VERSION or mtype >= len(MTYPES):
+        raise ValueError('- map file version not supported -')
+    planes = {}
+    for (i, (name, _, _)) in enumerate(PLANES):
+        dtype = np.dtype(fields[2 * i].rstrip(b'\0').decode())
+        planes[name] = np.memmap(path, dtype=dtype, mode=mode, offset=fields[2 * i + 1], shape=(w, h))
+    return gridMap.from_planes(planes['cost'], planes['sight'], planes['vision'], MTYPES[mtype])
+
+def flush_map(graph):
+    """ Write the edited pages of a map loaded with mode 'r+' back to its file, untouched pages are not written. """
+    for (name, _, _) in PLANES:
+        plane = getattr(graph, name)
+        if isinstance(plane, np.memmap):
+            plane.flush()
+
+def _plane(graph, name, fill):
+    # The plane of a gridMap, or gathered from the vertices of a GridMap
+    plane = getattr(graph, name, None)
+    if isinstance(plane, np.ndarray):
+        return plane
+    # Removed vertices are blocked and opaque
+    plane = np.full((graph.width, graph.height), float('inf') if name == 'cost' else 0.0)
+    for (node, data) in graph.nodes(data=True):
+        (x, y) = node
+        if 0 <= x < graph.width and 0 <= y < graph.height:
+            plane[x, y] = data.get(name, fill)
+    return plane
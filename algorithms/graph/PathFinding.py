@@ -8,21 +8,108 @@
     * https://en.wikipedia.org/wiki/A*_search_algorithm
     * https://www.youtube.com/watch?v=KNXfSOx4eEE
 """
-from queue import PriorityQueue
+import asyncio
+import heapq
+import math
+import time
+from collections import OrderedDict
+from itertools import count
+from multiprocessing import Pool
+import numpy as np
+from .FlatGrid import FlatGrid, INF
+from .GridMap import changes_since
+from .JumpPoint import JumpPointSearch
+from .Landmarks import Landmarks
+from .Reachability import Reachability
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Python < 3.8, batches run in-process
+    shared_memory = None
+
+# Side of the square buckets indexing cached paths by the grids they cross
+CACHE_BUCKET = 16
+
+# Distances of a step (dx, dy), scaled by the cheapest grid cost. Diagonal moves cost as much as
+# straight ones, so only 'chebyshev' never overestimates, 'octile' and 'euclidean' are for maps
+# where diagonal moves are expected to be longer
+HEURISTICS = {
+    'chebyshev': lambda dx, dy: max(dx, dy),
+    'octile': lambda dx, dy: max(dx, dy) + (math.sqrt(2) - 1) * min(dx, dy),
+    'euclidean': math.hypot,
+}
 
 class PathFinding():
     
-    def __init__(self, graph, algorithm='a-star'):
+    def __init__(self, graph, algorithm='a-star', cache_size=0, reachability=True, landmarks=8,
+                 heuristic='manhattan', epsilon=0):
         """ Path Finder
         Parameters
         ----------
         graph: GridMap
-            The graph object with movement cost and neighbor functions.
+            The graph object with movement cost and neighbor functions (GridMap, gridMap or ChunkedGrid).
         algorithm: string, optional
-            The algorithm to find the path from start to goal.
+            The algorithm to find the path from start to goal, 'a-star', 'jps', 'bi-a-star' or 'alt'.
+            'jps' falls back to 'bi-a-star' for every query as soon as any open grid of the map has
+            a different cost (the check is made on the whole map, not per region), so both return
+            a cheapest path.
+            'bi-a-star' searches from both ends at once and always returns a cheapest path.
+            'alt' is A* with the landmark heuristic, it always returns a cheapest path.
+        cache_size: int, optional
+            Number of (start, goal) results kept in a LRU cache, disabled by default.
+            Map edits evict only the cached paths crossing the edited grids (and, when a
+            cost dropped, those a route through the edit could beat), see cache_info().
+        reachability: bool, optional
+            Keep a connected-component index of the grid map, so queries between
+            disconnected vertices return None without searching.
+        landmarks: int or Landmarks, optional
+            Number of landmarks of the 'alt' heuristic, or prebuilt (e.g. loaded) Landmarks.
+            The tables are computed again when they do not match the costs of the graph.
+        heuristic: string or function, optional
+            The heuristic of 'a-star': 'manhattan' (the original one, it may overestimate),
+            'chebyshev', 'octile' or 'euclidean' scaled by the cheapest grid cost and measured
+            around the torus on boundless maps, or a function heuristic(vertice, goal).
+            The scale is 1 on graphs that cannot be flattened (e.g. ChunkedGrid).
+        epsilon: float, optional
+            Weight the heuristic of 'a-star' and 'alt' by (1 + epsilon). With 'chebyshev' or 'alt'
+            the paths cost at most (1 + epsilon) times the cheapest one, in exchange for fewer expansions.
+        
+        Attributes
+        ---------
+        expanded: int
+            Number of vertices expanded by the last 'a-star', 'bi-a-star' or 'alt' search.
         """
         self.graph = graph
         self.algorithm = algorithm
+        self.cache_size = cache_size
+        self.reachability = reachability
+        self.landmarks = landmarks
+        self.heuristic = heuristic
+        self.epsilon = epsilon
+        self.expanded = 0
+        self.__reach = None
+        self.__cache = OrderedDict()
+        self.__buckets = {}
+        self.__cache_version = getattr(graph, 'version', None)
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__invalidations = 0
+        self.__grid = None
+        self.__jps = None
+        self.__jps_version = None
+        self.__alt = landmarks if isinstance(landmarks, Landmarks) else None
+        self.__pool = None
+        self.__pool_size = 0
+        self.__shm = None
+        self.__shm_shape = None
+        self.__shm_grid = None
+        self.__shm_version = 0
+        self.__g = None
+        self.__parent = None
+        self.__stamp = None
+        self.__closed = None
+        self.__search_id = 0
 
     def get_path(self, start, goal):
         """ Get Path List
@@ -33,42 +120,601 @@ class PathFinding():
         goal: tuple
             The targeting vertice on the grid map. 
         """
+        if self.cache_size <= 0:
+            return self.__search(start, goal)
+        key = (tuple(start), tuple(goal))
+        found = self.__cache_get(key)
+        if found is not None:
+            return found[0]
+        path = self.__search(start, goal)
+        self.__cache_put(key, path)
+        return path
+    
+    def cache_info(self):
+        """ Counters of the path cache: hits, misses, evictions (LRU), invalidations (map edits) and size. """
+        return {'hits': self.__hits, 'misses': self.__misses, 'evictions': self.__evictions,
+                'invalidations': self.__invalidations, 'size': len(self.__cache)}
+    
+    def clear_cache(self):
+        """ Drop every cached path, the counters are kept. """
+        self.__cache.clear()
+        self.__buckets.clear()
+    
+    def __search(self, start, goal):
         if self.algorithm == 'a-star':
-            return self.__a_star_algorithm(start, goal)
+            search = self.__a_star_algorithm
+        elif self.algorithm == 'jps':
+            search = self.__jump_point_search
+        elif self.algorithm == 'bi-a-star':
+            search = self.__bidirectional_a_star
+        elif self.algorithm == 'alt':
+            search = self.__alt_search
         else:
             raise ValueError('- algorithm not supported -')
+        if not (callable(self.heuristic) or self.heuristic == 'manhattan' or self.heuristic in HEURISTICS):
+            raise ValueError('- heuristic not supported -')
+        if self.epsilon < 0:
+            raise ValueError('- epsilon must not be negative -')
+        if self.reachability and not self.__reachable(start, goal):
+            # Start and goal lie in different components
+            return None
+        return search(start, goal)
+    
+    def __reachable(self, start, goal):
+        if self.__flat_grid() is None:
+            return True
+        if self.__reach is None:
+            self.__reach = Reachability(self.graph)
+        return self.__reach.connected(start, goal)
+
+    def get_paths(self, pairs, processes=1):
+        """ Get Path Lists
+            Answer many queries on the same map, repeated (start, goal) pairs are searched only once.
+            The queries sharing a goal are searched one after the other by the same finder, so the
+            goal's landmark bounds and component are found once, and each path is the one get_path
+            returns, with or without worker processes.
+        Parameters
+        ----------
+        pairs: list
+            The (start, goal) tuples to be solved.
+        processes: int, optional
+            Number of worker processes. The map is handed to the workers once through
+            shared memory and the pool is kept until close() is called. A heuristic given
+            as a function cannot be sent to the workers.
+        
+        Returns
+        -------
+        paths: list
+            The path (or None) of each pair, in input order.
+        """
+        pairs = [(tuple(start), tuple(goal)) for (start, goal) in pairs]
+        solved = {}
+        groups = {}
+        for pair in pairs:
+            if pair in solved or pair[1] in groups and pair[0] in groups[pair[1]]:
+                continue
+            found = self.__cache_get(pair) if self.cache_size > 0 else None
+            if found is not None:
+                solved[pair] = found[0]
+            else:
+                groups.setdefault(pair[1], {})[pair[0]] = None
+        tasks = [(goal, list(starts)) for (goal, starts) in groups.items()]
+        
+        if processes > 1 and callable(self.heuristic):
+            raise ValueError('- heuristic functions cannot be used with processes -')
+        grid = self.__flat_grid() if processes > 1 and shared_memory is not None else None
+        if grid is None or len(tasks) < 2:
+            results = [self.__solve_group(task) for task in tasks]
+        else:
+            pool = self.__publish(grid, processes)
+            chunksize = max(1, len(tasks) // (processes * 4))
+            # The workers index the same landmarks, picked at random once, so the bounds match
+            landmarks = tuple(self.__landmark_tables(grid).landmarks) if self.algorithm == 'alt' else 1
+            options = (self.algorithm, landmarks, self.heuristic, self.epsilon)
+            results = pool.map(_solve_group, [(options,) + task for task in tasks], chunksize)
+        
+        for ((goal, starts), paths) in zip(tasks, results):
+            for (start, path) in zip(starts, paths):
+                solved[(start, goal)] = path
+                if self.cache_size > 0:
+                    self.__cache_put((start, goal), path)
+        return [None if solved[pair] is None else list(solved[pair]) for pair in pairs]
+    
+    def search(self, start, goal):
+        """ Resumable Search
+            Start an A* search run a slice at a time with SlicedSearch.step(), on the map as it is now.
+            It uses the heuristic, epsilon and (for 'alt') landmarks of this finder, other algorithms
+            are searched as 'a-star'.
+        Parameters
+        ----------
+        start: tuple
+            The starting vertice on the grid map.
+        goal: tuple
+            The targeting vertice on the grid map.
+        """
+        start = tuple(start)
+        goal = tuple(goal)
+        if self.reachability and not self.__reachable(start, goal):
+            return SlicedSearch(iter(()), start, goal)
+        return SlicedSearch(self.__a_star_steps(start, goal), start, goal)
+    
+    def __a_star_steps(self, start, goal):
+        # A* yielding after every expansion: first (parent, node, heuristic), then the expanded
+        # vertice closest to the goal so far. The path is returned when the goal is reached
+        grid = self.__flat_grid()
+        if grid is not None:
+            estimate = self.__alt_estimator(grid, goal) if self.algorithm == 'alt' else self.__estimator(grid, goal)
+            (s, t) = (grid.index(start), grid.index(goal))
+            neighbors = grid.neighbors
+            flat = grid.cost
+            cost = lambda u, v: flat[v]
+            node = grid.node
+        else:
+            estimate = self.__estimator(None, goal)
+            (s, t) = (start, goal)
+            neighbors = self.graph.neighbors
+            cost = self.graph.getCost
+            node = lambda v: v
+        if estimate is None:
+            (gx, gy) = goal
+            estimate = lambda x, y: abs(x - gx) + abs(y - gy)
+        heuristic = lambda v: estimate(*node(v))
+        
+        tie = count()
+        frontier = [(heuristic(s), 0, s)]
+        g = {s: 0}
+        parent = {s: None}
+        closed = set()
+        best = (heuristic(s), 0, s)
+        yield (parent, node, heuristic)
+        while frontier:
+            (f, _, current) = heapq.heappop(frontier)
+            if current in closed:
+                continue
+            closed.add(current)
+            if current == t:
+                path = []
+                while current is not None:
+                    path.append(node(current))
+                    current = parent[current]
+                path.reverse()
+                return path
+            h = heuristic(current)
+            if (h, g[current]) < best[:2]:
+                best = (h, g[current], current)
+            for next_ in neighbors(current):
+                new_cost = g[current] + cost(current, next_)
+                if new_cost == INF or next_ in closed and (self.epsilon > 0 or new_cost >= g[next_]):
+                    continue
+                if next_ not in g or new_cost < g[next_]:
+                    closed.discard(next_)
+                    g[next_] = new_cost
+                    parent[next_] = current
+                    heapq.heappush(frontier, (new_cost + heuristic(next_), -next(tie), next_))
+            yield best[2]
+        # Return None when there is no path
+        return None
+    
+    def close(self):
+        """ Release the worker pool and shared memory used by get_paths. """
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool.join()
+            self.__pool = None
+        if self.__shm is not None:
+            self.__shm.close()
+            self.__shm.unlink()
+            self.__shm = None
+            self.__shm_grid = None
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+    
+    def __solve_group(self, task):
+        (goal, starts) = task
+        return [self.__search(start, goal) for start in starts]
+    
+    def __cache_get(self, key):
+        # Returns (path,) on a hit, so a cached None is told apart from a miss
+        self.__cache_sync()
+        if key in self.__cache:
+            self.__cache.move_to_end(key)
+            self.__hits += 1
+            path = self.__cache[key][0]
+            return (None if path is None else list(path),)
+        self.__misses += 1
+        return None
+    
+    def __cache_put(self, key, path):
+        if path is None:
+            cost = INF
+        else:
+            path = list(path)
+            cost = sum(self.graph.getCost(a, b) for (a, b) in zip(path, path[1:]))
+        self.__cache[key] = (path, cost)
+        for bucket in self.__bucketsOf(path):
+            self.__buckets.setdefault(bucket, set()).add(key)
+        while len(self.__cache) > self.cache_size:
+            self.__evict(next(iter(self.__cache)))
+            self.__evictions += 1
+    
+    def __bucketsOf(self, path):
+        if path is None:
+            return set()
+        return {(x // CACHE_BUCKET, y // CACHE_BUCKET) for (x, y) in path}
+    
+    def __evict(self, key):
+        (path, _) = self.__cache.pop(key)
+        for bucket in self.__bucketsOf(path):
+            keys = self.__buckets[bucket]
+            keys.discard(key)
+            if not keys:
+                del self.__buckets[bucket]
+    
+    def __cache_sync(self):
+        # Replay the map edits made since the last lookup
+        version = getattr(self.graph, 'version', None)
+        if version == self.__cache_version:
+            return
+        changes = changes_since(self.graph, self.__cache_version)
+        self.__cache_version = version
+        if changes is None:
+            # The change log does not reach back far enough
+            self.__invalidations += len(self.__cache)
+            self.clear_cache()
+            return
+        for (_, rect, cheaper) in changes:
+            if rect is None:
+                self.__invalidations += len(self.__cache)
+                self.clear_cache()
+                return
+            self.__invalidate(rect, cheaper)
+    
+    def __invalidate(self, rect, cheaper):
+        (x0, y0, x1, y1) = rect
+        stale = set()
+        for bx in range(x0 // CACHE_BUCKET, (x1 - 1) // CACHE_BUCKET + 1):
+            for by in range(y0 // CACHE_BUCKET, (y1 - 1) // CACHE_BUCKET + 1):
+                for key in self.__buckets.get((bx, by), ()):
+                    if any(x0 <= x < x1 and y0 <= y < y1 for (x, y) in self.__cache[key][0]):
+                        stale.add(key)
+        if cheaper and x0 < x1 and y0 < y1:
+            # A route through the edited grids costs at least this much, other paths stay the best
+            self.__flat_grid()
+            grid = self.__grid
+            if grid is None:
+                # No cost snapshot of a lazily loaded world, any cheaper route may be a shortcut
+                unit = 0.0
+            else:
+                unit = grid.min_cost
+            (w, h) = (self.graph.width, self.graph.height)
+            for (key, (path, cost)) in self.__cache.items():
+                ((sx, sy), (tx, ty)) = key
+                steps = max(self.__gap(sx, x0, x1, w), self.__gap(sy, y0, y1, h)) \
+                      + max(self.__gap(tx, x0, x1, w), self.__gap(ty, y0, y1, h))
+                if steps * unit < cost:
+                    stale.add(key)
+        for key in stale:
+            self.__evict(key)
+        self.__invalidations += len(stale)
+    
+    def __gap(self, v, lo, hi, size):
+        # Steps from v to the range [lo, hi) along one axis
+        if lo <= v < hi:
+            return 0
+        if self.graph.mtype == 'boundless':
+            return min((lo - v) % size, (v - hi + 1) % size)
+        return max(lo - v, v - hi + 1)
+    
+    def __publish(self, grid, processes):
+        # Share the costs with the workers, slot 0 holds a version the workers check per task
+        if self.__shm is None or self.__shm.size < (grid.size + 1) * 8 \
+        or self.__pool_size != processes or self.__shm_shape != (grid.width, grid.height, grid.mtype):
+            self.close()
+            self.__shm = shared_memory.SharedMemory(create=True, size=(grid.size + 1) * 8)
+            self.__shm_shape = (grid.width, grid.height, grid.mtype)
+            self.__pool_size = processes
+            self.__pool = Pool(processes, _init_worker, (self.__shm.name,) + self.__shm_shape)
+        if self.__shm_grid != (grid, grid.version):
+            buffer = np.ndarray((grid.size + 1,), dtype=np.float64, buffer=self.__shm.buf)
+            buffer[1:] = grid.cost_array
+            self.__shm_version += 1
+            buffer[0] = self.__shm_version
+            self.__shm_grid = (grid, grid.version)
+        return self.__pool
+    
+    def __flat_grid(self):
+        # Flat snapshot of the graph, patched with the edited grids when the graph version changes
+        if isinstance(self.graph, FlatGrid):
+            grid = self.graph
+        elif not FlatGrid.supports(self.graph):
+            return None
+        else:
+            grid = self.__grid
+            if grid is None or grid.version is None or not grid.update(self.graph):
+                grid = FlatGrid(self.graph)
+        if grid is not self.__grid:
+            self.__grid = grid
+            if self.__g is None or len(self.__g) != grid.size:
+                self.__g = [INF] * grid.size
+                self.__parent = [-1] * grid.size
+                self.__stamp = [0] * grid.size
+                self.__closed = [0] * grid.size
+        return grid if grid.exact else None
+
+    def __jump_point_search(self, start, goal):
+        grid = self.__flat_grid()
+        if grid is not None:
+            if self.__jps is None or self.__jps.grid is not grid or self.__jps_version != grid.version:
+                self.__jps = JumpPointSearch(grid)
+                self.__jps_version = grid.version
+            if self.__jps.uniform:
+                return self.__jps.get_path(start, goal)
+        # One grid of another cost anywhere sends the whole map to the bidirectional search:
+        # the Manhattan distance of 'a-star' may overestimate, the bidirectional search stays exact
+        return self.__bidirectional_a_star(start, goal)
 
+    def __bidirectional_a_star(self, start, goal):
+        # A forward search from start and a backward one from goal over the reversed edges:
+        # entering a vertice costs that vertice, so the backward search pays it when leaving it
+        start = tuple(start)
+        goal = tuple(goal)
+        self.expanded = 0
+        if start == goal:
+            return [start]
+        grid = self.__flat_grid()
+        if grid is not None:
+            (s, t) = (grid.index(start), grid.index(goal))
+            neighbors = grid.neighbors
+            flat = grid.cost
+            cost = lambda u, v: flat[v]
+            node = grid.node
+            unit = grid.min_cost
+        else:
+            (s, t) = (start, goal)
+            neighbors = self.graph.neighbors
+            cost = self.graph.getCost
+            node = lambda v: v
+            # Edges of a general graph may join any vertices, so no distance bound holds
+            unit = 0.0
+        potential = self.__potential(grid, start, goal, unit)
+        
+        # Both searches run on the costs reduced by the average of the two heuristics,
+        # which keeps the reduced costs non-negative in both directions
+        g = ({s: 0}, {t: 0})
+        parent = ({s: None}, {t: None})
+        closed = (set(), set())
+        tie = count()
+        frontier = ([(potential(s), 0, s)], [(-potential(t), 0, t)])
+        best = INF
+        meet = None
+        while True:
+            for d in (0, 1):
+                while frontier[d] and frontier[d][0][2] in closed[d]:
+                    heapq.heappop(frontier[d])
+            if not frontier[0] or not frontier[1]:
+                break
+            # No path through the unexplored vertices can beat the best meeting found
+            if frontier[0][0][0] + frontier[1][0][0] >= best:
+                break
+            d = 0 if len(frontier[0]) <= len(frontier[1]) else 1
+            (gd, other, sign) = (g[d], g[1 - d], 1 if d == 0 else -1)
+            current = heapq.heappop(frontier[d])[2]
+            closed[d].add(current)
+            self.expanded += 1
+            gc = gd[current]
+            for next_ in neighbors(current):
+                c = cost(current, next_) if d == 0 else cost(next_, current)
+                if c == INF:
+                    continue
+                new_cost = gc + c
+                if next_ not in gd or new_cost < gd[next_]:
+                    gd[next_] = new_cost
+                    parent[d][next_] = current
+                    heapq.heappush(frontier[d], (new_cost + sign * potential(next_), -next(tie), next_))
+                    if next_ in other and new_cost + other[next_] < best:
+                        best = new_cost + other[next_]
+                        meet = next_
+        if meet is None:
+            # Return None when there is no path
+            return None
+        path = []
+        current = meet
+        while current is not None:
+            path.append(node(current))
+            current = parent[0][current]
+        path.reverse()
+        current = parent[1][meet]
+        while current is not None:
+            path.append(node(current))
+            current = parent[1][current]
+        return path
+    
+    def __potential(self, grid, start, goal, unit):
+        # Half the difference of the Chebyshev bounds to the goal and from the start
+        if grid is None or unit == 0:
+            return lambda v: 0
+        (w, h) = (grid.width, grid.height)
+        boundless = grid.mtype == 'boundless'
+        (sx, sy) = start
+        (tx, ty) = goal
+        half = unit / 2
+        
+        def potential(v):
+            (y, x) = divmod(v, w)
+            (ax, ay, bx, by) = (abs(x - tx), abs(y - ty), abs(x - sx), abs(y - sy))
+            if boundless:
+                (ax, ay, bx, by) = (min(ax, w - ax), min(ay, h - ay), min(bx, w - bx), min(by, h - by))
+            return (max(ax, ay) - max(bx, by)) * half
+        return potential
+    
     def __heuristic(self, a, b):
         (x1, y1) = a
         (x2, y2) = b
         return abs(x1 - x2) + abs(y1 - y2)
     
+    def __estimator(self, grid, goal):
+        # Heuristic of the vertice (x, y) towards the goal, None for the unweighted Manhattan distance
+        weight = 1 + self.epsilon
+        if self.heuristic == 'manhattan':
+            if weight == 1:
+                return None
+            (gx, gy) = goal
+            return lambda x, y: weight * (abs(x - gx) + abs(y - gy))
+        if callable(self.heuristic):
+            heuristic = self.heuristic
+            return lambda x, y: weight * heuristic((x, y), goal)
+        distance = HEURISTICS[self.heuristic]
+        # The cheapest cost is found once per snapshot, not per query
+        scale = weight if grid is None else weight * grid.min_cost
+        (gx, gy) = goal
+        if getattr(self.graph, 'mtype', None) == 'boundless':
+            (w, h) = (self.graph.width, self.graph.height)
+            
+            def estimate(x, y):
+                dx = abs(x - gx)
+                dy = abs(y - gy)
+                return scale * distance(min(dx, w - dx), min(dy, h - dy))
+            return estimate
+        return lambda x, y: scale * distance(abs(x - gx), abs(y - gy))
+    
     def __a_star_algorithm(self, start, goal):
         start = tuple(start)
         goal = tuple(goal)
-        frontier = PriorityQueue()
-        frontier.put(start, 0)
+        grid = self.__flat_grid()
+        if grid is not None:
+            return self.__a_star_flat(grid, start, goal, self.__estimator(grid, goal))
+        estimate = self.__estimator(None, goal)
+        if estimate is None:
+            heuristic = lambda node: self.__heuristic(goal, node)
+        else:
+            heuristic = lambda node: estimate(node[0], node[1])
+        
+        tie = count()
+        frontier = [(0, 0, start)]
         came_from = {}
         cost_so_far = {}
         came_from[start] = None
         cost_so_far[start] = 0
+        expanded = 0
         
-        while not frontier.empty():
-            current = frontier.get()
+        while frontier:
+            (priority, _, current) = heapq.heappop(frontier)
+            if priority > cost_so_far[current] + heuristic(current):
+                continue
+            expanded += 1
             
             if current == goal:
+                self.expanded = expanded
                 return self.__reconstruct_path(came_from, start, goal)
             
             for next_ in self.graph.neighbors(current):
                 new_cost = cost_so_far[current] + self.graph.getCost(current, next_)
+                if new_cost == INF:
+                    continue
                 if next_ not in cost_so_far or new_cost < cost_so_far[next_]:
                     cost_so_far[next_] = new_cost
-                    priority = new_cost + self.__heuristic(goal, next_)
-                    frontier.put(next_, priority)
+                    priority = new_cost + heuristic(next_)
+                    # Ties are broken towards the most recently discovered vertice
+                    heapq.heappush(frontier, (priority, -next(tie), next_))
                     came_from[next_] = current                         
         # Return None when there is no path                         
+        self.expanded = expanded
         return None
     
+    def __alt_search(self, start, goal):
+        grid = self.__flat_grid()
+        if grid is None:
+            # Landmarks index grid maps only, the bidirectional search is just as exact
+            return self.__bidirectional_a_star(start, goal)
+        return self.__a_star_flat(grid, tuple(start), tuple(goal), self.__alt_estimator(grid, goal))
+    
+    def __landmark_tables(self, grid):
+        if self.__alt is None or not self.__alt.matches(grid):
+            # Tables of an older map bound nothing, they are computed again with as many landmarks
+            number = self.landmarks if isinstance(self.landmarks, int) else max(1, len(self.landmarks.landmarks))
+            self.__alt = Landmarks(grid, number)
+        return self.__alt
+    
+    def __alt_estimator(self, grid, goal):
+        bound = self.__landmark_tables(grid).bound(goal)
+        (w, weight) = (grid.width, 1 + self.epsilon)
+        return lambda x, y: weight * bound[y * w + x]
+    
+    def __a_star_flat(self, grid, start, goal, estimate=None):
+        # Same search as above on integer ids with preallocated g/parent arrays,
+        # estimate(x, y) replaces the Manhattan distance when given
+        w = grid.width
+        wm1 = w - 1
+        lim = grid.size - w
+        offsets = grid.offsets
+        cost = grid.cost
+        g = self.__g
+        parent = self.__parent
+        stamp = self.__stamp
+        closed = self.__closed
+        # A weighted heuristic would reopen vertices over and over, the bound holds without reopening
+        reopen = self.epsilon == 0
+        self.__search_id += 1
+        sid = self.__search_id
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        s = grid.index(start)
+        t = grid.index(goal)
+        (gx, gy) = goal
+        g[s] = 0
+        parent[s] = -1
+        stamp[s] = sid
+        tie = count(1)
+        frontier = [(self.__heuristic(start, goal) if estimate is None else estimate(*start), 0, s)]
+        expanded = 0
+        
+        while frontier:
+            (f, _, current) = heappop(frontier)
+            gc = g[current]
+            (y, x) = divmod(current, w)
+            if f > gc + (abs(x - gx) + abs(y - gy) if estimate is None else estimate(x, y)):
+                continue
+            expanded += 1
+            closed[current] = sid
+            
+            if current == t:
+                self.expanded = expanded
+                return self.__reconstruct_flat_path(grid, parent, s, t)
+            
+            if 0 < x < wm1 and w <= current < lim:
+                neighbor = [current + o for o in offsets]
+            else:
+                neighbor = grid.neighbors(current)
+            for next_ in neighbor:
+                c = cost[next_]
+                if c == INF:
+                    continue
+                new_cost = gc + c
+                if stamp[next_] != sid or new_cost < g[next_] and (reopen or closed[next_] != sid):
+                    stamp[next_] = sid
+                    g[next_] = new_cost
+                    parent[next_] = current
+                    (ny, nx) = divmod(next_, w)
+                    h = abs(nx - gx) + abs(ny - gy) if estimate is None else estimate(nx, ny)
+                    heappush(frontier, (new_cost + h, -next(tie), next_))
+        # Return None when there is no path
+        self.expanded = expanded
+        return None
+    
+    def __reconstruct_flat_path(self, grid, parent, s, t):
+        current = t
+        path = [grid.node(current)]
+        while current != s:
+            current = parent[current]
+            path.append(grid.node(current))
+        path.reverse()
+        return path
+    
     def __reconstruct_path(self, came_from, start, goal):
         start = tuple(start)
         goal = tuple(goal)
@@ -80,4 +726,379 @@ class PathFinding():
             path.append(current)
     #    path.append(start) # optional
         path.reverse() # optional
-        return path
\ No newline at end of file
+        return path
+
+class SlicedSearch():
+    
+    def __init__(self, steps, start, goal):
+        """ Resumable Search
+            Made by PathFinding.search(), it keeps its frontier between step() calls.
+        Parameters
+        ----------
+        steps: generator
+            The search, advanced by one expansion per item.
+        start: tuple
+            The starting vertice.
+        goal: tuple
+            The targeting vertice.
+        
+        Attributes
+        ---------
+        done: bool
+            True once the goal is reached or the search ran out of vertices.
+        path: list
+            The path found (None when there is none or the search is not done).
+        expanded: int
+            Number of vertices expanded so far.
+        """
+        self.start = start
+        self.goal = goal
+        self.done = False
+        self.path = None
+        self.expanded = 0
+        self.__steps = steps
+        self.__parent = None
+        self.__node = None
+        self.__heuristic = None
+        self.__best = None
+        self.step(expansions=0)
+    
+    def step(self, expansions=None, microseconds=None):
+        """ Run the search for at most the given number of expansions and/or microseconds,
+            without limits it runs to the end. Returns done.
+        """
+        if self.done:
+            return True
+        deadline = None if microseconds is None else time.perf_counter() + microseconds / 1e6
+        try:
+            if self.__parent is None:
+                (self.__parent, self.__node, self.__heuristic) = next(self.__steps)
+                self.__best = next(iter(self.__parent))
+            budget = expansions
+            while budget is None or budget > 0:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                self.__best = next(self.__steps)
+                self.expanded += 1
+                if budget is not None:
+                    budget -= 1
+        except StopIteration as stop:
+            self.done = True
+            self.path = stop.value
+            if self.path is not None:
+                # The goal itself was expanded
+                self.expanded += 1
+        return self.done
+    
+    def progress(self):
+        """ Share of the heuristic distance to the goal covered by the closest vertice expanded so far. """
+        if self.done:
+            return 1.0
+        if self.__parent is None:
+            return 0.0
+        total = self.__heuristic(next(iter(self.__parent)))
+        if total <= 0:
+            return 0.0
+        return max(0.0, min(1.0, 1 - self.__heuristic(self.__best) / total))
+    
+    def partial_path(self):
+        """ Path to the expanded vertice closest to the goal so far (the full path once done). """
+        if self.done:
+            return None if self.path is None else list(self.path)
+        if self.__parent is None:
+            return [self.start]
+        path = []
+        current = self.__best
+        while current is not None:
+            path.append(self.__node(current))
+            current = self.__parent[current]
+        path.reverse()
+        return path
+
+class SearchScheduler():
+    
+    def __init__(self, expansions=None, microseconds=None):
+        """ Frame Budget Scheduler
+            Share a fixed budget per frame between many resumable searches, in turns,
+            so every search keeps progressing however many there are.
+        Parameters
+        ----------
+        expansions: int, optional
+            Number of expansions per frame.
+        microseconds: float, optional
+            Time per frame, in microseconds.
+        """
+        if expansions is None and microseconds is None:
+            raise ValueError('- a budget is required -')
+        self.expansions = expansions
+        self.microseconds = microseconds
+        self.__active = []
+        self.__futures = {}
+    
+    def submit(self, search):
+        """ Add a SlicedSearch to be run by the next frames. """
+        if not search.done and search not in self.__active:
+            self.__active.append(search)
+    
+    def pending(self):
+        """ Number of searches not done yet. """
+        return len(self.__active)
+    
+    def run_frame(self):
+        """ Spend one frame of budget on the submitted searches. Returns the searches finished in this frame. """
+        finished = []
+        served = []
+        budget = self.expansions
+        deadline = None if self.microseconds is None else time.perf_counter() + self.microseconds / 1e6
+        queue = self.__active
+        while queue or served:
+            if not queue:
+                # Budget left over by the searches done early, another turn for the others
+                (queue, served) = (served, [])
+            now = time.perf_counter()
+            if budget is not None and budget <= 0 or deadline is not None and now >= deadline:
+                break
+            # Equal shares of what is left, searches finishing early leave the rest to the others
+            share = None if budget is None else -(-budget // len(queue))
+            slice_ = None if deadline is None else (deadline - now) * 1e6 / len(queue)
+            search = queue.pop(0)
+            before = search.expanded
+            if search.step(share, slice_):
+                finished.append(search)
+                future = self.__futures.pop(search, None)
+                if future is not None and not future.done():
+                    future.set_result(search.path)
+            else:
+                served.append(search)
+            if budget is not None:
+                budget -= max(1, search.expanded - before)
+        # Searches not reached in this frame go first in the next one
+        self.__active = queue + served
+        return finished
+    
+    async def find(self, search):
+        """ Wait for the path of a SlicedSearch, while frames are run by run() or run_frame(). """
+        self.submit(search)
+        if search.done:
+            return search.path
+        future = self.__futures.get(search)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.__futures[search] = future
+        return await future
+    
+    async def run(self, frame=1 / 60):
+        """ Run one frame every frame seconds until no search is left. """
+        while self.__active:
+            self.run_frame()
+            await asyncio.sleep(frame)
+
+class DStarLite():
+    
+    def __init__(self, graph, start, goal):
+        """ Incremental Planner
+            D* Lite keeps its search state between calls, so after a few cost changes
+            only the affected part of the map is searched again.
+        Parameters
+        ----------
+        graph: GridMap or gridMap
+            The grid map with movement cost and neighbor functions.
+        start: tuple
+            The starting vertice, moved along with set_start().
+        goal: tuple
+            The targeting vertice.
+        
+        Attributes
+        ---------
+        expanded: int
+            Number of vertices expanded by the last repair.
+        """
+        self.graph = graph
+        self.grid = FlatGrid(graph)
+        self.goal = tuple(goal)
+        self.start = tuple(start)
+        self.__cost = list(self.grid.cost)
+        finite = self.grid.cost_array[np.isfinite(self.grid.cost_array)]
+        self.__min_cost = float(finite.min()) if finite.size > 0 else 0.0
+        self.__reset()
+    
+    def __reset(self):
+        self.__s = self.grid.index(self.start)
+        self.__t = self.grid.index(self.goal)
+        self.__last = self.__s
+        self.__km = 0
+        self.__g = {}
+        self.__rhs = {self.__t: 0}
+        self.__queue = []
+        self.__queued = {}
+        self.__tie = count()
+        self.__push(self.__t)
+        self.__dirty = True
+        self.expanded = 0
+    
+    def get_path(self):
+        """ Get the current path from start to goal, None when there is no path. """
+        if self.__dirty:
+            self.__compute()
+        s = self.__s
+        if self.__rhs.get(s, INF) == INF:
+            return None
+        path = [self.grid.node(s)]
+        for i in range(self.grid.size):
+            if s == self.__t:
+                return path
+            s = min(self.__successors(s), key=lambda n: self.__cost[n] + self.__g.get(n, INF))
+            path.append(self.grid.node(s))
+        return None
+    
+    def set_start(self, start):
+        """ Move the start, e.g. after the unit took a step along the path. """
+        self.start = tuple(start)
+        self.__s = self.grid.index(self.start)
+        self.__km += self.__heuristic(self.__last, self.__s)
+        self.__last = self.__s
+        self.__dirty = True
+    
+    def update(self, nodes):
+        """ Update Grids
+            Reload the cost of the vertices from the graph after setCost/remove_node/add_node.
+        Parameters
+        ----------
+        nodes: list
+            The changed vertices.
+        """
+        g = self.__g
+        rhs = self.__rhs
+        for node in nodes:
+            v = self.grid.index(node)
+            old = self.__cost[v]
+            new = self.__readCost(tuple(node))
+            if old == new:
+                continue
+            if new < self.__min_cost:
+                # The heuristic would no longer be admissible, start over
+                self.__cost[v] = new
+                self.__min_cost = new
+                self.__reset()
+                continue
+            self.__cost[v] = new
+            # Every edge entering v changed
+            for u in self.__predecessors(v):
+                if u == self.__t:
+                    continue
+                if new < old:
+                    rhs[u] = min(rhs.get(u, INF), new + g.get(v, INF))
+                elif rhs.get(u, INF) == old + g.get(v, INF):
+                    rhs[u] = self.__bestSuccessor(u)
+                self.__updateVertex(u)
+        self.__dirty = True
+    
+    def __readCost(self, node):
+        if hasattr(self.graph, 'has_node') and not self.graph.has_node(node):
+            return INF
+        cost = self.graph.getCost(None, node)
+        return INF if cost != cost else float(cost)
+    
+    def __heuristic(self, a, b):
+        (ax, ay) = self.grid.node(a)
+        (bx, by) = self.grid.node(b)
+        dx = abs(ax - bx)
+        dy = abs(ay - by)
+        if self.grid.mtype == 'boundless':
+            dx = min(dx, self.grid.width - dx)
+            dy = min(dy, self.grid.height - dy)
+        return max(dx, dy) * self.__min_cost
+    
+    def __successors(self, u):
+        return [n for n in self.grid.neighbors(u) if self.__cost[n] != INF]
+    
+    def __predecessors(self, v):
+        # Every neighbor can step into v, moves are symmetric on the grid
+        return self.grid.neighbors(v)
+    
+    def __bestSuccessor(self, u):
+        g = self.__g
+        cost = self.__cost
+        return min([cost[n] + g.get(n, INF) for n in self.grid.neighbors(u)] + [INF])
+    
+    def __key(self, u):
+        m = min(self.__g.get(u, INF), self.__rhs.get(u, INF))
+        return (m + self.__heuristic(self.__s, u) + self.__km, m)
+    
+    def __push(self, u):
+        key = self.__key(u)
+        self.__queued[u] = key
+        heapq.heappush(self.__queue, (key, next(self.__tie), u))
+    
+    def __top(self):
+        # Drop entries that were removed or re-keyed since they were pushed
+        queue = self.__queue
+        while queue:
+            (key, _, u) = queue[0]
+            if self.__queued.get(u) == key:
+                return (key, u)
+            heapq.heappop(queue)
+        return ((INF, INF), None)
+    
+    def __updateVertex(self, u):
+        if self.__g.get(u, INF) != self.__rhs.get(u, INF):
+            self.__push(u)
+        else:
+            self.__queued.pop(u, None)
+    
+    def __compute(self):
+        g = self.__g
+        rhs = self.__rhs
+        s = self.__s
+        self.expanded = 0
+        while True:
+            (k_old, u) = self.__top()
+            if u is None:
+                break
+            if not (k_old < self.__key(s) or rhs.get(s, INF) > g.get(s, INF)):
+                break
+            self.expanded += 1
+            k_new = self.__key(u)
+            if k_old < k_new:
+                self.__push(u)
+            elif g.get(u, INF) > rhs.get(u, INF):
+                g[u] = rhs[u]
+                del self.__queued[u]
+                step = self.__cost[u] + g[u]
+                for p in self.__predecessors(u):
+                    if p != self.__t and step < rhs.get(p, INF):
+                        rhs[p] = step
+                        self.__updateVertex(p)
+            else:
+                g_old = g.get(u, INF)
+                g[u] = INF
+                step = self.__cost[u] + g_old
+                for p in self.__predecessors(u) + [u]:
+                    if p != self.__t and (p == u or rhs.get(p, INF) == step):
+                        rhs[p] = self.__bestSuccessor(p)
+                    self.__updateVertex(p)
+        self.__dirty = False
+
+_worker = {}
+
+def _init_worker(name, width, height, mtype):
+    shm = shared_memory.SharedMemory(name=name)
+    _worker['shm'] = shm
+    _worker['shape'] = (width, height, mtype)
+    _worker['buffer'] = np.ndarray((width * height + 1,), dtype=np.float64, buffer=shm.buf)
+    _worker['version'] = None
+
+def _solve_group(task):
+    (options, goal, starts) = task
+    buffer = _worker['buffer']
+    key = (buffer[0], options)
+    if _worker['version'] != key:
+        (width, height, mtype) = _worker['shape']
+        grid = FlatGrid.from_cost(buffer[1:], width, height, mtype)
+        (algorithm, landmarks, heuristic, epsilon) = options
+        if algorithm == 'alt':
+            landmarks = Landmarks(grid, landmarks)
+        _worker['finder'] = PathFinding(grid, algorithm, landmarks=landmarks, heuristic=heuristic, epsilon=epsilon)
+        _worker['version'] = key
+    # The same searches as in the parent process, so the same paths
+    return _worker['finder'].get_paths([(start, goal) for start in starts])
@@ -0,0 +1,274 @@
+""" REACHABILITY MODULE
+# Description:
+    This is the connected-component index of the open grids of GridMap/gridMap.
+    Two vertices are reachable from each other only if they share a component label, so
+    hopeless path queries are answered without searching.
+    Blocking or opening a grid repairs the labels around it instead of labelling the map again.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+"""
+from collections import deque
+import numpy as np
+from .FlatGrid import FlatGrid
+from .GridMap import changes_since
+
+class Reachability():
+    def __init__(self, graph):
+        """ Reachability Index
+            Grids are blocked when their cost is inf (or the GridMap vertice is removed),
+            open grids are connected to their 8 neighbors.
+        Parameters
+        ----------
+        graph: GridMap, gridMap or FlatGrid
+            The grid map to be indexed.
+
+        Attributes
+        ---------
+        version: int
+            The version of the graph the labels are up to date with.
+        """
+        self.graph = graph
+        self.grid = graph if isinstance(graph, FlatGrid) else FlatGrid(graph)
+        if not self.grid.exact:
+            raise ValueError('- graph is not a grid map -')
+        self.version = getattr(graph, 'version', None)
+        self.__build(self.grid.cost_array)
+
+    def connected(self, start, goal):
+        """ Check whether a path from start to goal may exist.
+        Parameters
+        ----------
+        start: tuple
+            The starting vertice, a blocked start may still step out to its neighbors.
+        goal: tuple
+            The targeting vertice.
+        """
+        self.update()
+        s = self.grid.index(start)
+        t = self.grid.index(goal)
+        if s == t:
+            return True
+        goal = self.__root(self.__label[t])
+        if goal < 0:
+            return False
+        if self.__label[s] >= 0:
+            return self.__root(self.__label[s]) == goal
+        return any(self.__root(self.__label[n]) == goal for n in self.grid.neighbors(s))
+
+    def get_label(self, node):
+        """ Component label of the vertice, -1 for blocked vertices. """
+        self.update()
+        return self.__root(self.__label[self.grid.index(node)])
+
+    def get_size(self, node):
+        """ Number of open grids in the component of the vertice, 0 for blocked vertices. """
+        label = self.get_label(node)
+        return self.__size.get(label, 0)
+
+    def update(self):
+        """ Replay the edits logged by the graph since the last update. """
+        version = getattr(self.graph, 'version', None)
+        if version == self.version:
+            return
+        changes = changes_since(self.graph, self.version)
+        self.version = version
+        if changes is None or any(rect is None for (_, rect, _) in changes):
+            self.__rebuild()
+            return
+        for (_, rect, _) in changes:
+            (x0, y0, x1, y1) = rect
+            (x0, y0) = (max(x0, 0), max(y0, 0))
+            (x1, y1) = (min(x1, self.grid.width), min(y1, self.grid.height))
+            if x0 >= x1 or y0 >= y1:
+                continue
+            opened = self.__readOpen(x0, y0, x1, y1)
+            for (dy, dx) in zip(*np.nonzero(opened != self.__openRegion(x0, y0, x1, y1))):
+                i = self.grid.index((x0 + int(dx), y0 + int(dy)))
+                if opened[dy, dx]:
+                    self.__unblock(i)
+                elif not self.__block(i):
+                    # Labelling the whole map is cheaper than walking a large split
+                    self.__rebuild()
+                    return
+
+    def __rebuild(self):
+        self.grid = FlatGrid(self.graph)
+        self.__build(self.grid.cost_array)
+
+    def __build(self, cost):
+        # Hook every root to the smallest root next to it and jump pointers until nothing changes
+        (w, h) = (self.grid.width, self.grid.height)
+        size = w * h
+        free = np.isfinite(cost)
+        ids = np.arange(size).reshape(h, w)
+        u = []
+        v = []
+        for (dx, dy) in ((1, 0), (0, 1), (1, 1), (-1, 1)):
+            if self.grid.mtype == 'boundless':
+                u.append(ids.ravel())
+                v.append(np.roll(ids, (-dy, -dx), axis=(0, 1)).ravel())
+            else:
+                u.append(ids[:h - dy, max(0, -dx):w - max(0, dx)].ravel())
+                v.append(ids[dy:, max(0, dx):w + min(0, dx)].ravel())
+        u = np.concatenate(u)
+        v = np.concatenate(v)
+        keep = free[u] & free[v]
+        (u, v) = (u[keep], v[keep])
+
+        label = np.arange(size)
+        while True:
+            (lu, lv) = (label[u], label[v])
+            differ = lu != lv
+            if not np.any(differ):
+                break
+            (u, v) = (u[differ], v[differ])
+            (lo, hi) = (np.minimum(lu, lv)[differ], np.maximum(lu, lv)[differ])
+            order = np.lexsort((lo, hi))
+            (lo, hi) = (lo[order], hi[order])
+            first = np.concatenate([[True], hi[1:] != hi[:-1]])
+            label[hi[first]] = lo[first]
+            while True:
+                jump = label[label]
+                if np.array_equal(jump, label):
+                    break
+                label = jump
+        label[~free] = -1
+
+        (labels, counts) = np.unique(label[free], return_counts=True)
+        self.__label = label.tolist()
+        self.__open = free.tolist()
+        self.__size = dict(zip(labels.tolist(), counts.tolist()))
+        # Merged labels point to the label they joined, sizes are kept by the roots
+        self.__parent = {}
+        self.__next = size
+        self.__budget = max(4096, size // 32)
+
+    def __readOpen(self, x0, y0, x1, y1):
+        # Open grids of the region as a (rows, columns) array
+        graph = self.graph
+        if hasattr(graph, 'cost') and isinstance(graph.cost, np.ndarray):
+            return np.isfinite(graph.cost[x0:x1, y0:y1].T)
+        opened = np.zeros((y1 - y0, x1 - x0), dtype=bool)
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                if graph.has_node((x, y)):
+                    cost = graph.getCost(None, (x, y))
+                    opened[y - y0, x - x0] = cost == cost and cost != float('inf')
+        return opened
+
+    def __openRegion(self, x0, y0, x1, y1):
+        w = self.grid.width
+        return np.array([self.__open[y * w + x0:y * w + x1] for y in range(y0, y1)], dtype=bool)
+
+    def __newLabel(self):
+        self.__next += 1
+        return self.__next - 1
+
+    def __root(self, label):
+        parent = self.__parent
+        while label in parent:
+            up = parent[label]
+            if up in parent:
+                parent[label] = parent[up]
+            label = up
+        return label
+
+    def __unblock(self, i):
+        # The opened grid joins its neighbors, the smaller components are hooked under the largest one
+        size = self.__size
+        self.__open[i] = True
+        near = {self.__root(self.__label[n]) for n in self.grid.neighbors(i)} - {-1}
+        if not near:
+            self.__label[i] = self.__newLabel()
+            size[self.__label[i]] = 1
+            return
+        keep = max(near, key=size.get)
+        self.__label[i] = keep
+        size[keep] += 1
+        for other in near - {keep}:
+            size[keep] += size.pop(other)
+            self.__parent[other] = keep
+
+    def __block(self, i):
+        # Returns False when the split is too large to be walked
+        label = self.__label
+        old = self.__root(label[i])
+        label[i] = -1
+        self.__open[i] = False
+        self.__size[old] -= 1
+        if self.__size[old] == 0:
+            del self.__size[old]
+            return True
+        # Neighbors still linked around the blocked grid cannot have been split apart
+        ring = list(dict.fromkeys(n for n in self.grid.neighbors(i) if self.__root(label[n]) == old))
+        seeds = []
+        seen = set()
+        for n in ring:
+            if n in seen:
+                continue
+            seeds.append(n)
+            seen.add(n)
+            stack = [n]
+            while stack:
+                for m in self.grid.neighbors(stack.pop()):
+                    if m in ring and m not in seen:
+                        seen.add(m)
+                        stack.append(m)
+        if len(seeds) > 1:
+            return self.__split(old, seeds)
+        return True
+
+    def __split(self, old, seeds):
+        # Flood from every seed in turns, floods that meet are merged, floods that run dry
+        # before the others are new components, so only the smaller parts are walked through
+        label = self.__label
+        roots = {-1: -1}
+        parent = list(range(len(seeds)))
+        queues = [deque([s]) for s in seeds]
+        members = [[s] for s in seeds]
+        owner = {s: k for (k, s) in enumerate(seeds)}
+        active = list(range(len(seeds)))
+
+        def find(k):
+            while parent[k] != k:
+                parent[k] = parent[parent[k]]
+                k = parent[k]
+            return k
+
+        while len(active) > 1:
+            if len(owner) > self.__budget:
+                return False
+            for k in list(active):
+                if k not in active:
+                    continue
+                if not queues[k]:
+                    active.remove(k)
+                    new = self.__newLabel()
+                    for n in members[k]:
+                        label[n] = new
+                    self.__size[new] = len(members[k])
+                    self.__size[old] -= len(members[k])
+                    if len(active) == 1:
+                        break
+                    continue
+                for n in self.grid.neighbors(queues[k].popleft()):
+                    if label[n] not in roots:
+                        roots[label[n]] = self.__root(label[n])
+                    if roots[label[n]] != old:
+                        continue
+                    o = owner.get(n)
+                    if o is None:
+                        owner[n] = k
+                        queues[k].append(n)
+                        members[k].append(n)
+                        continue
+                    o = find(o)
+                    if o != k:
+                        parent[o] = k
+                        queues[k].extend(queues[o])
+                        members[k].extend(members[o])
+                        active.remove(o)
+                if len(active) == 1:
+                    break
+        return True
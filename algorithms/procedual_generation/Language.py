@@ -1,12 +1,24 @@
 """ LANGUAGE MODULE
 # Description:
     This is naming language algorithm implemented by following Martin O'Leary's instructions in his webpage.
+    A built language can be saved as a compact snapshot and restored without drawing its pools again,
+    and LangGen.cached keeps the languages built per style and seed in a process-wide LRU cache.
+# Dependencies: Numpy
 # Author: Shin-Fu (Kelvin) Wu
 # Date: 2017/03/23
 # Reference:
     * http://mewo2.com/notes/naming-language
 """
+from collections import OrderedDict
+import itertools
+import json
+from multiprocessing import Pool
 import random
+import re
+import struct
+import threading
+import zlib
+import numpy as np
 
 consonants = {'Minimal' :               {'p','t','k','m','n','l','s'},
               'English-ish' :           {'p','t','k','b','d','g','m','n','l','r','s','ʃ','z','ʒ','ʧ'},
@@ -51,6 +63,28 @@ structures = {'CVC', 'CVV?C', 'CVVC?', 'CVC?', 'CV', 'VC', 'CVF', 'C?VC', 'CVF?'
 
 restrictions = {'None', 'Double sounds', 'Double sounds and hard clusters'}
 
+# Clusters rejected by the 'Double sounds and hard clusters' restriction
+hard_clusters = ('ss', 'sʃ', 'ʃs', 'ʃʃ', 'fs', 'fʃ', 'rl', 'lr', 'll', 'rr')
+
+# Most draws of one syllable before the restriction is given up
+MAX_ATTEMPTS = 1000
+
+# Names drawn at once by genNames and iterNames
+BATCH = 65536
+
+# Pool sizes and syllable counts, overridden by the keyword arguments of LangGen
+DEFAULT_ARGS = {'generic_pool_size': 20, 'generic_min_syllable': 1, 'generic_max_syllable': 1,
+                'city_pool_size': 3, 'city_min_syllable': 1, 'city_max_syllable': 1,
+                'conn_pool_size': 2, 'conn_min_syllable': 1, 'conn_max_syllable': 1}
+
+SNAPSHOT_MAGIC = b'LANG'
+SNAPSHOT_VERSION = 1
+# magic, format version, then the language as zlib-compressed JSON
+SNAPSHOT_HEADER = struct.Struct('<4sH')
+
+# Most languages kept by LangGen.cached, the least recently used are dropped
+CACHE_SIZE = 64
+
 vowel_orthography_set = {'Default' :        {'A': 'á', 'E': 'é', 'I': 'í', 'O': 'ó', 'U': 'ú'},
                          'Ácutes' :         {},
                          'Ümlauts' :        {'A': 'ä', 'E': 'ë', 'I': 'ï', 'O': 'ö', 'U': 'ü'},
@@ -69,6 +103,8 @@ consonant_orthography_set = {'Default' :            {'ʃ': 'sh', 'ʒ': 'zh', 'ʧ
 class LangGen():
     def __init__(self, C, V, S, L, F, structure, restriction, CO_type, VO_type, random_seed=None, **kwargs):
         """ Naming Language Generator
+            The structures, phonemes, restriction and orthography are compiled once, and every draw
+            comes from the generator's own random.Random, so the module-level random is left alone.
         Parameters
         ----------
         C: string
@@ -90,7 +126,7 @@ class LangGen():
         VO_type: string
             The type of Vowel Orthography.
         random_seed: int, optional
-            Random seed determines the generation of syllables.
+            Random seed determines the generation of syllables, the same seed gives the same pools and names.
         Attributes
         ----------
         argDict: dict
@@ -114,18 +150,144 @@ class LangGen():
         self.CO_type = CO_type
         self.VO_type = VO_type
         self.random_seed = random_seed
+        self.__random = random.Random(random_seed)
+        self.argDict = _arguments(kwargs)
         
-        default = {'generic_pool_size': 20, 'generic_min_syllable': 1, 'generic_max_syllable': 1,\
-                   'city_pool_size': 3, 'city_min_syllable': 1, 'city_max_syllable': 1,\
-                   'conn_pool_size': 2, 'conn_min_syllable': 1, 'conn_max_syllable': 1}
-        self.argDict = default
-        for key in default.keys():
-            if key in kwargs.keys():
-                self.argDict[key] = kwargs[key]
-        
+        self.__compile()
         self.__initLangEngine()
     
+    def snapshot(self):
+        """ Snapshot
+            The language as compact bytes: its style, arguments, morpheme pools and the state of its
+            generator, so LangGen.restore goes on drawing the same names as this language would.
+        
+        Returns
+        -------
+        data: bytes
+            The snapshot, a small header followed by zlib-compressed JSON.
+        """
+        return _encode(self.__state())
+    
+    @classmethod
+    def restore(cls, data):
+        """ Restore Snapshot
+            The pools are taken as they are instead of drawn again, the phonology tables are compiled
+            from the style (nothing is drawn for them).
+        Parameters
+        ----------
+        data: bytes
+            A snapshot made by snapshot().
+        
+        Returns
+        -------
+        lang: LangGen
+            The language as it was when the snapshot was made.
+        """
+        return cls.__from_state(_decode(data))
+    
+    def save(self, path):
+        """ Save the snapshot of the language into a file. """
+        with open(path, 'wb') as f:
+            f.write(self.snapshot())
+    
+    @classmethod
+    def load(cls, path):
+        """ Load a language saved with save(). """
+        with open(path, 'rb') as f:
+            return cls.restore(f.read())
+    
+    @classmethod
+    def cached(cls, C, V, S, L, F, structure, restriction, CO_type, VO_type, random_seed=None, **kwargs):
+        """ Cached Language
+            The same as LangGen(...), but a language already built in this process with the same
+            style, seed and arguments is restored from the cache instead of drawn again. Every call
+            returns a language of its own, as freshly built, so the draws of one never change another.
+            Languages without a seed are random each time and never cached. See cache_info().
+        
+        Returns
+        -------
+        lang: LangGen
+            The language, built or restored.
+        """
+        style = (C, V, S, L, F, structure, restriction, CO_type, VO_type)
+        argDict = _arguments(kwargs)
+        if random_seed is None:
+            return cls(*style, random_seed=random_seed, **argDict)
+        key = (style, random_seed, tuple(sorted(argDict.items())))
+        with _cache_lock:
+            entry = _cache.get(key)
+            if entry is not None:
+                _cache.move_to_end(key)
+                _cache_counters['hits'] += 1
+        if entry is not None:
+            return cls.__from_state(*entry)
+        
+        lang = cls(*style, random_seed=random_seed, **argDict)
+        # The compiled tables are only ever replaced, never changed in place, so they are shared
+        entry = (lang.__state(), lang.__tables())
+        with _cache_lock:
+            _cache_counters['misses'] += 1
+            _cache[key] = entry
+            while len(_cache) > CACHE_SIZE:
+                _cache.popitem(last=False)
+                _cache_counters['evictions'] += 1
+        return lang
+    
+    def __state(self):
+        (version, internal, gauss) = self.__random.getstate()
+        return {'style': [self.C, self.V, self.S, self.L, self.F, self.structure, self.restriction, self.CO_type, self.VO_type],
+                'seed': self.random_seed, 'args': dict(self.argDict),
+                'pools': {'generic': list(self.__generic), 'city': list(self.__city), 'conn': list(self.__connection)},
+                'random': [version, list(internal), gauss], 'syllables': self.__syllable_count}
+    
+    def __tables(self):
+        return (self.__structures, self.__rejected, self.__generic, self.__city, self.__connection, self.__arrays)
+    
+    @classmethod
+    def __from_state(cls, state, tables=None):
+        lang = cls.__new__(cls)
+        (lang.C, lang.V, lang.S, lang.L, lang.F, lang.structure, lang.restriction, lang.CO_type, lang.VO_type) = state['style']
+        lang.random_seed = state['seed']
+        lang.argDict = dict(state['args'])
+        (version, internal, gauss) = state['random']
+        lang.__random = random.Random()
+        lang.__random.setstate((version, tuple(internal), gauss))
+        lang.__initStyle()
+        lang.generic_morpheme_pool = set(state['pools']['generic'])
+        lang.city_morpheme_pool = set(state['pools']['city'])
+        lang.connection_morpheme_pool = set(state['pools']['conn'])
+        lang.__syllable_count = state['syllables']
+        if tables is None:
+            lang.__compile()
+            lang.__compilePools()
+        else:
+            (lang.__structures, lang.__rejected, lang.__generic, lang.__city, lang.__connection, lang.__arrays) = tables
+        return lang
+    
+    def __compile(self):
+        phonemes = {'C': consonants[self.C], 'V': vowels[self.V], 'S': sibilants[self.S],
+                    'L': liquids[self.L], 'F': finals[self.F]}
+        consonant_table = self.__orthography_table(self.CO_type, consonant_orthography_set)
+        tables = {'C': consonant_table, 'S': consonant_table, 'F': consonant_table,
+                  'V': self.__orthography_table(self.VO_type, vowel_orthography_set), 'L': {}}
+        # Each structure as its slots: the sorted phonemes of the slot and their spellings
+        slots = {}
+        for (kind, phoneme_set) in phonemes.items():
+            raw = tuple(sorted(phoneme_set))
+            slots[kind] = (raw, tuple(p.translate(tables[kind]) for p in raw))
+        self.__structures = tuple(tuple(slots[kind] for kind in code if kind in slots)
+                                  for code in self.__phonotactics(self.structure))
+        self.__rejected = self.__restriction_pattern(self.restriction, phonemes['C'])
+    
     def __initLangEngine(self):
+        self.__initStyle()
+        self.generic_morpheme_pool = self.__geneate_morpheme_pool(self.argDict['generic_pool_size'], self.argDict['generic_min_syllable'], self.argDict['generic_max_syllable'])
+        self.city_morpheme_pool = self.__geneate_morpheme_pool(self.argDict['city_pool_size'], self.argDict['city_min_syllable'], self.argDict['city_max_syllable'])
+        self.connection_morpheme_pool = self.__geneate_morpheme_pool(self.argDict['conn_pool_size'], self.argDict['conn_min_syllable'], self.argDict['conn_max_syllable'])
+        self.__syllable_count = None
+        self.__compilePools()
+    
+    def __initStyle(self):
         self.lang_style = {'consonant' :                    self.C,
                           'vowel' :                         self.V,
                           'sibilant' :                      self.S,
@@ -135,10 +297,55 @@ class LangGen():
                           'restriction' :                   self.restriction,
                           'consonant_orthography_type' :    self.CO_type,
                           'vowel_orthography_type' :        self.VO_type}
+    
+    def __compilePools(self):
+        # Sorted, so the draws do not depend on the hashing of the sets
+        self.__generic = tuple(sorted(self.generic_morpheme_pool))
+        self.__city = tuple(sorted(self.city_morpheme_pool))
+        self.__connection = tuple(sorted(self.connection_morpheme_pool))
+        # The pools as object arrays for the batches: plain, capitalized, and capitalized after a space
+        self.__arrays = {}
+        for (key, pool) in (('G', self.__generic), ('C', self.__city), ('N', self.__connection)):
+            capital = [m[:1].upper() + m[1:] for m in pool]
+            self.__arrays[key] = np.array(pool, dtype=object)
+            self.__arrays[key + '^'] = np.array(capital, dtype=object)
+            self.__arrays[' ' + key] = np.array([' ' + m for m in pool], dtype=object)
+            self.__arrays[' ' + key + '^'] = np.array([' ' + m for m in capital], dtype=object)
+    
+    def extendPool(self, pool, count):
+        """ Extend Morpheme Pool
+            Draw more morphemes into a pool, those already in it are dropped.
+        Parameters
+        ----------
+        pool: string
+            The pool to extend, 'generic', 'city' or 'conn'.
+        count: int
+            Number of morphemes drawn.
         
-        self.generic_morpheme_pool = self.__geneate_morpheme_pool(self.lang_style,self.argDict['generic_pool_size'], self.argDict['generic_min_syllable'], self.argDict['generic_max_syllable'])
-        self.city_morpheme_pool = self.__geneate_morpheme_pool(self.lang_style, self.argDict['city_pool_size'], self.argDict['city_min_syllable'], self.argDict['city_max_syllable'])
-        self.connection_morpheme_pool = self.__geneate_morpheme_pool(self.lang_style, self.argDict['conn_pool_size'], self.argDict['conn_min_syllable'], self.argDict['conn_max_syllable'])
+        Returns
+        -------
+        added: int
+            Number of new morphemes in the pool, 0 once the syllables run out.
+        """
+        pools = {'generic': self.generic_morpheme_pool, 'city': self.city_morpheme_pool, 'conn': self.connection_morpheme_pool}
+        if pool not in pools:
+            raise ValueError('- pool not supported -')
+        target = pools[pool]
+        before = len(target)
+        target |= self.__geneate_morpheme_pool(count, self.argDict[pool + '_min_syllable'], self.argDict[pool + '_max_syllable'])
+        self.__compilePools()
+        return len(target) - before
+    
+    def syllableCount(self):
+        """ Number of distinct syllables the language can spell within its restriction. """
+        if self.__syllable_count is None:
+            spelled = set()
+            for slots in self.__structures:
+                for picks in itertools.product(*[range(len(raw)) for (raw, _) in slots]):
+                    if self.__rejected is None or not self.__rejected.search(''.join([raw[i] for ((raw, _), i) in zip(slots, picks)])):
+                        spelled.add(''.join([spelled_slot[i] for ((_, spelled_slot), i) in zip(slots, picks)]))
+            self.__syllable_count = len(spelled)
+        return self.__syllable_count
     
     def genName(self, min_word, max_word):
         """ Genearte Name
@@ -149,38 +356,185 @@ class LangGen():
         max_word: int
             Maximum number of words in a name.
         """
-        name = self.__generate_name_from_morpheme_pool(self.generic_morpheme_pool, self.city_morpheme_pool, self.connection_morpheme_pool, min_word, max_word)
+        name = self.__generate_name_from_morpheme_pool(self.__generic, self.__city, self.__connection, min_word, max_word)
         return name
 
-    def __generate_syllable(self, consonant_set, vowel_set, sibilant_set, liquid_set, final_set, structure, restriction, consonant_orthography_type, vowel_orthography_type):
-        regenerate = True
-        while(regenerate == True):        
-            structure_list = self.__phonotactics(structure)
-            random.seed(self.random_seed)
-            selected_structure = structure_list[random.randint(0, len(structure_list) - 1)]
-            # Generate syllable according to structure
-            syllable = ''
-            for i in range(len(selected_structure)):                
-                if selected_structure[i] == 'C':
-                    random.seed(self.random_seed)
-                    syllable += random.choice(sorted(list(consonant_set)))
-                elif selected_structure[i] == 'V':
-                    random.seed(self.random_seed)
-                    syllable += random.choice(sorted(list(vowel_set)))
-                elif selected_structure[i] == 'S':
-                    random.seed(self.random_seed)
-                    syllable += random.choice(sorted(list(sibilant_set)))
-                elif selected_structure[i] == 'L':
-                    random.seed(self.random_seed)
-                    syllable += random.choice(sorted(list(liquid_set)))
-                elif selected_structure[i] == 'F':
-                    random.seed(self.random_seed)
-                    syllable += random.choice(sorted(list(final_set)))
-            # Check restriction criteria
-            regenerate = self.__check_regenerate_restriction(syllable, restriction, consonant_set)
-        # Orthography
-        syllable = self.__orthography(syllable, selected_structure, consonant_orthography_type, vowel_orthography_type)    
-        return syllable
+    def genNames(self, n, min_word, max_word, seed=None):
+        """ Generate Names
+            Draw many names at once, as genName would one by one (but from another random stream).
+        Parameters
+        ----------
+        n: int
+            Number of names.
+        min_word: int
+            Minimum number of words in a name.
+        max_word: int
+            Maximum number of words in a name.
+        seed: int, optional
+            Seed of these names alone, drawn from the generator by default.
+        
+        Returns
+        -------
+        names: list
+            The n names, the same ones for the same seed and calls made before.
+        """
+        return list(self.iterNames(min_word, max_word, n, seed=seed))
+    
+    def genNamesSharded(self, n, min_word, max_word, processes=1, shard_size=BATCH, unique=False, patience=8):
+        """ Generate Names in Shards
+            The names are split into shards of shard_size names, each shard drawn from its own seed
+            derived from the generator, and merged in shard order: the same seed gives the same
+            names whatever the number of processes.
+        Parameters
+        ----------
+        n: int
+            Number of names.
+        min_word: int
+            Minimum number of words in a name.
+        max_word: int
+            Maximum number of words in a name.
+        processes: int, optional
+            Number of worker processes, the language is handed to each worker once.
+        shard_size: int, optional
+            Number of names of a shard.
+        unique: bool, optional
+            Drop the names found in an earlier shard (or earlier in the same one) and draw more
+            rounds of full shards until n names are found. Names are kept as 64-bit fingerprints
+            in a sorted array, as in UniqueNameGen.
+        patience: int, optional
+            Number of rounds in a row without a new name before unique names are taken as exhausted.
+        
+        Returns
+        -------
+        names: list
+            The names in shard order, fewer than n only when unique names ran out.
+        """
+        if shard_size <= 0:
+            raise ValueError('- shard size must be positive -')
+        if not 0 <= min_word <= max_word:
+            raise ValueError('- word counts must satisfy 0 <= min_word <= max_word -')
+        if patience <= 0:
+            raise ValueError('- patience must be positive -')
+        if unique:
+            # UniqueNames draws on this module, its fingerprints are imported here
+            from .UniqueNames import fingerprints
+        base = self.__random.getrandbits(64)
+        names = []
+        index = np.empty(0, dtype=np.uint64)
+        (shard, shards, idle) = (0, 0, 0)
+        pool = Pool(processes, _init_shard_worker, (self,)) if processes > 1 else None
+        try:
+            while len(names) < n and idle < patience:
+                missing = n - len(names)
+                if unique:
+                    # Rounds never shrink, so the later rounds still find the rarer new names
+                    shards = max(shards, -(-missing // shard_size))
+                    sizes = [shard_size] * shards
+                else:
+                    sizes = [min(shard_size, missing - i * shard_size) for i in range(-(-missing // shard_size))]
+                tasks = []
+                for size in sizes:
+                    seed = int(np.random.SeedSequence([base, shard]).generate_state(1)[0])
+                    tasks.append((seed, size, min_word, max_word))
+                    shard += 1
+                if pool is None:
+                    results = [self.genNames(size, low, high, seed=seed) for (seed, size, low, high) in tasks]
+                else:
+                    results = pool.map(_draw_shard, tasks)
+                if not unique:
+                    for batch in results:
+                        names += batch
+                    break
+                before = len(names)
+                for batch in results:
+                    prints = fingerprints(batch)
+                    (prints, first) = np.unique(prints, return_index=True)
+                    position = np.searchsorted(index, prints)
+                    new = np.ones(len(prints), dtype=bool)
+                    inside = position < len(index)
+                    new[inside] = index[position[inside]] != prints[inside]
+                    index = np.insert(index, position[new], prints[new])
+                    names += [batch[i] for i in np.sort(first[new])]
+                idle = 0 if len(names) > before else idle + 1
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return names[:n]
+    
+    def iterNames(self, min_word, max_word, n=None, batch=BATCH, seed=None):
+        """ Iterate Names
+            Stream n names (endless by default), drawn batch names at a time.
+        Parameters
+        ----------
+        min_word: int
+            Minimum number of words in a name.
+        max_word: int
+            Maximum number of words in a name.
+        n: int, optional
+            Number of names, endless if None.
+        batch: int, optional
+            Number of names drawn at once.
+        seed: int, optional
+            Seed of these names alone, drawn from the generator by default.
+        """
+        if not 0 <= min_word <= max_word:
+            raise ValueError('- word counts must satisfy 0 <= min_word <= max_word -')
+        if batch <= 0:
+            raise ValueError('- batch must be positive -')
+        # The batches have their own stream, seeded now so the names do not depend on when they are read
+        rng = np.random.RandomState(self.__random.getrandbits(32) if seed is None else seed)
+        return self.__stream(rng, min_word, max_word, n, batch)
+    
+    def __stream(self, rng, min_word, max_word, n, batch):
+        left = n
+        while left is None or left > 0:
+            size = batch if left is None else min(batch, left)
+            yield from self.__draw_names(rng, size, min_word, max_word)
+            if left is not None:
+                left -= size
+    
+    def __draw_names(self, rng, size, min_word, max_word):
+        # The choices of genName for every word slot of every name, as arrays
+        arrays = self.__arrays
+        width = max(max_word, 1)
+        num_of_word = rng.randint(min_word, max_word + 1, size)[:, None]
+        position = np.arange(width)
+        inside = position < num_of_word
+        middle = (position > 0) & (position < num_of_word - 1)
+        # The connection word takes the first middle slot whose coin comes up, the slots before it stay empty
+        tried = middle & (rng.random_sample((size, width)) > 0.5)
+        first = np.where(tried.any(axis=1), tried.argmax(axis=1), width)[:, None]
+        connection = position == first
+        word = inside & ~(middle & (position <= first))
+        generic_first = rng.random_sample((size, width)) > 0.5
+        g = rng.randint(0, len(arrays['G']), (size, width))
+        c = rng.randint(0, len(arrays['C']), (size, width))
+        k = rng.randint(0, len(arrays['N']), size)
+        
+        names = np.full(size, '', dtype=object)
+        for i in range(width):
+            space = ' ' if i > 0 else ''
+            head = np.where(generic_first[:, i], arrays[space + 'G^'][g[:, i]], arrays[space + 'C^'][c[:, i]])
+            tail = np.where(generic_first[:, i], arrays['C'][c[:, i]], arrays['G'][g[:, i]])
+            token = np.where(word[:, i], head + tail, '')
+            if i > 0:
+                token = np.where(connection[:, i], arrays[' N'][k], token)
+            names += token
+        return names.tolist()
+    
+    def __generate_syllable(self):
+        # random() scaled to an index is much cheaper than randrange()
+        rand = self.__random.random
+        structures = self.__structures
+        rejected = self.__rejected
+        for _ in range(MAX_ATTEMPTS):
+            slots = structures[int(rand() * len(structures))]
+            picks = [(raw, spelled, int(rand() * len(raw))) for (raw, spelled) in slots]
+            # Check restriction criteria on the phonemes, then spell them
+            if rejected is None or not rejected.search(''.join([raw[i] for (raw, _, i) in picks])):
+                return ''.join([spelled[i] for (_, spelled, i) in picks])
+        raise ValueError('- restriction cannot be met by the phonemes -')
     
     def __phonotactics(self, structure):
         structure_code = self.__split_optional_structure(structure)
@@ -198,94 +552,103 @@ class LangGen():
             structure_code += (structure + ',')
         return structure_code
     
-    def __orthography(self, syllable, selected_structure, consonant_orthography_type, vowel_orthography_type):
-        output = ''
-        for i in range(len(syllable)):
-            if selected_structure[i] == 'C' or selected_structure[i] == 'S' or selected_structure[i] == 'F':
-                output += self.__phoneme_orthography(syllable[i], consonant_orthography_type, consonant_orthography_set)
-            elif selected_structure[i] == 'V':
-                output += self.__phoneme_orthography(syllable[i], vowel_orthography_type, vowel_orthography_set)
-            else:
-                output += syllable[i]
-        return output
-    
-    def __phoneme_orthography(self, phoneme, orthography_type, orthography_set):
-        if orthography_type in orthography_set.keys():
-            lookup_dict = orthography_set[orthography_type]
-            if phoneme in lookup_dict.keys():
-                phoneme = lookup_dict[phoneme]
-            elif phoneme in orthography_set['Default']:
-                phoneme = orthography_set['Default'][phoneme]
-        return phoneme
+    def __orthography_table(self, orthography_type, orthography_set):
+        # Spellings of the type, falling back to the default ones, as a str.translate table
+        if orthography_type not in orthography_set.keys():
+            return {}
+        lookup_dict = dict(orthography_set['Default'])
+        lookup_dict.update(orthography_set[orthography_type])
+        return str.maketrans(lookup_dict)
     
-    def __check_regenerate_restriction(self, syllable, restriction, consonant_set):
-        if restriction == 'None':
-            return False
-        elif restriction == 'Double sounds':
-            return self.__check_double_sound(syllable, consonant_set)       
+    def __restriction_pattern(self, restriction, consonant_set):
+        # A consonant written twice in a row, or a hard cluster
+        double_sound = '([' + ''.join(re.escape(c) for c in sorted(consonant_set)) + r'])\1'
+        if restriction == 'Double sounds':
+            return re.compile(double_sound)
         elif restriction == 'Double sounds and hard clusters':
-            return (self.__check_double_sound(syllable, consonant_set) or self.__check_hard_clusters(syllable)) 
-    
-    def __check_double_sound(self, syllable, consonant_set):
-        for i in range(len(syllable)):
-            if syllable.count(syllable[i]) > 1 and syllable[i] in consonant_set:
-                if i != len(syllable) -1 and syllable[i] == syllable[i+1]:
-                    return True
-        return False
-    
-    def __check_hard_clusters(self, syllable):
-        hard_cluster_cases = ['ss','sʃ','ʃs','ʃʃ','fs','fʃ','rl','lr','ll','rr']
-        for cluster in hard_cluster_cases:
-            if cluster in syllable:
-                return True
-        return False
+            return re.compile('|'.join([double_sound] + [re.escape(c) for c in hard_clusters]))
+        return None
     
-    def __generate_morpheme(self, language_style, num_of_syllables):
-        morpheme = ''
-        for i in range(num_of_syllables):
-            morpheme += self.__generate_syllable(consonant_set=consonants[language_style['consonant']], vowel_set=vowels[language_style['vowel']], \
-                                      sibilant_set=sibilants[language_style['sibilant']], liquid_set=liquids[language_style['liquid']], \
-                                      final_set=finals[language_style['final']], structure=language_style['structure'], restriction=language_style['restriction'], \
-                                      consonant_orthography_type=language_style['consonant_orthography_type'], vowel_orthography_type=language_style['vowel_orthography_type'])
-        return morpheme
+    def __generate_morpheme(self, num_of_syllables):
+        return ''.join(self.__generate_syllable() for i in range(num_of_syllables))
     
-    def __geneate_morpheme_pool(self, language_style, pool_size, min_syllable=1, max_syllable=2):
+    def __geneate_morpheme_pool(self, pool_size, min_syllable=1, max_syllable=2):
+        rand = self.__random.random
         pool = set()
         for i in range(pool_size):
-            random.seed(self.random_seed)
-            num_of_syllables = random.randint(min_syllable, max_syllable)
-            pool.add(self.__generate_morpheme(language_style, num_of_syllables))    
+            num_of_syllables = min_syllable + int(rand() * (max_syllable - min_syllable + 1))
+            pool.add(self.__generate_morpheme(num_of_syllables))
         return pool
     
     def __generate_name_from_morpheme_pool(self, generic_morpheme_pool, meaningful_morpheme_pool, connection_morpheme_pool, min_word=1, max_word=3):
+        rand = self.__random.random
         name = ''
         connection_used = False
-        random.seed(self.random_seed)
-        num_of_word = random.randint(min_word, max_word)    
+        num_of_word = min_word + int(rand() * (max_word - min_word + 1))
         for i in range(num_of_word):        
             if i > 0 and i != num_of_word - 1 and not connection_used:
-                random.seed(self.random_seed)
-                connect_prob = random.random()
+                connect_prob = rand()
                 if connect_prob > 0.5:
-                    random.seed(self.random_seed)
-                    name += random.choice(list(connection_morpheme_pool)) + ' '
+                    name += connection_morpheme_pool[int(rand() * len(connection_morpheme_pool))] + ' '
                     connection_used = True
             else:
-                random.seed(self.random_seed)
-                prob = random.random()
+                prob = rand()
                 if prob > 0.5:
-                    random.seed(self.random_seed)
-                    word1 = random.choice(list(generic_morpheme_pool))
-                    random.seed(self.random_seed)
-                    word2 = random.choice(list(meaningful_morpheme_pool))
-                    word = ( word1 + word2 )
-                    name += word[0].upper() + word[1:] + ' '
+                    word1 = generic_morpheme_pool[int(rand() * len(generic_morpheme_pool))]
+                    word2 = meaningful_morpheme_pool[int(rand() * len(meaningful_morpheme_pool))]
                 else:
-                    random.seed(self.random_seed)
-                    word1 = random.choice(list(meaningful_morpheme_pool))
-                    random.seed(self.random_seed)
-                    word2 = random.choice(list(generic_morpheme_pool))
-                    word = ( word1 + word2 )
-                    name += word[0].upper() + word[1:] + ' '
+                    word1 = meaningful_morpheme_pool[int(rand() * len(meaningful_morpheme_pool))]
+                    word2 = generic_morpheme_pool[int(rand() * len(generic_morpheme_pool))]
+                word = ( word1 + word2 )
+                name += word[0].upper() + word[1:] + ' '
                 
-        return name[:-1]
\ No newline at end of file
+        return name[:-1]
+
+def _arguments(kwargs):
+    # The default arguments updated by the known keyword arguments, the others are ignored
+    argDict = dict(DEFAULT_ARGS)
+    for key in DEFAULT_ARGS.keys():
+        if key in kwargs.keys():
+            argDict[key] = kwargs[key]
+    return argDict
+
+def _encode(state):
+    payload = zlib.compress(json.dumps(state, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 9)
+    return SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION) + payload
+
+def _decode(data):
+    data = bytes(data)
+    if len(data) < SNAPSHOT_HEADER.size or data[:4] != SNAPSHOT_MAGIC:
+        raise ValueError('- not a language snapshot -')
+    (_, version) = SNAPSHOT_HEADER.unpack(data[:SNAPSHOT_HEADER.size])
+    if version != SNAPSHOT_VERSION:
+        raise ValueError('- language snapshot version not supported -')
+    try:
+        return json.loads(zlib.decompress(data[SNAPSHOT_HEADER.size:]).decode('utf-8'))
+    except (zlib.error, UnicodeDecodeError, ValueError):
+        raise ValueError('- language snapshot is corrupted -')
+
+# (state, compiled tables) of the languages built by LangGen.cached, least recently used first
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_counters = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+def cache_info():
+    """ Counters of the language cache: hits, misses, evictions (LRU) and size. """
+    with _cache_lock:
+        return dict(_cache_counters, size=len(_cache))
+
+def clear_cache():
+    """ Drop every cached language, the counters are kept. """
+    with _cache_lock:
+        _cache.clear()
+
+# The language of a shard worker, handed over once when the worker starts
+_shard_worker = {}
+
+def _init_shard_worker(lang):
+    _shard_worker['lang'] = lang
+
+def _draw_shard(task):
+    (seed, size, min_word, max_word) = task
+    return _shard_worker['lang'].genNames(size, min_word, max_word, seed=seed)
@@ -0,0 +1,171 @@
+""" UNIQUE NAMES MODULE
+# Description:
+    This is the stream of names that are never issued twice, on top of LangGen.
+    Issued names are kept as 64-bit fingerprints in a sorted array (8 bytes a name instead of a
+    Python string in a set). The same name always has the same fingerprint, so no name is issued
+    twice; two names sharing a fingerprint (about n^2 / 2^65 of the time) only skip a new name.
+    The morpheme pools are extended whenever the candidates keep colliding, and the stream ends
+    once no new name turns up for a few batches in a row.
+# Dependencies: Numpy
+# Author: agent
+# Date: 2026/10/18
+"""
+from collections import deque
+import numpy as np
+from .Language import BATCH
+
+# 64-bit FNV-1a
+FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+FNV_PRIME = np.uint64(0x100000001b3)
+
+def fingerprints(names):
+    """ 64-bit FNV-1a fingerprints of the UTF-8 names, as a numpy.uint64 array. """
+    # One buffer for the batch, names never hold a line break
+    data = np.frombuffer(''.join(name + '\n' for name in names).encode('utf-8'), dtype=np.uint8)
+    ends = np.flatnonzero(data == 10)
+    starts = np.concatenate([[0], ends[:-1] + 1]).astype(np.intp)
+    lengths = ends - starts
+    h = np.full(len(ends), FNV_OFFSET, dtype=np.uint64)
+    for j in range(int(lengths.max()) if len(ends) > 0 else 0):
+        inside = np.flatnonzero(j < lengths)
+        h[inside] = (h[inside] ^ data[starts[inside] + j]) * FNV_PRIME
+    return h
+
+class UniqueNameGen():
+    def __init__(self, lang, min_word=1, max_word=3, batch=BATCH, grow_at=0.5, patience=8):
+        """ Unique Name Generator
+        Parameters
+        ----------
+        lang: LangGen
+            The language the names are drawn from, its pools are extended as needed.
+        min_word: int, optional
+            Minimum number of words in a name.
+        max_word: int, optional
+            Maximum number of words in a name.
+        batch: int, optional
+            Number of candidate names drawn at once.
+        grow_at: float, optional
+            Share of colliding candidates in a batch above which the generic and city pools are doubled.
+        patience: int, optional
+            Number of batches in a row without a new name before the names are taken as exhausted.
+
+        Attributes
+        ---------
+        issued: int
+            Number of names issued so far.
+        exhausted: bool
+            True once the stream ended because no new name turned up.
+        """
+        if not 0 <= min_word <= max_word:
+            raise ValueError('- word counts must satisfy 0 <= min_word <= max_word -')
+        if patience <= 0:
+            raise ValueError('- patience must be positive -')
+        self.lang = lang
+        self.min_word = min_word
+        self.max_word = max_word
+        self.batch = batch
+        self.grow_at = grow_at
+        self.patience = patience
+        self.exhausted = False
+        self.__index = np.empty(0, dtype=np.uint64)
+        # New names drawn but not handed out yet
+        self.__ready = deque()
+
+    @property
+    def issued(self):
+        return len(self.__index) - len(self.__ready)
+
+    def __len__(self):
+        return self.issued
+
+    def __contains__(self, name):
+        """ Check whether the name was drawn already (issued, or about to be). """
+        return self.__find(fingerprints([name]))[0]
+
+    def genNames(self, n):
+        """ Generate Unique Names
+        Parameters
+        ----------
+        n: int
+            Number of names.
+
+        Returns
+        -------
+        names: list
+            n names never issued before, fewer once the names are exhausted.
+        """
+        names = []
+        while len(names) < n:
+            if not self.__ready and not self.__refill():
+                break
+            ready = self.__ready
+            names += [ready.popleft() for i in range(min(n - len(names), len(ready)))]
+        return names
+
+    def iterNames(self):
+        """ Stream unique names until they are exhausted. """
+        while self.__ready or self.__refill():
+            yield self.__ready.popleft()
+
+    def capacity(self):
+        """ Estimate Capacity
+            Upper bounds of the number of distinct names, counting every morpheme and compound
+            as a different string.
+
+        Returns
+        -------
+        capacity: dict
+            'issued' names, the 'pools' bound with the current pools, the 'limit' bound once every
+            pool holds all its possible morphemes, and the names 'remaining' under the limit.
+        """
+        lang = self.lang
+        syllables = lang.syllableCount()
+        possible = {}
+        for pool in ('generic', 'city', 'conn'):
+            (low, high) = (lang.argDict[pool + '_min_syllable'], lang.argDict[pool + '_max_syllable'])
+            possible[pool] = sum(syllables ** k for k in range(low, high + 1))
+        current = self.__bound(len(lang.generic_morpheme_pool), len(lang.city_morpheme_pool), len(lang.connection_morpheme_pool))
+        limit = self.__bound(possible['generic'], possible['city'], possible['conn'])
+        return {'issued': self.issued, 'pools': current, 'limit': limit, 'remaining': max(limit - self.issued, 0)}
+
+    def __bound(self, generic, city, connection):
+        # Compounds are generic + city or city + generic, a name is one word, two words,
+        # or a word, a connection word and 1 to max_word - 2 more words
+        words = 2 * generic * city
+        total = words if self.min_word <= 1 <= self.max_word else 0
+        if self.max_word >= 2:
+            total += words ** 2
+        for more in range(1, self.max_word - 1):
+            total += connection * words ** (more + 1)
+        return total
+
+    def __find(self, prints):
+        index = self.__index
+        position = np.searchsorted(index, prints)
+        found = np.zeros(len(prints), dtype=bool)
+        inside = position < len(index)
+        found[inside] = index[position[inside]] == prints[inside]
+        return found
+
+    def __refill(self):
+        # Draw batches until one brings new names, growing the pools while most candidates collide
+        if self.exhausted:
+            return False
+        idle = 0
+        while idle < self.patience:
+            candidates = self.lang.genNames(self.batch, self.min_word, self.max_word)
+            prints = fingerprints(candidates)
+            (unique, first) = np.unique(prints, return_index=True)
+            new = ~self.__find(unique)
+            self.__index = np.insert(self.__index, np.searchsorted(self.__index, unique[new]), unique[new])
+            fresh = [candidates[i] for i in np.sort(first[new])]
+            if len(fresh) < (1 - self.grow_at) * len(candidates):
+                lang = self.lang
+                lang.extendPool('generic', len(lang.generic_morpheme_pool))
+                lang.extendPool('city', len(lang.city_morpheme_pool))
+            if fresh:
+                self.__ready.extend(fresh)
+                return True
+            idle += 1
+        self.exhausted = True
+        return False
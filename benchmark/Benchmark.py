@@ -0,0 +1,281 @@
+""" BENCHMARK MODULE
+# Description:
+    This is the reproducible benchmark suite of the grid maps and PathFinding.
+    Map construction, single queries, batched queries and failed queries are timed over grid
+    sizes, obstacle densities, cost distributions and both topologies. Throughput, latency
+    percentiles, expanded vertices and peak memory are written as JSON, and a run can be checked
+    against a stored baseline, failing when a metric regressed beyond a threshold.
+    Usage:
+        python benchmark/Benchmark.py --quick --output run.json
+        python benchmark/Benchmark.py --quick --baseline run.json --threshold 0.25
+# Dependencies: Networkx, Numpy
+# Author: agent
+# Date: 2026/10/18
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import zlib
+import numpy as np
+
+root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.append(root)
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.PathFinding import PathFinding
+from algorithms.graph.Reachability import Reachability
+
+SIZES = (64, 256, 1024, 4096)
+DENSITIES = (0.0, 0.2, 0.35)
+COSTS = ('uniform', 'random')
+TOPOLOGIES = ('bounded', 'boundless')
+ALGORITHMS = ('a-star', 'bi-a-star')
+# A short run for every commit, the full matrix above takes hours at 4096
+QUICK = {'sizes': (64, 256), 'densities': (0.0, 0.2), 'costs': COSTS, 'topologies': TOPOLOGIES,
+         'algorithms': ALGORITHMS}
+# Metrics where a larger value is an improvement, every other metric should not grow
+HIGHER_IS_BETTER = ('throughput',)
+
+def make_map(size, density, costs, mtype, seed=0):
+    """ Make Map
+    Parameters
+    ----------
+    size: int
+        Width and height of the gridMap.
+    density: float
+        Share of blocked grids, scattered uniformly.
+    costs: string
+        'uniform' (every cost 1) or 'random' (integer costs from 1 to 5).
+    mtype: string
+        'bounded' or 'boundless'.
+    seed: int, optional
+        Seed of the obstacles and costs.
+    """
+    rng = np.random.RandomState(seed)
+    graph = gridMap(size, size, mtype)
+    if costs == 'random':
+        graph.setRegion('cost', rng.randint(1, 6, size=(size, size)).astype(np.float64))
+    elif costs != 'uniform':
+        raise ValueError('- cost distribution not supported -')
+    if density > 0:
+        graph.setRegion('cost', float('inf'), mask=rng.random_sample((size, size)) < density)
+    return graph
+
+def make_pairs(graph, count, seed=0, connected=True):
+    """ Random (start, goal) pairs of open grids, in the same component or not. """
+    rng = np.random.RandomState(seed)
+    reach = Reachability(graph)
+    opened = np.argwhere(np.isfinite(graph.cost))
+    pairs = []
+    for _ in range(count * 100):
+        if len(pairs) == count or opened.size == 0:
+            break
+        (start, goal) = (tuple(int(v) for v in opened[i]) for i in rng.randint(len(opened), size=2))
+        if start != goal and reach.connected(start, goal) == connected:
+            pairs.append((start, goal))
+    return pairs
+
+def seal(graph, goals):
+    """ Wall in the goals with their 8 neighbors, so they cannot be reached. """
+    for (x, y) in goals:
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx or dy:
+                    (nx, ny) = ((x + dx) % graph.width, (y + dy) % graph.height)
+                    graph.setCost(None, (nx, ny), float('inf'))
+    return graph
+
+def peak_memory(function, *args):
+    """ Peak bytes allocated by Python and numpy while calling the function, and its result. """
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return (peak, result)
+
+def time_queries(finder, pairs, budget):
+    """ Query the pairs one by one until the budget (seconds) runs out, at least one is timed. """
+    latency = []
+    expanded = []
+    for (start, goal) in pairs:
+        finder.expanded = 0
+        begin = time.perf_counter()
+        finder.get_path(start, goal)
+        latency.append(time.perf_counter() - begin)
+        expanded.append(finder.expanded)
+        if sum(latency) > budget:
+            break
+    (p50, p90, p99) = np.percentile(latency, [50, 90, 99]) * 1000
+    return {'queries': len(latency), 'throughput': len(latency) / sum(latency), 'p50_ms': p50,
+            'p90_ms': p90, 'p99_ms': p99, 'expanded_mean': float(np.mean(expanded))}
+
+def run(sizes=SIZES, densities=DENSITIES, costs=COSTS, topologies=TOPOLOGIES, algorithms=ALGORITHMS,
+        queries=50, budget=10.0, processes=2, gridmap_limit=1024, exhaustive_limit=256, seed=0, log=None):
+    """ Run Benchmarks
+    Parameters
+    ----------
+    sizes, densities, costs, topologies, algorithms: tuple, optional
+        The matrix of maps and algorithms to be measured.
+    queries: int, optional
+        Number of (start, goal) pairs drawn per map.
+    budget: float, optional
+        Seconds spent on the single queries of a case, the batch repeats as many pairs.
+    processes: int, optional
+        Worker processes of the batched queries.
+    gridmap_limit: int, optional
+        Largest size of the GridMap (networkx) constructions.
+    exhaustive_limit: int, optional
+        Largest size where failed queries are also searched without the reachability index,
+        until every reachable grid is expanded.
+    seed: int, optional
+        Seed of the maps and pairs, each case is seeded by its name so runs are comparable.
+    log: file, optional
+        Where the progress is printed.
+
+    Returns
+    -------
+    result: dict
+        {'meta': {...}, 'cases': {name: {metric: value}}}, as written to JSON.
+    """
+    cases = {}
+
+    def report(name, metrics):
+        cases[name] = metrics
+        if log is not None:
+            print(name, ' '.join('{}={:.4g}'.format(k, v) for (k, v) in sorted(metrics.items())), file=log, flush=True)
+
+    for size in sizes:
+        for mode in ('implicit', 'edges'):
+            if size <= gridmap_limit:
+                begin = time.perf_counter()
+                GridMap(size, size, implicit=(mode == 'implicit'))
+                seconds = time.perf_counter() - begin
+                peak = peak_memory(GridMap, size, size, 'bounded', mode == 'implicit')[0]
+                report('construct/GridMap/{}/{}'.format(size, mode), {'seconds': seconds, 'peak_bytes': peak})
+
+        for density in densities:
+            for cost in costs:
+                for mtype in topologies:
+                    case = '{}/{}/{}/{}'.format(size, density, cost, mtype)
+                    local = (seed ^ zlib.crc32(case.encode())) % 2 ** 31
+                    begin = time.perf_counter()
+                    graph = make_map(size, density, cost, mtype, local)
+                    seconds = time.perf_counter() - begin
+                    peak = peak_memory(make_map, size, density, cost, mtype, local)[0]
+                    report('construct/gridMap/' + case, {'seconds': seconds, 'peak_bytes': peak})
+
+                    pairs = make_pairs(graph, queries, local)
+                    failed = make_pairs(graph, queries, local, connected=False)
+                    if len(failed) < queries:
+                        # Few or no separate components, wall in some goals instead
+                        extra = make_pairs(graph, queries - len(failed), local + 1)
+                        failed += extra
+                        seal(graph, [goal for (_, goal) in extra])
+                        reach = Reachability(graph)
+                        pairs = [(s, g) for (s, g) in pairs if reach.connected(s, g)]
+                    for algorithm in algorithms:
+                        finder = PathFinding(graph, algorithm)
+                        if pairs:
+                            # The first query also builds the flat grid and the reachability index
+                            finder.get_path(*pairs[0])
+                            metrics = time_queries(finder, pairs, budget)
+                            metrics['peak_bytes'] = peak_memory(finder.get_path, *pairs[0])[0]
+                            report('query/{}/{}'.format(algorithm, case), metrics)
+
+                            batch = pairs[:metrics['queries']]
+                            finder.get_paths(pairs[:2], processes)
+                            begin = time.perf_counter()
+                            finder.get_paths(batch, processes)
+                            seconds = time.perf_counter() - begin
+                            report('batch/{}/{}'.format(algorithm, case), {'queries': len(batch), 'seconds': seconds,
+                                                                          'throughput': len(batch) / seconds})
+                        if failed:
+                            metrics = time_queries(finder, failed, budget)
+                            metrics['peak_bytes'] = peak_memory(finder.get_path, *failed[0])[0]
+                            report('failed/{}/{}'.format(algorithm, case), metrics)
+                            if size <= exhaustive_limit:
+                                exhaustive = PathFinding(graph, algorithm, reachability=False)
+                                metrics = time_queries(exhaustive, failed, budget)
+                                report('exhaustive/{}/{}'.format(algorithm, case), metrics)
+                        finder.close()
+
+    meta = {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'processor': platform.processor(), 'seed': seed, 'queries': queries, 'budget': budget,
+            'processes': processes, 'time': time.strftime('%Y-%m-%dT%H:%M:%S')}
+    return {'meta': meta, 'cases': cases}
+
+def compare(result, baseline, threshold=0.2):
+    """ Compare Runs
+        Every metric of the cases found in both runs is compared, except the number of queries
+        timed: throughput falling or any other metric growing by more than the threshold
+        (relative) is a regression.
+
+    Returns
+    -------
+    regressions: list
+        (case, metric, baseline value, new value) of each regressed metric.
+    """
+    regressions = []
+    for (name, metrics) in sorted(result['cases'].items()):
+        old = baseline['cases'].get(name)
+        if old is None:
+            continue
+        for (metric, value) in sorted(metrics.items()):
+            before = old.get(metric)
+            if before is None or metric == 'queries':
+                continue
+            if metric in HIGHER_IS_BETTER:
+                worse = value * (1 + threshold) < before
+            else:
+                worse = value > before * (1 + threshold)
+            if worse:
+                regressions.append((name, metric, before, value))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the grid maps and PathFinding.')
+    parser.add_argument('--quick', action='store_true', help='only the small maps, for every commit')
+    parser.add_argument('--sizes', type=int, nargs='+')
+    parser.add_argument('--densities', type=float, nargs='+')
+    parser.add_argument('--costs', nargs='+', choices=COSTS)
+    parser.add_argument('--topologies', nargs='+', choices=TOPOLOGIES)
+    parser.add_argument('--algorithms', nargs='+', choices=('a-star', 'bi-a-star', 'alt', 'jps'))
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--budget', type=float, default=10.0, help='seconds of single queries per case')
+    parser.add_argument('--processes', type=int, default=2)
+    parser.add_argument('--gridmap-limit', type=int, default=1024)
+    parser.add_argument('--exhaustive-limit', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON file the results are written to')
+    parser.add_argument('--baseline', help='JSON file of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='relative change counted as a regression')
+    args = parser.parse_args(argv)
+
+    matrix = dict(QUICK) if args.quick else {}
+    for key in ('sizes', 'densities', 'costs', 'topologies', 'algorithms'):
+        if getattr(args, key) is not None:
+            matrix[key] = tuple(getattr(args, key))
+    result = run(queries=args.queries, budget=args.budget, processes=args.processes,
+                 gridmap_limit=args.gridmap_limit, exhaustive_limit=args.exhaustive_limit, seed=args.seed, log=sys.stderr, **matrix)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+    else:
+        json.dump(result, sys.stdout, indent=2, sort_keys=True)
+        print()
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        for (name, metric, before, value) in regressions:
+            print('REGRESSION {} {}: {:.4g} -> {:.4g}'.format(name, metric, before, value), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+""" UNIT TEST ON BENCHMARK MODULE
+# Description:
+    This is the unit test for benchmark module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from benchmark.Benchmark import make_map, make_pairs, run, compare, main
+
+class Test(unittest.TestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        self.options = {'sizes': (16,), 'densities': (0.2,), 'costs': ('random',), 'topologies': ('boundless',),
+                        'algorithms': ('a-star',), 'queries': 4, 'budget': 1.0, 'processes': 1}
+
+    def testRun(self):
+        g = make_map(16, 0.2, 'random', 'bounded', seed=3)
+        self.assertTrue(np.array_equal(g.cost, make_map(16, 0.2, 'random', 'bounded', seed=3).cost))
+        self.assertEqual(len(make_pairs(g, 5, seed=3)), 5)
+
+        result = run(**self.options)
+        names = sorted(result['cases'])
+        self.assertEqual([name.split('/')[0] for name in names],
+                         ['batch', 'construct', 'construct', 'construct', 'exhaustive', 'failed', 'query'])
+        query = result['cases']['query/a-star/16/0.2/random/boundless']
+        self.assertTrue(query['p50_ms'] <= query['p90_ms'] <= query['p99_ms'])
+        self.assertGreater(query['expanded_mean'], 0)
+        self.assertGreater(query['peak_bytes'], 0)
+        json.dumps(result)
+
+    def testCompare(self):
+        baseline = {'cases': {'query/a': {'throughput': 100, 'p50_ms': 2.0, 'queries': 50},
+                              'query/b': {'throughput': 100, 'peak_bytes': 1000}}}
+        result = {'cases': {'query/a': {'throughput': 90, 'p50_ms': 3.0, 'queries': 10},
+                            'query/b': {'throughput': 130, 'peak_bytes': 1100},
+                            'query/c': {'throughput': 1}}}
+        self.assertEqual(compare(result, baseline), [('query/a', 'p50_ms', 2.0, 3.0)])
+        self.assertEqual(compare(result, baseline, 0.1), [('query/a', 'p50_ms', 2.0, 3.0), ('query/a', 'throughput', 100, 90)])
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'baseline.json')
+            with open(path, 'w') as f:
+                json.dump({'cases': {'construct/gridMap/16/0.2/random/boundless': {'seconds': 0}}}, f)
+            argv = ['--sizes', '16', '--densities', '0.2', '--costs', 'random', '--topologies', 'boundless',
+                    '--algorithms', 'a-star', '--queries', '2', '--processes', '1', '--output', os.path.join(folder, 'run.json')]
+            self.assertEqual(main(argv + ['--baseline', path]), 1)
+            with open(os.path.join(folder, 'run.json')) as f:
+                self.assertIn('query/a-star/16/0.2/random/boundless', json.load(f)['cases'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+""" UNIT TEST ON CHUNKED GRID MODULE
+# Description:
+    This is the unit test for chunked grid module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import unittest
+import numpy as np
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.graph.ChunkedGrid import ChunkedGrid
+from algorithms.graph.GridMap import gridMap
+from algorithms.graph.PathFinding import PathFinding
+
+def wall(x0, y0, width, height):
+    # A wall along x = 5 with a gap at y = 9
+    cost = np.ones((width, height))
+    x = np.arange(x0, x0 + width)[:, None]
+    y = np.arange(y0, y0 + height)[None, :]
+    cost[(x == 5) & (y != 9)] = float('inf')
+    return cost
+
+class Test(unittest.TestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        self.g = gridMap(12, 10)
+        self.g.cost[5, :9] = float('inf')
+
+    def testChunkedGrid(self):
+        c = ChunkedGrid(12, 10, chunk=4, generator=wall)
+        self.assertEqual(c.chunk_info()['resident'], 0)
+        self.assertEqual(c.getCost(None, (5, 0)), float('inf'))
+        self.assertEqual(c.getCost(None, (5, 9)), 1)
+        self.assertEqual(c.getSight((11, 9)), 1)
+        self.assertEqual(c.neighbors((0, 0)), self.g.neighbors((0, 0)))
+        self.assertEqual(c.chunk_info()['created'], 3)
+
+        p = PathFinding(c)
+        self.assertEqual(p.get_path((0, 0), (11, 0)), PathFinding(self.g).get_path((0, 0), (11, 0)))
+        self.assertRaises(IndexError, c.getCost, None, (12, 0))
+
+    def testEviction(self):
+        store = {}
+        # Two chunks of 4 x 4 grids fit into the memory cap
+        c = ChunkedGrid(12, 10, chunk=4, generator=wall, store=store, max_memory=2 * 16 * 24)
+        self.assertEqual(c.max_chunks, 2)
+        c.setCost(None, (0, 0), 7)
+        c.setVision((1, 1), 3)
+        c.getCost(None, (4, 0))
+        self.assertEqual(c.chunk_info()['dirty'], 1)
+        c.getCost(None, (8, 0))
+        info = c.chunk_info()
+        self.assertEqual((info['resident'], info['evictions'], info['writebacks']), (2, 1, 1))
+        self.assertIn('0,0', store)
+        # The modified chunk is read back from the store, not generated again
+        self.assertEqual(c.getCost(None, (0, 0)), 7)
+        self.assertEqual(c.getVision((1, 1)), 3)
+        self.assertEqual(c.chunk_info()['loaded'], 1)
+
+        # Without a store the modified chunks stay in memory
+        c = ChunkedGrid(12, 10, chunk=4, generator=wall, max_memory=1)
+        c.setCost(None, (0, 0), 7)
+        for x in range(0, 12, 4):
+            c.getCost(None, (x, 4))
+        self.assertEqual(c.getCost(None, (0, 0)), 7)
+        self.assertEqual(c.chunk_info()['created'], 4)
+
+    def testBoundless(self):
+        c = ChunkedGrid(10, 7, mtype='boundless', chunk=4)
+        g = gridMap(10, 7, mtype='boundless')
+        for node in [(0, 0), (9, 6), (4, 3), (3, 6)]:
+            self.assertEqual(c.neighbors(node), g.neighbors(node))
+        c.setCost(None, (-1, -1), 5)
+        self.assertEqual(c.getCost(None, (9, 6)), 5)
+        self.assertEqual(c.changes[-1], (1, (9, 6, 10, 7), False))
+        g.setCost(None, (9, 6), 5)
+        self.assertEqual(PathFinding(c).get_path((1, 3), (8, 6)), PathFinding(g).get_path((1, 3), (8, 6)))
+
+    def testPathCache(self):
+        c = ChunkedGrid(12, 10, chunk=4, generator=wall, store={})
+        p = PathFinding(c, cache_size=8)
+        path = p.get_path((0, 0), (11, 0))
+        self.assertEqual(p.get_path((0, 0), (11, 0)), path)
+        c.setCost(None, (5, 0), 1)
+        self.assertEqual(len(p.get_path((0, 0), (11, 0))), 12)
+        self.assertEqual(p.cache_info()['invalidations'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
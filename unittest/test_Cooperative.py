@@ -0,0 +1,98 @@
+""" UNIT TEST ON COOPERATIVE PATHFINDING MODULE
+# Description:
+    This is the unit test for cooperative pathfinding module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import unittest
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.FlowField import FlowField
+from algorithms.graph.Cooperative import CooperativePlanner
+
+class Test(unittest.TestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        # Rooms joined by a corridor one grid wide
+        self.g = gridMap(15, 7)
+        self.g.setRegion('cost', float('inf'), rect=(5, 0, 10, 3))
+        self.g.setRegion('cost', float('inf'), rect=(5, 4, 10, 7))
+
+    def run_agents(self, planner, agents, ticks):
+        (w, h) = (planner.graph.width, planner.graph.height)
+        previous = {a: planner.position(a) for a in agents}
+        for _ in range(ticks):
+            positions = planner.tick()
+            cells = list(positions.values())
+            self.assertEqual(len(set(cells)), len(cells))
+            for a in agents:
+                for b in agents:
+                    if a != b:
+                        self.assertFalse(positions[a] == previous[b] and positions[b] == previous[a] and positions[a] != previous[a])
+                dx = (positions[a][0] - previous[a][0]) % w
+                dy = (positions[a][1] - previous[a][1]) % h
+                self.assertTrue(min(dx, w - dx) <= 1 and min(dy, h - dy) <= 1)
+            previous = positions
+            if all(planner.arrived(a) for a in agents):
+                break
+        return agents
+
+    def testCorridor(self):
+        p = CooperativePlanner(self.g, window=8)
+        left = [p.add_agent((1, y), (13, y)) for y in range(1, 6)]
+        right = [p.add_agent((13, y), (1, y)) for y in range(1, 6)]
+        self.run_agents(p, left + right, 200)
+        for a in left + right:
+            self.assertTrue(p.arrived(a))
+        self.assertEqual(p.position(left[0]), (13, 1))
+        self.assertEqual(p.position(right[4]), (1, 5))
+
+    def testDistance(self):
+        p = CooperativePlanner(self.g)
+        self.g.setRegion('cost', 3, rect=(0, 0, 3, 4))
+        exact = FlowField(self.g, [(14, 6)])
+        for node in [(0, 0), (2, 5), (7, 3), (12, 1), (6, 1)]:
+            self.assertEqual(p.distance(node, (14, 6)), exact.get_distance(node))
+
+    def testRolling(self):
+        # Agents added together plan on their own phase, a quarter of them each tick with a window of 8
+        p = CooperativePlanner(gridMap(20, 20), window=8)
+        agents = [p.add_agent((0, 2 * a), (19, 2 * a)) for a in range(8)]
+        for t in range(4):
+            p.tick()
+            self.assertEqual([a for a in agents if p.position(a) != (0, 2 * a)], [a for a in agents if a % 4 <= t])
+        
+    def testBudget(self):
+        # Starved reverse searches fall back to the lower bound and catch up on later ticks
+        p = CooperativePlanner(self.g, window=8, budget=5)
+        left = [p.add_agent((1, y), (13, y)) for y in (1, 5)]
+        self.run_agents(p, left, 100)
+        self.assertTrue(all(p.arrived(a) for a in left))
+        self.assertEqual(p.distance((0, 0), (14, 6)), FlowField(self.g, [(14, 6)]).get_distance((0, 0)))
+
+    def testPlanner(self):
+        self.assertRaises(ValueError, CooperativePlanner, self.g, 1)
+        G = GridMap(6, 4, 'boundless')
+        G.remove_node((3, 1))
+        p = CooperativePlanner(G, window=4)
+        a = p.add_agent((1, 1), (5, 1))
+        b = p.add_agent((5, 1), (1, 1))
+        self.run_agents(p, [a, b], 20)
+        self.assertTrue(p.arrived(a) and p.arrived(b))
+        # Unreachable goals keep the agent in place, new goals are planned on the next tick
+        c = p.add_agent((0, 3), (3, 1))
+        p.tick()
+        self.assertEqual(p.position(c), (0, 3))
+        p.set_goal(c, (2, 3))
+        self.run_agents(p, [a, b, c], 10)
+        self.assertEqual(p.position(c), (2, 3))
+        p.remove_agent(a)
+        self.assertEqual(len(p.tick()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
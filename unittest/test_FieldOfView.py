@@ -0,0 +1,65 @@
+""" UNIT TEST ON FIELD OF VIEW MODULE
+# Description:
+    This is the unit test for field of view module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import unittest
+import numpy as np
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.FieldOfView import FieldOfView
+
+class Test(unittest.TestCase):
+    
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        self.g = gridMap(9, 9)
+        self.g.setRegion('sight', 0, rect=(4, 2, 5, 7))
+        
+    def testFieldOfView(self):
+        fov = set(FieldOfView(self.g, 4).get_fov((2, 4)))
+        self.assertIn((4, 4), fov)
+        self.assertIn((3, 1), fov)
+        self.assertNotIn((5, 4), fov)
+        self.assertNotIn((6, 3), fov)
+        self.assertNotIn((2, 0), set(FieldOfView(self.g, 3).get_fov((2, 4))))
+        # Floor visibility is symmetric
+        f = FieldOfView(self.g, 6)
+        for (x, y) in f.get_fov((3, 6)):
+            if self.g.getSight((x, y)) > 0:
+                self.assertIn((3, 6), f.get_fov((x, y)))
+    
+    def testVision(self):
+        f = FieldOfView(self.g, 5)
+        observers = [(0, 0), (2, 4), (2, 4), (7, 5), (8, 8)]
+        expected = np.zeros((9, 9), dtype=int)
+        for observer in observers:
+            for (x, y) in f.get_fov(observer):
+                expected[x, y] += 1
+        self.assertTrue(np.array_equal(f.update_vision(observers), expected))
+        self.assertEqual(self.g.getVision((2, 4)), 3)
+        f.update_vision(observers, accumulate=True)
+        self.assertTrue(np.array_equal(self.g.vision, expected * 2))
+        
+        g = GridMap(9, 9)
+        for y in range(2, 7):
+            g.remove_node((4, y))
+        FieldOfView(g, 5).update_vision(observers)
+        self.assertEqual(g.getVision((6, 4)), expected[6, 4])
+        self.assertEqual(g.getVision((3, 3)), expected[3, 3])
+    
+    def testBoundless(self):
+        g = gridMap(5, 5, 'boundless')
+        g.setSight((1, 2), 0)
+        fov = FieldOfView(g, 4).get_fov((2, 2))
+        self.assertEqual(len(fov), len(set(fov)))
+        self.assertIn((4, 2), fov)
+        self.assertEqual(FieldOfView(g, 4).update_vision([(2, 2)]).sum(), len(fov))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=1)
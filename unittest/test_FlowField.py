@@ -0,0 +1,51 @@
+""" UNIT TEST ON FLOW FIELD MODULE
+# Description:
+    This is the unit test for flow field module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import unittest
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.FlowField import FlowField
+
+class Test(unittest.TestCase):
+    
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        self.g = GridMap(3, 3)
+        self.g.remove_node((1,1))
+        
+    def testFlowField(self):
+        f = FlowField(self.g, [(2, 2)])
+        self.assertEqual(f.get_distance((0, 0)), 3)
+        self.assertEqual(f.get_distance((1, 1)), float('inf'))
+        self.assertIsNone(f.get_next((2, 2)))
+        node = (0, 0)
+        for i in range(3):
+            node = f.get_next(node)
+        self.assertEqual(node, (2, 2))
+    
+    def testBoundless(self):
+        g = gridMap(6, 3, 'boundless')
+        f = FlowField(g, [(0, 1)])
+        self.assertEqual(f.get_direction((5, 1)), (1, 0))
+        self.assertEqual(f.get_next((5, 1)), (0, 1))
+    
+    def testUpdate(self):
+        g = gridMap(8, 8)
+        f = FlowField(g, [(7, 7), (0, 7)])
+        g.setRegion('cost', float('inf'), rect=(0, 6, 8, 7))
+        f.update((0, 6, 8, 7))
+        self.assertEqual(f.get_distance((3, 3)), float('inf'))
+        g.setCost(None, (5, 6), 1)
+        f.update((5, 6, 6, 7))
+        self.assertEqual(f.get_distance((3, 3)), FlowField(g, [(7, 7), (0, 7)]).get_distance((3, 3)))
+        self.assertEqual(f.get_next((5, 5)), (5, 6))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=1)  
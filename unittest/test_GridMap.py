@@ -7,10 +7,12 @@
 import os
 import sys
 import unittest
+import numpy as np
 
 root = os.path.join(os.path.dirname(__file__), '..')
 sys.path.append(root)
 from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.FlatGrid import FlatGrid
 
 class Test(unittest.TestCase):
     
@@ -24,10 +26,89 @@ class Test(unittest.TestCase):
         self.assertSetEqual(set(self.g1.neighbors((1,0))), set([(0, 0), (0, 1), (1, 1), (2, 0), (2, 1)]))
         self.assertSetEqual(set(self.g1.neighbors((3,3))), set([(3, 2), (2, 2), (2, 3)]))
     
+    def testImplicit(self):
+        g = GridMap(4, 4, implicit=True)
+        for n in [(1, 1), (1, 0), (3, 3), (0, 0)]:
+            self.assertEqual(set(g.neighbors(n)), set(self.g1.neighbors(n)))
+        self.assertEqual(sorted(map(sorted, self.g1.E)), sorted(map(sorted, GridMap(4, 4).E)))
+        g.remove_node((2, 2))
+        self.assertNotIn((2, 2), g.neighbors((1, 1)))
+        self.assertFalse(g.has_edge((1, 1), (2, 2)))
+        self.assertTrue(g.has_edge((1, 1), (1, 2)))
+        self.assertRaises(ValueError, g.add_edge, (0, 0), (1, 1))
+        g = GridMap(3, 3, 'boundless', implicit=True)
+        self.assertEqual(len(g.neighbors((0, 0))), 8)
+        self.assertIn((2, 2), g.neighbors((0, 0)))
+    
     def testgridMap(self):
         self.assertSetEqual(set(self.g2.neighbors((1,1))), set([(0, 0), (0, 1), (0, 2), (1, 0), (2, 0), (2, 1), (1, 2), (2, 2)]))
         self.assertSetEqual(set(self.g2.neighbors((1,0))), set([(0, 0), (0, 1), (1, 1), (2, 0), (2, 1)]))
         self.assertSetEqual(set(self.g2.neighbors((3,3))), set([(3, 2), (2, 2), (2, 3)]))
+    
+    def testgridMapRegion(self):
+        g = gridMap(4, 4)
+        g.setRegion('cost', 5, rect=(1, 1, 3, 3))
+        self.assertEqual(g.getCost((0, 0), (2, 2)), 5)
+        self.assertEqual(g.getCost((0, 0), (3, 3)), 1)
+        g.setRegion('sight', 0, mask=np.eye(4, dtype=bool))
+        self.assertEqual(g.getSight((1, 1)), 0)
+        self.assertEqual(g.getSight((1, 2)), 1)
+        g.setRegion('vision', np.arange(16).reshape(4, 4))
+        g.setVision((0, 0), 7)
+        self.assertEqual(g.getVision((0, 0)), 7)
+        self.assertEqual(g.getVision((3, 2)), 14)
+        # Fractional values are kept, as in the grids of GridMap
+        g.setVision((1, 0), 0.25)
+        g.setRegion('vision', 2.5, rect=(2, 2, 3, 3))
+        self.assertEqual((g.getVision((1, 0)), g.getVision((2, 2))), (0.25, 2.5))
+        # The former dictionary of each grid is still readable
+        self.assertEqual(g.grid.shape, (4, 4))
+        self.assertEqual(g.grid[2, 2], {'cost': 5, 'sight': 0, 'vision': 2.5})
+        with self.assertRaises(TypeError):
+            g.grid[2, 2] = {'cost': 1, 'sight': 1, 'vision': 0}
+    
+    def testChangeLog(self):
+        self.g1.remove_node((1, 2))
+        self.assertEqual(self.g1.changes[-1], (self.g1.version, (1, 2, 2, 3), False))
+        self.g1.add_edges_from([((0, 0), (3, 3))])
+        self.assertEqual(self.g1.changes[-1][1:], ((0, 0, 4, 4), True))
+        self.g2.setCost(None, (2, 1), 3)
+        self.g2.setCost(None, (2, 1), 2)
+        self.assertEqual([c[1:] for c in self.g2.changes], [((2, 1, 3, 2), False), ((2, 1, 3, 2), True)])
+        self.g2.setRegion('cost', 9, rect=(0, 0, 2, 4))
+        self.assertEqual(self.g2.changes[-1], (3, (0, 0, 2, 4), False))
+
+    def testSnapshotUpdate(self):
+        g = gridMap(6, 5)
+        g.setRegion('cost', 2)
+        grid = FlatGrid(g)
+        g.setCost(None, (1, 1), 1)
+        g.setRegion('cost', float('inf'), rect=(3, 0, 4, 5))
+        g.setRegion('cost', 3, rect=(0, 3, 2, 5), mask=np.eye(2, dtype=bool))
+        self.assertTrue(grid.update(g))
+        fresh = FlatGrid(g)
+        self.assertEqual((grid.cost, grid.min_cost, grid.version), (fresh.cost, fresh.min_cost, fresh.version))
+        # The only cheapest grid got dearer
+        g.setCost(None, (1, 1), 4)
+        self.assertTrue(grid.update(g))
+        self.assertEqual((grid.cost, grid.min_cost), (FlatGrid(g).cost, 2))
+        
+        G = GridMap(4, 4)
+        grid = FlatGrid(G)
+        G.setCost(None, (2, 2), 5)
+        G.remove_node((1, 1))
+        self.assertTrue(grid.update(G))
+        self.assertEqual(grid.cost, FlatGrid(G).cost)
+        # A vertice added back without its edges is not a grid anymore
+        G.add_node((1, 1), cost=1)
+        self.assertFalse(grid.update(G))
+        self.assertFalse(FlatGrid(G).exact)
+        # Edits older than the change log are not replayed
+        g = gridMap(4, 4)
+        grid = FlatGrid(g)
+        for i in range(len(g.changes) + g.changes.maxlen + 1):
+            g.setCost(None, (0, 0), 1)
+        self.assertFalse(grid.update(g))
 
 if __name__ == '__main__':
     unittest.main(verbosity=1)  
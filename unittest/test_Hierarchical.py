@@ -0,0 +1,63 @@
+""" UNIT TEST ON HIERARCHICAL PATHFINDING MODULE
+# Description:
+    This is the unit test for hierarchical path finding module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import unittest
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.Hierarchical import HierarchicalPathFinding
+
+class Test(unittest.TestCase):
+    
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        self.g = gridMap(12, 12)
+        self.g.setRegion('cost', float('inf'), rect=(6, 0, 7, 10))
+        
+    def testHierarchical(self):
+        h = HierarchicalPathFinding(self.g, cluster_size=4)
+        path = h.get_path((0, 0), (11, 0))
+        self.assertEqual(path[0], (0, 0))
+        self.assertEqual(path[-1], (11, 0))
+        self.assertTrue(all(n[1] >= 10 for n in path if n[0] == 6))
+        for (a, b) in zip(path, path[1:]):
+            self.assertIn(b, self.g.neighbors(a))
+        self.assertEqual(h.get_path((3, 3), (3, 3)), [(3, 3)])
+    
+    def testUpdate(self):
+        h = HierarchicalPathFinding(self.g, cluster_size=4)
+        self.assertIsNotNone(h.get_path((0, 0), (11, 0)))
+        self.g.setRegion('cost', float('inf'), rect=(6, 10, 7, 12))
+        self.assertIsNone(h.get_path((0, 0), (11, 0)))
+        # Edits are picked up by the queries, the paths match a planner built on the edited map
+        g = gridMap(32, 32)
+        h = HierarchicalPathFinding(g, cluster_size=8)
+        self.assertIsNotNone(h.get_path((0, 5), (31, 5)))
+        for y in range(32):
+            g.setCost(None, (16, y), float('inf'))
+        self.assertIsNone(h.get_path((0, 5), (31, 5)))
+        g.setCost(None, (16, 20), 1)
+        g.setRegion('cost', 4, rect=(2, 2, 6, 30))
+        path = h.get_path((0, 5), (31, 5))
+        self.assertIn((16, 20), path)
+        self.assertEqual(path, HierarchicalPathFinding(g, cluster_size=8).get_path((0, 5), (31, 5)))
+        G = GridMap(8, 8)
+        h = HierarchicalPathFinding(G, cluster_size=3)
+        G.remove_nodes_from([(4, y) for y in range(7)])
+        self.assertIn((4, 7), h.get_path((0, 0), (7, 0)))
+    
+    def testGridMap(self):
+        g = GridMap(8, 8, 'boundless')
+        g.remove_nodes_from([(3, y) for y in range(8)])
+        h = HierarchicalPathFinding(g, cluster_size=3)
+        path = h.get_path((2, 4), (4, 4))
+        self.assertEqual(len(path), 7)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=1)  
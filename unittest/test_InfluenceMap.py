@@ -0,0 +1,86 @@
+""" UNIT TEST ON INFLUENCE MAP MODULE
+# Description:
+    This is the unit test for influence map module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import unittest
+import numpy as np
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.FlowField import FlowField
+from algorithms.graph.InfluenceMap import InfluenceMap
+
+class Test(unittest.TestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        # A wall with a gap and a swamp
+        self.g = gridMap(16, 10)
+        self.g.setRegion('cost', float('inf'), rect=(8, 0, 9, 7))
+        self.g.setRegion('cost', 3, rect=(2, 6, 6, 10))
+
+    def expected(self, graph, sources, decay, radius):
+        # Walking from s to v costs the flow from v to s, plus cost(v), minus cost(s)
+        total = np.zeros((graph.width, graph.height))
+        for (node, strength) in sources:
+            d = FlowField(graph, [node]).distance
+            with np.errstate(invalid='ignore'):
+                d = d + graph.cost - graph.cost[node]
+            d[~np.isfinite(d)] = np.inf
+            total += np.where(d <= radius, strength * decay ** np.where(np.isfinite(d), d, 0), 0)
+        return total
+
+    def testSpread(self):
+        m = InfluenceMap(self.g, decay=0.8, radius=10)
+        a = m.add_source((3, 3), 2.0)
+        m.add_source((12, 2), -1.0)
+        m.update()
+        self.assertTrue(np.allclose(m.values, self.expected(self.g, [((3, 3), 2.0), ((12, 2), -1.0)], 0.8, 10)))
+        self.assertEqual(m.get_influence((8, 3)), 0)
+        # The wall is walked around: (9, 3) is 9 steps from (3, 3), not 6
+        self.assertAlmostEqual(m.get_influence((9, 3)), 2.0 * 0.8 ** 9 - 0.8 ** 3)
+
+        # Moves, strength changes and removals
+        m.move_source(a, (10, 8))
+        m.set_strength(a, 0.5)
+        m.update()
+        self.assertTrue(np.allclose(m.values, self.expected(self.g, [((10, 8), 0.5), ((12, 2), -1.0)], 0.8, 10)))
+        for source in [a, 1]:
+            m.remove_source(source)
+        self.assertFalse(m.values.any())
+
+    def testMapEdits(self):
+        m = InfluenceMap(self.g, decay=0.5, radius=6)
+        sources = [((1, 1), 1.0), ((14, 8), 1.0), ((9, 8), 3.0)]
+        for (node, strength) in sources:
+            m.add_source(node, strength)
+        m.update()
+        self.g.setRegion('cost', float('inf'), rect=(8, 7, 9, 10))
+        self.g.setCost(None, (8, 2), 1)
+        m.update()
+        self.assertTrue(np.allclose(m.values, self.expected(self.g, sources, 0.5, 6)))
+
+        # Boundless maps spread across the edges
+        g = gridMap(9, 7, 'boundless')
+        m = InfluenceMap(g, decay=0.5, radius=2)
+        m.add_source((0, 0))
+        m.update()
+        self.assertEqual(m.get_influence((8, 6)), 0.5)
+        self.assertEqual(m.get_influence((7, 0)), 0.25)
+        self.assertEqual(m.get_influence((4, 0)), 0)
+        G = GridMap(5, 5)
+        G.remove_node((1, 1))
+        m = InfluenceMap(G, decay=0.5, radius=3)
+        m.add_source((0, 0))
+        m.update()
+        self.assertEqual(m.get_influence((1, 1)), 0)
+        self.assertEqual(m.get_influence((2, 2)), 0.125)
+        self.assertRaises(ValueError, InfluenceMap, G, 0)
+
+if __name__ == '__main__':
+    unittest.main()
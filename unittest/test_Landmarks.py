@@ -0,0 +1,73 @@
+""" UNIT TEST ON LANDMARKS MODULE
+# Description:
+    This is the unit test for landmarks module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.FlowField import FlowField
+from algorithms.graph.Landmarks import Landmarks
+from algorithms.graph.PathFinding import PathFinding
+
+class Test(unittest.TestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        # Two walls to walk around and a few expensive grids
+        self.g = gridMap(20, 12)
+        self.g.setRegion('cost', float('inf'), rect=(6, 0, 7, 10))
+        self.g.setRegion('cost', float('inf'), rect=(13, 2, 14, 12))
+        self.g.setRegion('cost', 4, rect=(2, 3, 5, 9))
+
+    def testBound(self):
+        L = Landmarks(self.g, 4, seed=0)
+        self.assertEqual(len(L.landmarks), 4)
+        self.assertEqual(L.table.shape, (4, 240))
+        self.assertEqual(L.table.dtype, np.float32)
+        for goal in [(19, 0), (0, 11), (10, 5)]:
+            exact = FlowField(self.g, [goal]).distance
+            bound = np.array(L.bound(goal)).reshape(12, 20).T
+            opened = np.isfinite(exact)
+            self.assertTrue(np.all(bound[opened] <= exact[opened]))
+        # The walls are followed, unlike the Manhattan distance
+        self.assertGreater(L.bound((19, 0))[0], 19)
+
+    def testALT(self):
+        f = PathFinding(self.g, 'alt', landmarks=4)
+        for (start, goal) in [((0, 0), (19, 0)), ((19, 11), (0, 11)), ((3, 5), (16, 6))]:
+            path = f.get_path(start, goal)
+            optimal = PathFinding(self.g, 'bi-a-star').get_path(start, goal)
+            self.assertEqual(sum(self.g.getCost(None, n) for n in path[1:]), sum(self.g.getCost(None, n) for n in optimal[1:]))
+            self.assertTrue(len(path) <= f.expanded <= 240)
+        # Edits are picked up by computing the tables again
+        self.g.setRegion('cost', 1, rect=(6, 0, 7, 12))
+        self.assertEqual(len(f.get_path((0, 0), (19, 0))), 20)
+
+        G = GridMap(6, 4, 'boundless')
+        G.remove_node((3, 1))
+        self.assertEqual(len(PathFinding(G, 'alt').get_path((1, 1), (5, 1))), 3)
+
+    def testSave(self):
+        L = Landmarks(self.g, 3)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'map.alt.npz')
+            L.save(path)
+            loaded = Landmarks.load(path)
+        self.assertEqual(loaded.landmarks, L.landmarks)
+        self.assertEqual(loaded.bound((19, 0)), L.bound((19, 0)))
+        self.assertIsNone(loaded.version)
+        f = PathFinding(self.g, 'alt', landmarks=loaded)
+        f.get_path((0, 0), (19, 0))
+        self.assertEqual(loaded.version, self.g.version)
+        self.assertEqual(PathFinding(gridMap(20, 12), 'alt', landmarks=loaded).get_path((0, 0), (19, 0))[-1], (19, 0))
+
+if __name__ == '__main__':
+    unittest.main()
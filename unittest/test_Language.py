@@ -5,7 +5,9 @@
 # Date: 2017/06/09
 """
 import os
+import random
 import sys
+import tempfile
 import unittest
 
 root = os.path.join(os.path.dirname(__file__), '..')
@@ -14,6 +16,7 @@ sys.path.append(root)
 from algorithms.procedual_generation.Language import consonants, vowels,\
 sibilants, liquids, finals, structures, restrictions, consonant_orthography_set,\
 vowel_orthography_set
+from algorithms.procedual_generation import Language
 from algorithms.procedual_generation.Language import LangGen
 
 class Test(unittest.TestCase):
@@ -30,11 +33,122 @@ class Test(unittest.TestCase):
         consonant_orthography_type = list(consonant_orthography_set.keys())[0]
         vowel_orthography_type = list(vowel_orthography_set.keys())[0]
     
-        self.l = LangGen(consonant, vowel, sibilant, liquid, final, structure, restriction, consonant_orthography_type, vowel_orthography_type, random_seed=1)
+        self.style = (consonant, vowel, sibilant, liquid, final, structure, restriction, consonant_orthography_type, vowel_orthography_type)
+        self.l = LangGen(*self.style, random_seed=1)
         
     def testLangGen(self):
         name = self.l.genName(1,3)
-        self.assertEqual(name,'Lellel')
+        self.assertEqual(name,'Prosnrom Rikkrum')
+        
+    def testSeed(self):
+        # The same seed gives the same language and names, the module-level random is untouched
+        random.seed(5)
+        state = random.getstate()
+        names = [self.l.genName(1, 3) for i in range(20)]
+        self.assertEqual(random.getstate(), state)
+        l = LangGen(*self.style, random_seed=1)
+        self.assertEqual(l.generic_morpheme_pool, self.l.generic_morpheme_pool)
+        self.assertEqual([l.genName(1, 3) for i in range(20)], names)
+        self.assertGreater(len(set(names)), 10)
+        self.assertGreater(len(self.l.generic_morpheme_pool), 10)
+        
+        # Restrictions are met, without looping forever when they cannot be
+        l = LangGen('English-ish', 'Standard 5-vowel', 's ʃ', 'r l', 'm n', 'S?CL?VF', 'Double sounds and hard clusters', 'Default', 'Default', random_seed=2, generic_pool_size=200)
+        for morpheme in l.generic_morpheme_pool:
+            self.assertNotIn('rl', morpheme)
+            self.assertNotIn('ss', morpheme)
+        self.assertRaises(ValueError, LangGen, 'Minimal', 'Standard 5-vowel', 'Just s', 'Just l', 'm n', 'LLV', 'Double sounds and hard clusters', 'Default', 'Default')
+        
+    def testNames(self):
+        l = LangGen(*self.style, random_seed=3, city_pool_size=5)
+        names = l.genNames(500, 1, 4)
+        self.assertEqual(names, LangGen(*self.style, random_seed=3, city_pool_size=5).genNames(500, 1, 4))
+        self.assertNotEqual(names, l.genNames(500, 1, 4))
+        for name in names:
+            words = name.split(' ')
+            self.assertTrue(1 <= len(words) <= 4)
+            self.assertTrue(words[0][0].isupper())
+            # At most one connection word, never first or last
+            lower = [i for (i, word) in enumerate(words) if word in l.connection_morpheme_pool]
+            self.assertTrue(len(lower) <= 1 and all(0 < i < len(words) - 1 for i in lower))
+        self.assertEqual(len(set(len(name.split(' ')) for name in names)), 4)
+        
+        stream = l.iterNames(2, 2, batch=7)
+        self.assertEqual(len([next(stream) for i in range(20)]), 20)
+        self.assertEqual(len(list(l.iterNames(0, 0, 10, batch=3))), 10)
+        self.assertRaises(ValueError, l.genNames, 5, 3, 1)
+        
+    def testSharded(self):
+        names = LangGen(*self.style, random_seed=4).genNamesSharded(1000, 1, 3, shard_size=128)
+        self.assertEqual(len(names), 1000)
+        self.assertEqual(LangGen(*self.style, random_seed=4).genNamesSharded(1000, 1, 3, processes=2, shard_size=128), names)
+        self.assertNotEqual(LangGen(*self.style, random_seed=5).genNamesSharded(1000, 1, 3, shard_size=128), names)
+        
+        # Unique names across the shards, until the pools run out
+        l = LangGen(*self.style, random_seed=4, generic_pool_size=10, city_pool_size=2)
+        words = 2 * len(l.generic_morpheme_pool) * len(l.city_morpheme_pool)
+        names = l.genNamesSharded(1000, 1, 1, processes=2, shard_size=64, unique=True)
+        self.assertEqual(len(set(names)), len(names))
+        self.assertTrue(0 < len(names) <= words)
+        again = LangGen(*self.style, random_seed=4, generic_pool_size=10, city_pool_size=2)
+        self.assertEqual(again.genNamesSharded(1000, 1, 1, shard_size=64, unique=True), names)
+        again = LangGen(*self.style, random_seed=4, generic_pool_size=10, city_pool_size=2)
+        self.assertEqual(again.genNamesSharded(10, 1, 1, shard_size=64, unique=True), names[:10])
+        self.assertRaises(ValueError, l.genNamesSharded, 10, 1, 1, unique=True, patience=0)
+        
+    def testSnapshot(self):
+        l = LangGen(*self.style, random_seed=6, generic_pool_size=50)
+        l.genName(1, 3)
+        l.syllableCount()
+        data = l.snapshot()
+        self.assertEqual(data[:4], b'LANG')
+        r = LangGen.restore(data)
+        self.assertEqual(r.lang_style, l.lang_style)
+        self.assertEqual(r.argDict, l.argDict)
+        self.assertEqual(r.generic_morpheme_pool, l.generic_morpheme_pool)
+        self.assertEqual(r.syllableCount(), l.syllableCount())
+        # The generator goes on where the snapshot was made
+        self.assertEqual([r.genName(1, 3) for i in range(20)], [l.genName(1, 3) for i in range(20)])
+        self.assertEqual(r.genNames(200, 1, 4), l.genNames(200, 1, 4))
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'lang.snapshot')
+            l.save(path)
+            self.assertEqual(LangGen.load(path).genNames(50, 1, 3), l.genNames(50, 1, 3))
+        self.assertRaises(ValueError, LangGen.restore, b'GMAP' + data[4:])
+        self.assertRaises(ValueError, LangGen.restore, data[:-8])
+        
+    def testCached(self):
+        Language.clear_cache()
+        before = Language.cache_info()
+        l = LangGen.cached(*self.style, random_seed=1)
+        self.assertEqual(l.genName(1, 3), 'Prosnrom Rikkrum')
+        # A language of its own each time, as freshly built
+        l.extendPool('generic', 30)
+        c = LangGen.cached(*self.style, random_seed=1)
+        self.assertEqual(c.genName(1, 3), 'Prosnrom Rikkrum')
+        self.assertEqual(c.generic_morpheme_pool, self.l.generic_morpheme_pool)
+        self.assertEqual(LangGen.cached(*self.style, random_seed=1, generic_pool_size=20).genNames(100, 1, 3), LangGen(*self.style, random_seed=1).genNames(100, 1, 3))
+        info = Language.cache_info()
+        self.assertEqual((info['hits'] - before['hits'], info['misses'] - before['misses'], info['size']), (2, 1, 1))
+        
+        # Other arguments are other languages, unseeded ones are not cached
+        self.assertNotEqual(LangGen.cached(*self.style, random_seed=1, city_pool_size=5).city_morpheme_pool, c.city_morpheme_pool)
+        LangGen.cached(*self.style)
+        self.assertEqual(Language.cache_info()['size'], 2)
+        
+        # The least recently used are dropped
+        size = Language.CACHE_SIZE
+        Language.CACHE_SIZE = 2
+        try:
+            LangGen.cached(*self.style, random_seed=1)
+            LangGen.cached(*self.style, random_seed=2)
+            info = Language.cache_info()
+            self.assertEqual((info['size'], info['evictions'] - before['evictions']), (2, 1))
+            LangGen.cached(*self.style, random_seed=1)
+            self.assertEqual(Language.cache_info()['hits'], info['hits'] + 1)
+        finally:
+            Language.CACHE_SIZE = size
+            Language.clear_cache()
         
 if __name__ == '__main__':
     unittest.main(verbosity=1)  
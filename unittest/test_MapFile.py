@@ -0,0 +1,70 @@
+""" UNIT TEST ON MAP FILE MODULE
+# Description:
+    This is the unit test for map file module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.MapFile import save_map, load_map, flush_map
+from algorithms.graph.PathFinding import PathFinding
+
+class Test(unittest.TestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        self.g = gridMap(9, 7, mtype='boundless')
+        self.g.setRegion('cost', float('inf'), rect=(4, 0, 5, 6))
+        self.g.setSight((2, 3), 0.5)
+        self.g.setVision((1, 1), 4)
+
+    def testMapFile(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'map.bin')
+            save_map(self.g, path)
+            m = load_map(path)
+            self.assertIsInstance(m.cost, np.memmap)
+            self.assertEqual((m.width, m.height, m.mtype), (9, 7, 'boundless'))
+            for plane in ('cost', 'sight', 'vision'):
+                self.assertTrue(np.array_equal(getattr(m, plane), getattr(self.g, plane)))
+            self.assertEqual(PathFinding(m).get_path((0, 0), (8, 0)), PathFinding(self.g).get_path((0, 0), (8, 0)))
+
+            # Edits are private by default, write-through mappings reach the file once flushed
+            m.setCost(None, (4, 3), 2)
+            self.assertEqual(load_map(path, mode='r').getCost(None, (4, 3)), float('inf'))
+            m = load_map(path, mode='r+')
+            m.setCost(None, (4, 3), 2)
+            flush_map(m)
+            c = load_map(path, mode='c')
+            self.assertEqual(c.getCost(None, (4, 3)), 2)
+            c.setCost(None, (4, 3), 3)
+            self.assertEqual(load_map(path, mode='r').getCost(None, (4, 3)), 2)
+            del m, c
+
+    def testGridMap(self):
+        g = GridMap(5, 4)
+        g.remove_node((2, 2))
+        g.setCost(None, (1, 1), 3)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'map.bin')
+            save_map(g, path)
+            m = load_map(path, mode='r')
+            self.assertEqual(m.getCost(None, (1, 1)), 3)
+            self.assertEqual(m.getCost(None, (2, 2)), float('inf'))
+            self.assertEqual(m.getSight((2, 2)), 0)
+            self.assertRaises(ValueError, m.setCost, None, (0, 0), 2)
+            del m
+
+            with open(path, 'wb') as f:
+                f.write(b'not a map')
+            self.assertRaises(ValueError, load_map, path)
+
+if __name__ == '__main__':
+    unittest.main()
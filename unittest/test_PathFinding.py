@@ -4,14 +4,17 @@
 # Author: Shin-Fu (Kelvin) Wu
 # Date: 2017/06/08
 """
+import asyncio
 import os
 import sys
 import unittest
+import numpy as np
 
 root = os.path.join(os.path.dirname(__file__), '..')
 sys.path.append(root)
-from algorithms.graph.GridMap import GridMap
-from algorithms.graph.PathFinding import PathFinding
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.FlowField import FlowField
+from algorithms.graph.PathFinding import PathFinding, DStarLite, SearchScheduler
 
 class Test(unittest.TestCase):
     
@@ -24,6 +27,240 @@ class Test(unittest.TestCase):
     def testPathFinder(self):
         path = self.f.get_path((0,0), (2,2))
         self.assertEqual(path, [(0, 0), (0, 1), (1, 2), (2, 2)])
+    
+    def testImplicitGridMap(self):
+        g = GridMap(3, 3, implicit=True)
+        g.remove_node((1, 1))
+        self.assertEqual(PathFinding(g).get_path((0, 0), (2, 2)), self.f.get_path((0, 0), (2, 2)))
+    
+    def testEdgeEdits(self):
+        # One grid edge removed and one shortcut added keep the number of edges
+        g = GridMap(6, 1)
+        g.remove_edge((2, 0), (3, 0))
+        g.add_edge((0, 0), (5, 0))
+        self.assertEqual(PathFinding(g).get_path((0, 0), (5, 0)), [(0, 0), (5, 0)])
+        self.assertEqual(PathFinding(g).get_path((0, 0), (3, 0)), [(0, 0), (5, 0), (4, 0), (3, 0)])
+        # Edits restoring the complete grid are searched on the flat grid again
+        g.remove_edge((0, 0), (5, 0))
+        g.add_edge((2, 0), (3, 0))
+        self.assertEqual(len(PathFinding(g).get_path((0, 0), (5, 0))), 6)
+    
+    def testCostPriority(self):
+        g = gridMap(5, 3)
+        g.setRegion('cost', 10, rect=(2, 0, 3, 2))
+        path = PathFinding(g).get_path((0, 0), (4, 0))
+        self.assertIn((2, 2), path)
+        g.setCost(None, (2, 2), float('inf'))
+        path = PathFinding(g).get_path((0, 0), (4, 0))
+        self.assertEqual(sum(g.getCost(None, n) for n in path[1:]), 13)
+        g.setRegion('cost', float('inf'), rect=(2, 0, 3, 3))
+        self.assertIsNone(PathFinding(g).get_path((0, 0), (4, 0)))
+    
+    def testJumpPointSearch(self):
+        path = PathFinding(self.g, 'jps').get_path((0, 0), (2, 2))
+        self.assertEqual(len(path), len(self.f.get_path((0, 0), (2, 2))))
+        g = gridMap(6, 4, 'boundless')
+        g.setRegion('cost', float('inf'), rect=(2, 0, 3, 4))
+        path = PathFinding(g, 'jps').get_path((1, 0), (3, 0))
+        self.assertEqual(len(path), 5)
+        self.assertNotIn((2, 0), path)
+        g.setCost(None, (4, 2), 3)
+        self.assertEqual(sum(g.getCost(None, n) for n in PathFinding(g, 'jps').get_path((1, 0), (3, 0))[1:]), 4)
+        g.setCost(None, (2, 2), float('inf'))
+        self.assertEqual(PathFinding(g, 'jps').get_path((2, 2), (2, 2)), PathFinding(g).get_path((2, 2), (2, 2)))
+        
+        # Cheapest paths on non-uniform costs, as found by Dijkstra (the flow field)
+        rng = np.random.RandomState(0)
+        for i in range(40):
+            g = gridMap(12, 12, 'boundless' if i % 2 else 'bounded')
+            g.setRegion('cost', rng.randint(1, 6, size=(12, 12)).astype(float))
+            g.setRegion('cost', float('inf'), mask=rng.random_sample((12, 12)) < 0.2)
+            goal = (int(rng.randint(12)), int(rng.randint(12)))
+            distance = FlowField(g, [goal])
+            f = PathFinding(g, 'jps')
+            for j in range(5):
+                start = (int(rng.randint(12)), int(rng.randint(12)))
+                if g.getCost(None, start) == float('inf'):
+                    continue
+                path = f.get_path(start, goal)
+                if path is None:
+                    self.assertEqual(distance.get_distance(start), float('inf'))
+                else:
+                    self.assertEqual(sum(g.getCost(None, n) for n in path[1:]), distance.get_distance(start))
+        G = GridMap(6, 2, 'boundless')
+        self.assertEqual(len(PathFinding(G, 'jps').get_path((0, 0), (4, 1))), 3)
+    
+    def testBidirectional(self):
+        g = gridMap(5, 3)
+        g.setRegion('cost', 10, rect=(2, 0, 3, 2))
+        g.setCost(None, (2, 2), float('inf'))
+        path = PathFinding(g, 'bi-a-star').get_path((0, 0), (4, 0))
+        self.assertEqual(sum(g.getCost(None, n) for n in path[1:]), 13)
+        # Entering a grid costs that grid, so the way back is not as expensive
+        g.setCost(None, (4, 0), 9)
+        self.assertEqual(PathFinding(g, 'bi-a-star').get_path((3, 0), (4, 0)), [(3, 0), (4, 0)])
+        self.assertEqual(PathFinding(g, 'bi-a-star').get_path((4, 0), (3, 1)), [(4, 0), (3, 1)])
+        g.setRegion('cost', float('inf'), rect=(2, 0, 3, 3))
+        self.assertIsNone(PathFinding(g, 'bi-a-star').get_path((0, 0), (4, 0)))
+        
+        G = GridMap(7, 7, 'boundless')
+        g = gridMap(7, 7, 'boundless')
+        for (i, node) in enumerate(G.V):
+            cost = float('inf') if i % 5 == 0 else i % 3 + 1
+            G.setCost(None, node, cost)
+            g.setCost(None, node, cost)
+        for goal in [(3, 3), (6, 1), (2, 5)]:
+            paths = [PathFinding(G, 'bi-a-star').get_path((1, 2), goal), PathFinding(g, 'bi-a-star').get_path((1, 2), goal)]
+            costs = [sum(g.getCost(None, n) for n in path[1:]) for path in paths]
+            self.assertEqual(costs[0], costs[1])
+            path = PathFinding(g).get_path((1, 2), goal)
+            self.assertLessEqual(costs[0], sum(g.getCost(None, n) for n in path[1:]))
+    
+    def testHeuristics(self):
+        g = gridMap(9, 9, 'boundless')
+        for (i, (x, y)) in enumerate((x, y) for x in range(9) for y in range(9)):
+            g.setCost(None, (x, y), float('inf') if i % 7 == 0 else i % 4 + 2)
+        cost = lambda path: sum(g.getCost(None, n) for n in path[1:])
+        for goal in [(7, 6), (4, 1), (0, 5)]:
+            optimal = cost(PathFinding(g, 'bi-a-star').get_path((1, 2), goal))
+            self.assertEqual(cost(PathFinding(g, heuristic='chebyshev').get_path((1, 2), goal)), optimal)
+            self.assertLessEqual(cost(PathFinding(g, heuristic='chebyshev', epsilon=0.5).get_path((1, 2), goal)), 1.5 * optimal)
+            self.assertLessEqual(cost(PathFinding(g, 'alt', epsilon=0.5).get_path((1, 2), goal)), 1.5 * optimal)
+        # Measured around the torus
+        f = PathFinding(gridMap(9, 3, 'boundless'), heuristic='octile')
+        self.assertEqual(f.get_path((0, 1), (8, 1)), [(0, 1), (8, 1)])
+        self.assertEqual(f.expanded, 2)
+        f = PathFinding(self.g, heuristic=lambda a, b: max(abs(a[0] - b[0]), abs(a[1] - b[1])))
+        self.assertEqual(len(f.get_path((0, 0), (2, 2))), 4)
+        self.assertRaises(ValueError, PathFinding(g, heuristic='taxicab').get_path, (0, 0), (1, 1))
+        self.assertRaises(ValueError, PathFinding(g, epsilon=-1).get_path, (0, 0), (1, 1))
+    
+    def testSlicedSearch(self):
+        g = gridMap(12, 8)
+        g.setRegion('cost', float('inf'), rect=(5, 0, 6, 7))
+        f = PathFinding(g, heuristic='chebyshev')
+        search = f.search((0, 0), (11, 0))
+        self.assertEqual((search.progress(), search.partial_path()), (0.0, [(0, 0)]))
+        self.assertFalse(search.step(expansions=10))
+        self.assertEqual(search.expanded, 10)
+        partial = search.partial_path()
+        self.assertEqual(partial[0], (0, 0))
+        self.assertTrue(0 < search.progress() < 1)
+        while not search.step(expansions=5):
+            pass
+        self.assertEqual(search.path, f.get_path((0, 0), (11, 0)))
+        self.assertEqual(search.expanded, f.expanded)
+        self.assertTrue(f.search((0, 0), (11, 0)).step())
+        # Disconnected queries are done at once
+        g.setCost(None, (5, 7), float('inf'))
+        search = f.search((0, 0), (11, 0))
+        self.assertTrue(search.done)
+        self.assertIsNone(search.path)
+    
+    def testScheduler(self):
+        g = gridMap(10, 10)
+        g.setRegion('cost', float('inf'), rect=(4, 1, 5, 10))
+        f = PathFinding(g)
+        scheduler = SearchScheduler(expansions=12)
+        searches = [f.search((0, 9), (9, 9)), f.search((9, 0), (0, 9)), f.search((1, 1), (2, 2))]
+        for search in searches:
+            scheduler.submit(search)
+        finished = scheduler.run_frame()
+        self.assertEqual(finished, [searches[2]])
+        self.assertEqual(sum(search.expanded for search in searches), 12)
+        self.assertTrue(searches[0].expanded > 0 and searches[1].expanded > 0)
+        
+        async def agents():
+            paths = asyncio.gather(*[scheduler.find(search) for search in searches])
+            await scheduler.run(frame=0)
+            return await paths
+        paths = asyncio.run(agents())
+        self.assertEqual(paths, [f.get_path((0, 9), (9, 9)), f.get_path((9, 0), (0, 9)), f.get_path((1, 1), (2, 2))])
+        self.assertEqual(scheduler.pending(), 0)
+    
+    def testBatchPaths(self):
+        g = gridMap(8, 8)
+        g.setRegion('cost', float('inf'), rect=(3, 0, 4, 7))
+        pairs = [((0, 0), (7, 7)), ((1, 5), (7, 7)), ((6, 0), (0, 0)), ((0, 0), (7, 7)), ((2, 2), (3, 3))]
+        g.setRegion('cost', 3, rect=(0, 4, 3, 6))
+        pairs += [((x, y), (7, 7)) for x in range(3) for y in range(8)]
+        rng = np.random.RandomState(4)
+        g.setRegion('cost', 2, mask=(rng.random_sample((8, 8)) < 0.3) & np.isfinite(g.cost))
+        pairs += [(tuple(rng.randint(0, 8, 2)), tuple(rng.randint(0, 8, 2))) for i in range(40)]
+        for algorithm in ('a-star', 'jps', 'alt'):
+            f = PathFinding(g, algorithm)
+            serial = [f.get_path(start, goal) for (start, goal) in pairs]
+            self.assertEqual(f.get_paths(pairs), serial)
+            self.assertEqual(f.get_paths(pairs, processes=2), serial)
+            f.close()
+        # 'alt' paths are cheapest paths, found by Dijkstra (the flow field) as well
+        for ((start, goal), path) in zip(pairs, serial):
+            distance = FlowField(g, [goal]).get_distance(start)
+            if g.cost[start] == float('inf'):
+                # The flow field does not leave blocked grids, paths may
+                continue
+            if path is None:
+                self.assertEqual(distance, float('inf'))
+            else:
+                self.assertEqual(sum(g.getCost(None, n) for n in path[1:]), distance)
+        self.assertEqual(f.get_paths([((2, 2), (2, 2)), ((4, 4), (3, 3))]), [[(2, 2)], None])
+        
+        f = PathFinding(g, heuristic=lambda node, goal: 0)
+        self.assertRaises(ValueError, f.get_paths, pairs, 2)
+        self.assertEqual(len(f.get_paths(pairs)), len(pairs))
+        # Other graphs are searched pair by pair
+        G = GridMap(4, 1)
+        G.add_edge((0, 0), (3, 0))
+        self.assertEqual(PathFinding(G).get_paths([((0, 0), (3, 0)), ((1, 0), (3, 0))]), [[(0, 0), (3, 0)], [(1, 0), (2, 0), (3, 0)]])
+    
+    def testPathCache(self):
+        g = gridMap(40, 40)
+        f = PathFinding(g, cache_size=2)
+        left = f.get_path((0, 0), (0, 39))
+        right = f.get_path((39, 0), (39, 39))
+        self.assertEqual(f.get_path((0, 0), (0, 39)), left)
+        self.assertEqual(f.cache_info()['hits'], 1)
+        # Only the path crossing the edit is evicted
+        g.setCost(None, left[20], float('inf'))
+        self.assertEqual(f.get_path((39, 0), (39, 39)), right)
+        self.assertNotIn(left[20], f.get_path((0, 0), (0, 39)))
+        info = f.cache_info()
+        self.assertEqual((info['hits'], info['misses'], info['invalidations']), (2, 3, 1))
+        # A cheaper grid near the path may open a shorter route
+        g.setRegion('cost', 5, rect=(1, 0, 2, 40))
+        f.get_path((0, 0), (0, 39))
+        g.setCost(None, (1, 20), 1)
+        f.get_path((39, 0), (39, 39))
+        f.get_path((0, 0), (0, 39))
+        info = f.cache_info()
+        self.assertEqual((info['hits'], info['invalidations']), (3, 3))
+        f.get_path((20, 0), (20, 39))
+        self.assertEqual(f.cache_info()['evictions'], 1)
+    
+    def testDStarLite(self):
+        g = gridMap(8, 8)
+        planner = DStarLite(g, (0, 0), (7, 7))
+        self.assertEqual(len(planner.get_path()), 8)
+        g.setRegion('cost', float('inf'), rect=(0, 4, 7, 5))
+        planner.update([(x, 4) for x in range(7)])
+        path = planner.get_path()
+        self.assertEqual(len(path), len(PathFinding(g).get_path((0, 0), (7, 7))))
+        self.assertIn((7, 4), path)
+        planner.set_start(path[1])
+        self.assertEqual(planner.get_path(), path[1:])
+        g.setCost(None, (7, 4), float('inf'))
+        planner.update([(7, 4)])
+        self.assertIsNone(planner.get_path())
+        g.setCost(None, (3, 4), 1)
+        planner.update([(3, 4)])
+        self.assertIn((3, 4), planner.get_path())
+        
+        self.g.remove_node((0, 1))
+        planner = DStarLite(self.g, (0, 0), (2, 2))
+        self.assertEqual(len(planner.get_path()), 4)
+        self.g.remove_node((1, 0))
+        planner.update([(1, 0)])
+        self.assertIsNone(planner.get_path())
 
 if __name__ == '__main__':
     unittest.main(verbosity=1)  
@@ -0,0 +1,57 @@
+""" UNIT TEST ON REACHABILITY MODULE
+# Description:
+    This is the unit test for reachability module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import unittest
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.graph.GridMap import GridMap, gridMap
+from algorithms.graph.Reachability import Reachability
+from algorithms.graph.PathFinding import PathFinding
+
+class Test(unittest.TestCase):
+    
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        self.g = gridMap(8, 6)
+        self.g.setRegion('cost', float('inf'), rect=(3, 0, 4, 6))
+        
+    def testReachability(self):
+        r = Reachability(self.g)
+        self.assertFalse(r.connected((0, 0), (7, 5)))
+        self.assertTrue(r.connected((0, 0), (2, 5)))
+        self.assertEqual(r.get_label((3, 2)), -1)
+        self.assertEqual(r.get_size((7, 0)), 24)
+        # A blocked start may still step out of its grid
+        self.assertTrue(r.connected((3, 2), (0, 0)))
+        self.assertFalse(r.connected((0, 0), (3, 2)))
+        
+        self.g.setCost(None, (3, 4), 1)
+        self.assertTrue(r.connected((0, 0), (7, 5)))
+        self.assertEqual(r.get_size((0, 0)), 43)
+        self.g.setRegion('cost', float('inf'), rect=(5, 0, 6, 6))
+        self.assertFalse(r.connected((0, 0), (7, 5)))
+        self.assertEqual(r.get_size((7, 5)), 12)
+        self.assertEqual(r.get_size((4, 0)), 25)
+    
+    def testGridMap(self):
+        g = GridMap(5, 5, 'boundless')
+        for y in range(5):
+            g.remove_node((2, y))
+        r = Reachability(g)
+        self.assertTrue(r.connected((0, 0), (4, 4)))
+        for y in range(5):
+            g.remove_node((0, y))
+        self.assertFalse(r.connected((1, 0), (4, 4)))
+        self.assertIsNone(PathFinding(g).get_path((1, 0), (4, 4)))
+        g.add_node((0, 3), cost=1, sight=1, vision=0)
+        g.add_edges_from([((0, 3), n) for n in [(1, 2), (1, 3), (1, 4), (4, 2), (4, 3), (4, 4)]])
+        self.assertTrue(r.connected((1, 0), (4, 4)))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=1)
@@ -0,0 +1,51 @@
+""" UNIT TEST ON UNIQUE NAMES MODULE
+# Description:
+    This is the unit test for unique names module.
+# Author: agent
+# Date: 2026/10/18
+"""
+import os
+import sys
+import unittest
+
+root = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(root)
+from algorithms.procedual_generation.Language import LangGen
+from algorithms.procedual_generation.UniqueNames import UniqueNameGen, fingerprints
+
+class Test(unittest.TestCase):
+
+    def __init__(self, methodName='runTest'):
+        super().__init__(methodName)
+        self.style = ('English-ish', 'Standard 5-vowel', 's ʃ', 'r l', 'm n', 'C?L?VC', 'Double sounds and hard clusters', 'Default', 'Default')
+
+    def testUnique(self):
+        u = UniqueNameGen(LangGen(*self.style, random_seed=1), 1, 2, batch=4096)
+        names = u.genNames(20000) + [next(u.iterNames()) for i in range(100)]
+        self.assertEqual(len(set(names)), 20100)
+        self.assertEqual(u.issued, 20100)
+        self.assertIn(names[0], u)
+        self.assertNotIn('Not a name', u)
+        # The pools grew as the names started to collide
+        self.assertGreater(len(u.lang.generic_morpheme_pool), 20)
+        self.assertEqual(names[:50], UniqueNameGen(LangGen(*self.style, random_seed=1), 1, 2, batch=4096).genNames(50))
+        capacity = u.capacity()
+        self.assertEqual(capacity['issued'], 20100)
+        self.assertTrue(capacity['issued'] <= capacity['pools'] <= capacity['limit'])
+
+    def testExhausted(self):
+        # 6 x 3 syllables, one per morpheme, and the pools hold the same morphemes: 18 * 18 names
+        lang = LangGen('Pirahã (very simple)', '3-vowel a i u', 'Just s', 'Just r', 'm n', 'CV', 'None', 'Default', 'Default',
+                       random_seed=2, generic_pool_size=2, city_pool_size=1)
+        self.assertEqual(lang.syllableCount(), 18)
+        u = UniqueNameGen(lang, 1, 1, batch=256)
+        self.assertEqual(u.capacity()['limit'], 2 * 18 * 18)
+        names = list(u.iterNames())
+        self.assertTrue(u.exhausted)
+        self.assertEqual(len(names), 18 * 18)
+        self.assertEqual(len(set(names)), len(names))
+        self.assertEqual(u.genNames(10), [])
+        self.assertEqual(list(fingerprints(['ab', 'ab', 'ba'])[:2]), [fingerprints(['ab'])[0]] * 2)
+
+if __name__ == '__main__':
+    unittest.main()